@@ -8,10 +8,10 @@ Some of Relaton models implemented as Pydantic models.
 # supported. Stick to plain text.
 
 from __future__ import annotations
-from typing import List, Union, Optional
+from typing import List, Union, Optional, Dict
 import datetime
 
-from pydantic import BaseModel, Extra, validator
+from pydantic import BaseModel, Extra, PrivateAttr, validator
 from pydantic.dataclasses import dataclass
 
 from .copyrights import Copyright
@@ -161,6 +161,11 @@ class BibliographicItem(BaseModel, extra=Extra.allow):
 
     copyright: Optional[Union[List[Copyright], Copyright]] = None
 
+    _representations: Dict[str, str] = PrivateAttr(default_factory=dict)
+    # Output of serializers stored at indexing time, if any,
+    # keyed by serializer ID. Not part of Relaton data.
+    # See bib_models.serializers.preserialize().
+
     @validator('revdate', pre=True)
     def validate_revdate(cls, v, **kwargs):
         """Validates ``revdate``, allowing it to be unspecific."""
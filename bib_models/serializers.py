@@ -3,23 +3,43 @@ for :class:`~.models.bibdata.BibliographicItem` instances.
 
 Currently, only serialization
 into various utf-8 strings is supported.
+
+Serializers can opt in to being run at indexing time
+(see :func:`.preserialize()`), in which case output stored
+with indexed data is served instead of serializing items on the fly
+(see :func:`.serialize()`). Stored output is keyed by serializer version
+(see :func:`.get_representation_key()`), so output stored
+by an older version of a serializer is never served.
 """
 
-from typing import Callable, Dict
+from typing import Callable, Dict, Optional, Union
 from dataclasses import dataclass
 
+from .models.bibdata import BibliographicItem
+
 
-def register(id: str, content_type: str):
+def register(
+    id: str,
+    content_type: str,
+    replace_anchor: Optional[Callable[[str, str], str]] = None,
+    version: str = '1',
+):
     """Parametrized decorator that, given ID and content_type,
     returns a function that will register a serializer function.
 
     Serializer function must take a ``BibliographicItem`` instance
     and return an utf-8-encoded string.
+
+    If ``replace_anchor`` is given, the serializer opts in
+    to preserialization (see :attr:`.Serializer.replace_anchor`),
+    and ``version`` must be changed whenever its output changes.
     """
     def wrapper(func: Callable[..., str]):
         registry[id] = Serializer(
             serialize=func,
             content_type=content_type,
+            replace_anchor=replace_anchor,
+            version=version,
         )
         return func
     return wrapper
@@ -37,6 +57,22 @@ class Serializer:
     content_type: str
     """Content type to be used with this serializer, e.g. in HTTP responses."""
 
+    replace_anchor: Optional[Callable[[str, str], str]] = None
+    """Function that takes previously serialized output and an anchor,
+    and returns output with the anchor replaced.
+
+    Serializers that provide it are run at indexing time
+    (see :func:`~bib_models.serializers.preserialize`),
+    since stored output can be adjusted to requested anchor
+    without serializing the item again.
+
+    Only called with non-empty anchors. An empty anchor
+    is passed on to the serializer function."""
+
+    version: str = '1'
+    """Version of serializer output.
+    Output stored under a different version is ignored."""
+
 
 def get(id: str) -> Serializer:
     """Get previously registered serializer by ID.
@@ -49,6 +85,85 @@ def get(id: str) -> Serializer:
         raise SerializerNotFound(id)
 
 
+def get_representation_key(id: str) -> str:
+    """Returns the key under which output of serializer with given ID
+    is stored in preserialized representations
+    (see :func:`.preserialize()`).
+
+    :raises SerializerNotFound:"""
+
+    return '%s@%s' % (id, get(id).version)
+
+
+def get_preserialization_version() -> str:
+    """Returns a string that changes whenever the set
+    of preserializing serializers or any of their versions changes.
+
+    Indexers can use it to tell whether preserialized output
+    stored for an unchanged source is still current.
+    """
+    return ','.join(sorted(
+        get_representation_key(id)
+        for id, serializer in registry.items()
+        if serializer.replace_anchor is not None))
+
+
+def preserialize(item: BibliographicItem) -> Dict[str, str]:
+    """Serializes given item with every registered serializer
+    that supports it (see :attr:`.Serializer.replace_anchor`),
+    using default anchor.
+
+    Formats the item could not be serialized into are omitted.
+
+    :returns: a mapping of representation keys
+              (see :func:`.get_representation_key()`)
+              to serialized output, suitable for storing
+              as :attr:`main.models.RefData.representations`
+    """
+    representations: Dict[str, str] = {}
+
+    for id, serializer in registry.items():
+        if serializer.replace_anchor is None:
+            continue
+        try:
+            output: Union[str, bytes] = serializer.serialize(item)
+        except ValueError:
+            continue
+        representations[get_representation_key(id)] = (
+            output.decode('utf-8')
+            if isinstance(output, bytes)
+            else output)
+
+    return representations
+
+
+def serialize(
+    id: str,
+    item: BibliographicItem,
+    anchor: Optional[str] = None,
+) -> Union[str, bytes]:
+    """Serializes given item using serializer registered under given ID.
+
+    If the item carries output stored at indexing time
+    by current version of the serializer (see :func:`.preserialize()`),
+    that output is returned, with anchor replaced if ``anchor`` is given.
+    Otherwise, or if ``anchor`` is empty, the item is serialized on the fly.
+
+    :raises SerializerNotFound:
+    :raises ValueError: item cannot be serialized into given format
+    """
+    serializer = get(id)
+    stored = item._representations.get(get_representation_key(id), None)
+
+    if stored is not None and serializer.replace_anchor is not None:
+        if anchor is None:
+            return stored
+        if anchor:
+            return serializer.replace_anchor(stored, anchor)
+
+    return serializer.serialize(item, anchor=anchor)
+
+
 class SerializerNotFound(RuntimeError):
     """No registered serializer with given ID."""
     pass
@@ -274,7 +274,20 @@ CELERY_WORKER_SEND_TASK_EVENTS = True
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TRACK_STARTED = True
 
-CELERY_WORKER_CONCURRENCY = 1
+CELERY_WORKER_CONCURRENCY = int(environ.get(
+    'CELERY_WORKER_CONCURRENCY',
+    environ.get('INDEXING_REFRESH_CONCURRENCY', 3)))
+"""How many tasks a Celery worker runs at a time.
+
+Defaults to :data:`INDEXING_REFRESH_CONCURRENCY`,
+so that sources refreshed at once (and shards of sharded runs,
+see :data:`INDEXING_SHARD_SIZE`) are actually indexed concurrently.
+Each task that indexes a source holds a batch of parsed items
+in memory, so lower this on memory-constrained hosts.
+
+With more than one process, metrics are only exported completely
+if ``PROMETHEUS_MULTIPROC_DIR`` is set (see :mod:`sources.celery`)."""
+
 CELERY_TASK_RESULT_EXPIRES = 604800
 
 
@@ -341,6 +354,15 @@ DEFAULT_CACHE_SECONDS = 21600
 SEARCH_CACHE_SECONDS = 3600
 """How long to cache search results for."""
 
+COMPOSITE_ITEM_CACHE_SECONDS = 604800
+"""How long to cache items merged from indexed refs
+sharing a primary document identifier.
+Cache keys change whenever any of the refs is reindexed
+with different contents, so this can be long.
+
+.. seealso:: :func:`main.query.get_merged_work()`
+"""
+
 
 # BibXML-specific
 # ===============
@@ -351,10 +373,121 @@ DEFAULT_SEARCH_RESULT_LIMIT = 400
 If the user hits this limit, they are expected to provide
 a more precise query."""
 
+API_BATCH_MAX_ITEMS = 1000
+"""Maximum number of items that can be requested at once
+from batch retrieval API endpoint.
+
+.. seealso:: :func:`main.api.get_by_docid_batch`
+"""
+
 DATASET_TMP_ROOT = environ.get('DATASET_TMP_ROOT', '/data/datasets')
 """Where to keep fetched source data and data generated during indexing.
 Should be a directory. No trailing slash."""
 
+GIT_PARTIAL_CLONE = int(environ.get('GIT_PARTIAL_CLONE', 0)) == 1
+"""Whether to clone source repositories without file contents
+(blobless partial clones), downloading them only for checked out files.
+Sources that only need some directories
+(e.g., ``data/`` of Relaton sources) also get sparse checkouts.
+
+Requires Git hosting to support partial clones.
+
+.. seealso:: :func:`common.git.reclone`"""
+
+GIT_OBJECT_CACHE = int(environ.get('GIT_OBJECT_CACHE', 1)) == 1
+"""Whether full clones of source repositories borrow objects
+from cache repositories kept under :data:`DATASET_TMP_ROOT`,
+so that recloning doesn’t download everything again.
+Has no effect if :data:`GIT_PARTIAL_CLONE` is enabled.
+
+.. seealso:: :func:`common.git.update_object_cache`"""
+
+GIT_OBJECT_CACHE_TTL = int(environ.get('GIT_OBJECT_CACHE_TTL', 3600))
+"""How many seconds may pass after a branch was fetched into
+object cache (see :data:`GIT_OBJECT_CACHE`) before it is fetched again
+when a repository is recloned.
+
+.. seealso:: :func:`common.git.update_object_cache`"""
+
+INDEXING_BATCH_SIZE = int(environ.get('INDEXING_BATCH_SIZE', 1000))
+"""How many indexed items to write to the database in one statement.
+
+Larger batches mean fewer round-trips during indexing
+at the cost of worker memory.
+
+.. seealso:: :func:`main.sources.upsert_refs`"""
+
+INDEXING_PARSER_WORKERS = int(environ.get('INDEXING_PARSER_WORKERS', 1))
+"""How many processes to use for parsing source files during indexing.
+
+With the default of 1, files are parsed in the indexing process itself.
+Set to the number of available cores on multi-core Celery hosts,
+keeping in mind that each concurrently running indexing task
+(see :data:`CELERY_WORKER_CONCURRENCY`) starts its own parser processes.
+
+.. seealso:: :func:`main.sources.parse_relaton_files`"""
+
+INDEXING_READER_THREADS = int(environ.get('INDEXING_READER_THREADS', 4))
+"""How many threads to use for reading source files
+of sources that are not parsed during indexing (e.g., xml2rfc archive).
+
+Reading is I/O-bound, so this can exceed the number of available cores.
+
+.. seealso:: :func:`xml2rfc_compat.source.index_xml2rfc_source`"""
+
+INDEXING_SHARD_SIZE = int(environ.get('INDEXING_SHARD_SIZE', 0))
+"""If positive, indexing runs of sources that support it are split
+into shards of this many refs, dispatched as separate Celery tasks
+that can be picked up by any number of workers.
+
+With the default of 0, each indexing run is a single task.
+Sharding only helps if more than one worker process is available
+(see :data:`CELERY_WORKER_CONCURRENCY`).
+
+Each shard checks out head commits the run was planned against
+in its worker’s :data:`DATASET_TMP_ROOT`, fetching them if needed,
+and runs of the same source don’t overlap
+(see :data:`INDEXING_LOCK_SECONDS`).
+
+.. seealso:: :func:`sources.tasks.fetch_and_index_task`"""
+
+
+INDEXING_LOCK_SECONDS = int(environ.get('INDEXING_LOCK_SECONDS', 6 * 3600))
+"""How long an indexing run of a source keeps other runs of it
+from starting, unless it completes or fails earlier.
+Sharded runs refresh the lock as each shard starts and finishes.
+
+Should exceed the longest expected indexing run
+(or the longest shard, if sharding is enabled).
+
+.. seealso:: :func:`sources.indexable.acquire_indexing_lock`"""
+
+INDEXING_REFRESH_CONCURRENCY = int(
+    environ.get('INDEXING_REFRESH_CONCURRENCY', 3))
+"""How many sources are indexed at a time when refreshing
+all sources at once. :data:`AUTHORITATIVE_DATASETS` are indexed first.
+
+Only helps if at least as many worker processes are available
+(see :data:`CELERY_WORKER_CONCURRENCY`).
+
+.. seealso:: :func:`sources.tasks.refresh_sources_task`"""
+
+INDEXING_PROGRESS_INTERVAL = float(
+    environ.get('INDEXING_PROGRESS_INTERVAL', 2))
+"""Minimum number of seconds between indexing task status updates.
+
+Indexers report progress on every item, but task status is only updated
+this often (or every :data:`INDEXING_PROGRESS_ITEMS` items),
+since each update is a write to Celery result backend.
+
+.. seealso:: :class:`sources.progress.ProgressReporter`"""
+
+INDEXING_PROGRESS_ITEMS = int(environ.get('INDEXING_PROGRESS_ITEMS', 1000))
+"""Number of indexed items after which task status is updated
+regardless of :data:`INDEXING_PROGRESS_INTERVAL`.
+
+.. seealso:: :class:`sources.progress.ProgressReporter`"""
+
 
 # API access
 # ----------
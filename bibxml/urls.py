@@ -66,6 +66,10 @@ urlpatterns = [
                 public_api.get_by_docid
             )), name='api_get_by_docid'),
 
+            path('by-docid/batch/', csrf_exempt(require_POST(dt_auth.api(
+                public_api.get_by_docid_batch
+            ))), name='api_get_by_docid_batch'),
+
             path('ref/', include([
                 path('doi/<ref>/', require_safe(dt_auth.api(
                     public_api.get_doi_ref
@@ -87,6 +91,14 @@ urlpatterns = [
                         mgmt_api.stop_all_tasks
                     ))), name='api_stop_all_tasks'),
                 ])),
+                path('refresh/', include([
+                    path('', csrf_exempt(require_POST(auth.api(
+                        mgmt_api.run_refresh
+                    ))), name='api_run_refresh'),
+                    path('<run_id>/status/', require_safe(
+                        mgmt_api.refresh_status
+                    ), name='api_refresh_status'),
+                ])),
                 path('<dataset_name>/', include([
                     path('status/', require_safe(
                         mgmt_api.indexer_status
@@ -94,6 +106,9 @@ urlpatterns = [
                     path('reindex/', csrf_exempt(require_POST(auth.api(
                         mgmt_api.run_indexer
                     ))), name='api_run_indexer'),
+                    path('rebuild-index/', csrf_exempt(require_POST(auth.api(
+                        mgmt_api.rebuild_index
+                    ))), name='api_rebuild_index'),
                     path('reset-index/', csrf_exempt(require_POST(auth.api(
                         mgmt_api.reset_index
                     ))), name='api_reset_index'),
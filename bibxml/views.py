@@ -9,7 +9,7 @@ from django.shortcuts import render
 
 from bib_models.models.bibdata import BibliographicItem
 from main.query import list_doctypes
-from main.api import CitationSearchResultListView
+from main.api import CitationSearchResultListView, BATCH_MAX_ITEMS
 
 
 def openapi_spec(request):
@@ -28,6 +28,8 @@ def openapi_spec(request):
         known_doctypes=list_doctypes(),
         pre_indented_bibliographic_item_definitions=bibitem_objects,
         supported_search_query_formats=search_formats,
+        batch_max_items=BATCH_MAX_ITEMS,
+        search_result_limit=CitationSearchResultListView.limit_to,
     ), content_type='text/x-yaml')
 
 
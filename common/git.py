@@ -1,10 +1,14 @@
 """Utilities for dealing with Git."""
 
-from typing import Tuple
+import fcntl
+import hashlib
+import time
+from typing import Any, Dict, Tuple, List, Optional, Union
 from os import access, path, R_OK, W_OK, X_OK
 from pathlib import Path
 from shutil import rmtree
-from git import Repo  # type: ignore[attr-defined]
+from git import Git, Repo  # type: ignore[attr-defined]
+from git.exc import GitCommandError
 from celery.utils.log import get_task_logger
 from django.core.exceptions import SuspiciousOperation
 from django.conf import settings
@@ -13,14 +17,27 @@ from django.conf import settings
 logger = get_task_logger(__name__)
 
 
-def reclone(repo_url: str, branch: str, work_dir: str) \
-        -> Repo:
-    """
-    Wipes proposed ``work_dir``
-    and clones given repository into that location.
-    Sets depth of 1 to avoid fetching history.
-    """
+LS_REMOTE_TIMEOUT: int = 15
+"""Number of seconds after which :func:`.get_remote_head()` gives up."""
+
+PARTIAL_CLONE: bool = getattr(settings, 'GIT_PARTIAL_CLONE', False)
+"""Whether to make blobless (and, where possible, sparse) clones.
+See :data:`bibxml.settings.GIT_PARTIAL_CLONE`."""
+
+OBJECT_CACHE: bool = getattr(settings, 'GIT_OBJECT_CACHE', True)
+"""Whether full clones borrow objects from a shared cache.
+See :data:`bibxml.settings.GIT_OBJECT_CACHE`."""
+
+OBJECT_CACHE_TTL: int = getattr(settings, 'GIT_OBJECT_CACHE_TTL', 3600)
+"""How many seconds a branch fetched into object cache is considered fresh.
+See :data:`bibxml.settings.GIT_OBJECT_CACHE_TTL`."""
+
+OBJECT_CACHE_DIRNAME = '_git_object_cache'
+"""Directory under :data:`bibxml.settings.DATASET_TMP_ROOT`
+holding cache repositories (see :func:`.update_object_cache()`)."""
+
 
+def _ensure_under_tmp_root(work_dir: str):
     if path.commonpath([
         settings.DATASET_TMP_ROOT,
         path.realpath(work_dir),
@@ -28,6 +45,30 @@ def reclone(repo_url: str, branch: str, work_dir: str) \
         raise SuspiciousOperation(
             "Cannot reclone to a dir outside DATASET_TMP_ROOT")
 
+
+def reclone(
+    repo_url: str,
+    branch: str,
+    work_dir: str,
+    sparse_paths: Optional[List[str]] = None,
+) -> Repo:
+    """
+    Wipes proposed ``work_dir``
+    and clones given repository into that location.
+    Sets depth of 1 to avoid fetching history.
+
+    If :data:`bibxml.settings.GIT_PARTIAL_CLONE` is enabled,
+    makes a blobless clone, and if ``sparse_paths`` are given
+    only checks out (and therefore downloads) files under those paths.
+
+    Otherwise, borrows objects from the shared cache
+    (see :func:`.update_object_cache()`),
+    so that a repository recloned by another worker or after a failure
+    isn’t downloaded in full again.
+    """
+
+    _ensure_under_tmp_root(work_dir)
+
     try:
         rmtree(work_dir)
     except FileNotFoundError:
@@ -35,7 +76,24 @@ def reclone(repo_url: str, branch: str, work_dir: str) \
 
     Path(work_dir).mkdir(parents=True, exist_ok=True)
 
-    repo = Repo.clone_from(repo_url, work_dir, branch=branch, depth=1)
+    clone_options: Dict[str, Any] = dict(branch=branch, depth=1)
+
+    if PARTIAL_CLONE:
+        clone_options['filter'] = 'blob:none'
+        if sparse_paths:
+            clone_options['sparse'] = True
+    elif OBJECT_CACHE:
+        cache_path = update_object_cache(repo_url, branch)
+        if cache_path:
+            clone_options['reference_if_able'] = cache_path
+            # Copy borrowed objects so that the clone
+            # doesn’t break if cache is wiped
+            clone_options['dissociate'] = True
+
+    repo = Repo.clone_from(repo_url, work_dir, **clone_options)
+
+    if clone_options.get('sparse', False):
+        repo.git.sparse_checkout('set', *(sparse_paths or []))
 
     # Set name and email; may be required when pulling
     repo.config_writer().set_value("user", "name", "ci").release()
@@ -44,15 +102,85 @@ def reclone(repo_url: str, branch: str, work_dir: str) \
     return repo
 
 
-def ensure_latest(repo_url: str, branch: str, work_dir: str) \
-        -> Tuple[Repo, bool]:
+def get_object_cache_path(repo_url: str) -> str:
+    """
+    :returns: path to the object cache repository for given URL
+              (see :func:`.update_object_cache()`).
+              Lock file used while updating it sits next to it,
+              with ``.lock`` suffix.
+    """
+    return path.join(
+        settings.DATASET_TMP_ROOT,
+        OBJECT_CACHE_DIRNAME,
+        hashlib.sha224(repo_url.encode('utf-8')).hexdigest())
+
+
+def update_object_cache(repo_url: str, branch: str) -> Optional[str]:
+    """
+    Fetches head commit of given branch into a bare repository
+    under :data:`bibxml.settings.DATASET_TMP_ROOT`
+    shared by all workers, which clones can borrow objects from.
+
+    Branch is not fetched again until :data:`.OBJECT_CACHE_TTL` passes;
+    a stale cache only means clones download more objects.
+
+    Concurrent updates of the same cache are serialized with a file lock.
+
+    :returns: path to the cache repository,
+              or ``None`` if it could not be updated.
+    """
+
+    cache_path = get_object_cache_path(repo_url)
+
+    # Marks when branch was last fetched; kept inside the cache repository
+    # (Git ignores unknown files there), so that it goes away with it
+    fetched_marker = Path(
+        cache_path,
+        'fetched',
+        hashlib.sha224(branch.encode('utf-8')).hexdigest())
+
+    Path(cache_path).mkdir(parents=True, exist_ok=True)
+
+    with open('{}.lock'.format(cache_path), 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            if not path.exists(path.join(cache_path, 'HEAD')):
+                Repo.init(cache_path, bare=True)
+            elif (fetched_marker.exists() and (
+                time.time() - fetched_marker.stat().st_mtime
+                < OBJECT_CACHE_TTL
+            )):
+                return cache_path
+            Repo(cache_path).git.fetch(
+                repo_url,
+                '+refs/heads/{0}:refs/heads/{0}'.format(branch),
+                depth=1)
+            fetched_marker.parent.mkdir(exist_ok=True)
+            fetched_marker.touch()
+        except GitCommandError:
+            logger.exception(
+                "Failed to update object cache for %s",
+                repo_url)
+            return None
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    return cache_path
+
+
+def ensure_latest(
+    repo_url: str,
+    branch: str,
+    work_dir: str,
+    sparse_paths: Optional[List[str]] = None,
+) -> Tuple[Repo, bool]:
     """
     If specified working directory contains a Git repo
-    matching provided configuration (URL and branch), performs a pull
-    (fetch with depth of 1 and reset).
+    matching provided configuration (URL, branch and, if applicable,
+    sparse checkout), performs a pull (fetch with depth of 1 and reset).
 
     Otherwise, removes working directory if it exists
-    and clones the repository afresh.
+    and clones the repository afresh (see :func:`.reclone()`).
 
     :returns: a tuple with GitPython’s Repo instance
               and a flag indicating whether head commit changed
@@ -70,7 +198,8 @@ def ensure_latest(repo_url: str, branch: str, work_dir: str) \
         if all(['origin' in repo.remotes,
                 repo.remotes.origin.exists(),
                 repo.remotes.origin.url == repo_url,
-                repo.active_branch.name == branch]):
+                repo.active_branch.name == branch,
+                _is_sparse(repo) == bool(PARTIAL_CLONE and sparse_paths)]):
             try:
                 sha_before_pull = repo.head.commit.hexsha
                 repo.remotes.origin.fetch(branch, depth=1, update_shallow=True)
@@ -88,7 +217,7 @@ def ensure_latest(repo_url: str, branch: str, work_dir: str) \
                 "Invalid repo config in working directory for %s (%s), "
                 "must re-clone repo",
                 repo_url, work_dir)
-            return reclone(repo_url, branch, work_dir), True
+            return reclone(repo_url, branch, work_dir, sparse_paths), True
     else:
         logger.warning(
             "Missing or inaccessible working directory for %s (%s: %s), "
@@ -96,4 +225,141 @@ def ensure_latest(repo_url: str, branch: str, work_dir: str) \
             repo_url,
             work_dir,
             f'dir: {is_dir}, git: {is_git_dir}, access: {is_accessible}')
-        return reclone(repo_url, branch, work_dir), True
+        return reclone(repo_url, branch, work_dir, sparse_paths), True
+
+
+def ensure_commit(
+    repo_url: str,
+    branch: str,
+    work_dir: str,
+    sha: str,
+    sparse_paths: Optional[List[str]] = None,
+) -> Repo:
+    """
+    Makes sure given commit of the repository is checked out
+    in specified working directory, which may be missing, stale
+    or ahead of it.
+
+    If head commit differs, the directory is synced
+    (see :func:`.ensure_latest()`), and if branch head still differs
+    the commit is fetched and checked out explicitly.
+
+    Concurrent calls for the same working directory
+    are serialized with a file lock.
+
+    :raises RuntimeError: if the commit could not be checked out
+                          (e.g., it’s gone from remote after a force push)
+    """
+
+    _ensure_under_tmp_root(work_dir)
+    Path(path.dirname(work_dir)).mkdir(parents=True, exist_ok=True)
+
+    with open('{}.lock'.format(work_dir), 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            if path.isdir(path.join(work_dir, '.git')):
+                try:
+                    repo = Repo(work_dir)
+                    if repo.head.commit.hexsha == sha:
+                        return repo
+                except (ValueError, GitCommandError):
+                    # E.g., no commits in a broken clone
+                    pass
+
+            repo, _ = ensure_latest(repo_url, branch, work_dir, sparse_paths)
+
+            if repo.head.commit.hexsha != sha:
+                logger.info(
+                    "Checking out %s of %s in %s",
+                    sha, repo_url, work_dir)
+                try:
+                    repo.remotes.origin.fetch(sha, depth=1)
+                    repo.head.reset(sha, hard=True, working_tree=True)
+                except GitCommandError as err:
+                    raise RuntimeError(
+                        "Unable to check out {} of {}".format(sha, repo_url)
+                    ) from err
+
+            return repo
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _is_sparse(repo: Repo) -> bool:
+    # Sparse checkout may be configured per worktree,
+    # which GitPython config reader doesn’t see
+    try:
+        return repo.git.config('--get', 'core.sparseCheckout') == 'true'
+    except GitCommandError:
+        return False
+
+
+def get_remote_head(repo_url: str, branch: str) -> Optional[str]:
+    """
+    Obtains head commit of given branch in remote repository
+    using ``git ls-remote``, which doesn’t require a local clone
+    and only transfers a list of refs.
+
+    :returns: commit SHA, or ``None`` if it could not be determined
+              (e.g., the remote is unreachable or branch doesn’t exist).
+    """
+
+    ref = 'refs/heads/{}'.format(branch)
+
+    try:
+        output = str(Git().ls_remote(
+            repo_url,
+            ref,
+            kill_after_timeout=LS_REMOTE_TIMEOUT,
+            env={'GIT_TERMINAL_PROMPT': '0'}))
+    except GitCommandError:
+        logger.warning(
+            "Unable to list remote heads of %s",
+            repo_url)
+        return None
+
+    for line in output.splitlines():
+        sha, _, line_ref = line.partition('\t')
+        if line_ref.strip() == ref:
+            return sha.strip()
+
+    logger.warning(
+        "Branch %s not found in %s",
+        branch,
+        repo_url)
+    return None
+
+
+def get_changed_paths(repo: Repo, since_sha: str) -> Union[List[str], None]:
+    """
+    Lists paths that were added, modified or deleted
+    between commit ``since_sha`` and current head of given repository.
+
+    Renames are reported as a deletion of the old path
+    plus an addition of the new one.
+
+    Since repositories are fetched with depth of 1, this only works
+    if ``since_sha`` is still present in the local object database
+    (i.e., it was a previously checked out head and the repository
+    was not recloned since).
+
+    :returns: a list of paths relative to repository root,
+              or ``None`` if the change set could not be determined.
+    """
+
+    try:
+        output = repo.git.diff(
+            '--name-only',
+            '--no-renames',
+            since_sha,
+            repo.head.commit.hexsha,
+            '--')
+    except GitCommandError:
+        logger.warning(
+            "Unable to diff %s against %s in %s, history is unavailable",
+            since_sha,
+            repo.head.commit.hexsha,
+            repo.working_tree_dir)
+        return None
+    else:
+        return [line for line in output.splitlines() if line.strip()]
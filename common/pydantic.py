@@ -1,7 +1,16 @@
 """Pydantic-related utilities."""
 
-from typing import Any
+from typing import Any, Callable, Dict, Optional, Type, TypeVar, Union
+from typing import get_args, get_origin, is_typeddict
+from copy import deepcopy
 from dataclasses import asdict, is_dataclass
+import datetime
+import functools
+
+from pydantic import BaseModel
+
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
 
 
 def unpack_dataclasses(v: Any):
@@ -26,3 +35,166 @@ def unpack_dataclasses(v: Any):
         return unpack_dataclasses(d)
     else:
         return v
+
+
+def construct_validated(model: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+    """
+    Instantiates given model from a dictionary obtained by dumping
+    an already validated instance (e.g., with ``.dict()``
+    and :func:`.unpack_dataclasses`, dates as ISO strings),
+    without validating it again.
+
+    Unlike Pydantic’s own ``construct()``, nested models, dataclasses
+    and dates are instantiated as well. Which member of a union type
+    a value belongs to is told by the value’s shape
+    (list, mapping or scalar); a string in a union with date
+    is a date if it is an ISO date.
+
+    Passing data that did not come from a valid instance
+    results in an instance that may not match the model.
+    """
+    constructors = _get_field_constructors(model)
+    values: Dict[str, Any] = {}
+    for name, value in data.items():
+        constructor = constructors.get(name, None)
+        values[name] = (
+            constructor(value)
+            if constructor is not None and value is not None
+            else value)
+    return model.construct(**values)
+
+
+Constructor = Callable[[Any], Any]
+
+
+@functools.lru_cache(maxsize=None)
+def _get_field_constructors(model: Any) -> Dict[str, Constructor]:
+    """Returns constructors (see :func:`._get_constructor`)
+    for fields of given model or Pydantic dataclass
+    whose values are not kept as they are in dumped data."""
+
+    fields = getattr(model, '__pydantic_model__', model).__fields__
+    constructors: Dict[str, Constructor] = {}
+    for name, field in fields.items():
+        constructor = _get_constructor(field.outer_type_)
+        if constructor is not None:
+            constructors[name] = constructor
+    return constructors
+
+
+@functools.lru_cache(maxsize=None)
+def _get_constructor(type_: Any) -> Optional[Constructor]:
+    """Returns a function that instantiates given type
+    from a non-null dumped value,
+    or ``None`` if such values are kept as they are.
+
+    Nested models’ fields are looked up when first constructed,
+    so that recursive models can be handled."""
+
+    origin = get_origin(type_)
+
+    if origin is Union:
+        members = get_args(type_)
+        list_constructor: Optional[Constructor] = None
+        mapping_constructor: Optional[Constructor] = None
+        for member in members:
+            if get_origin(member) is list:
+                list_constructor = list_constructor or _get_constructor(member)
+            elif _is_mapping_type(member):
+                mapping_constructor = (
+                    mapping_constructor
+                    or _get_constructor(member))
+        has_date = datetime.date in members
+        if not (list_constructor or mapping_constructor or has_date):
+            return None
+
+        def construct_union_member(value: Any) -> Any:
+            if isinstance(value, list):
+                constructor = list_constructor
+            elif isinstance(value, dict):
+                constructor = mapping_constructor
+            elif has_date and isinstance(value, str):
+                constructor = _construct_date
+            else:
+                constructor = None
+            return constructor(value) if constructor is not None else value
+
+        return construct_union_member
+
+    elif origin is list:
+        item_constructor = _get_constructor((get_args(type_) or (Any, ))[0])
+        if item_constructor is None:
+            return None
+        return (lambda value: [
+            item_constructor(item) if item is not None else None
+            for item in value
+        ])
+
+    elif type_ is datetime.date:
+        return _construct_date
+
+    elif not _is_mapping_type(type_):
+        return None
+
+    elif issubclass(type_, BaseModel):
+        return functools.partial(construct_validated, type_)
+
+    elif is_typeddict(type_):
+        item_constructors = {
+            key: constructor
+            for key, constructor in (
+                (key, _get_constructor(item_type))
+                for key, item_type in type_.__annotations__.items()
+            )
+            if constructor is not None
+        }
+        return (lambda value: {
+            key: (
+                item_constructors[key](item)
+                if key in item_constructors and item is not None
+                else item)
+            for key, item in value.items()
+        })
+
+    else:
+        return functools.partial(_construct_dataclass, type_)
+
+
+def _is_mapping_type(type_: Any) -> bool:
+    """Whether values of given type are dumped as dictionaries."""
+
+    return isinstance(type_, type) and (
+        issubclass(type_, BaseModel)
+        or is_dataclass(type_)
+        or is_typeddict(type_))
+
+
+def _construct_date(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return datetime.date.fromisoformat(value)
+        except ValueError:
+            # A relaxed date (see bib_models.models.dates)
+            pass
+    return value
+
+
+def _construct_dataclass(cls: Any, data: Dict[str, Any]) -> Any:
+    # Mirrors what Pydantic’s dataclass initialization leaves behind,
+    # minus validation
+    constructors = _get_field_constructors(cls)
+    values: Dict[str, Any] = {}
+    for name, field in cls.__pydantic_model__.__fields__.items():
+        if name not in data:
+            values[name] = deepcopy(field.default)
+        else:
+            value = data[name]
+            constructor = constructors.get(name, None)
+            values[name] = (
+                constructor(value)
+                if constructor is not None and value is not None
+                else value)
+    obj = cls.__new__(cls)
+    object.__setattr__(obj, '__dict__', values)
+    object.__setattr__(obj, '__initialised__', True)
+    return obj
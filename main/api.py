@@ -1,7 +1,15 @@
 """View functions for API endpoints."""
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
+from typing import cast as typeCast
 from urllib.parse import unquote_plus
+import io
+import json
+import re
+import zipfile
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 
 from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
 
@@ -18,7 +26,7 @@ from xml2rfc_compat.serializer import get_suitable_anchor
 
 from .search import BaseCitationSearchView
 from .query import get_indexed_item
-from .query import build_citation_for_docid
+from .query import build_citation_for_docid, build_citations_for_docids
 from .exceptions import RefNotFoundError
 from . import external_sources
 
@@ -58,10 +66,12 @@ def get_doi_ref(request, ref):
         if format == 'relaton':
             return JsonResponse({"data": unpack_dataclasses(bibitem.dict())})
         else:
-            kwargs = dict(anchor=request.GET.get('anchor', None))
             serializer = serializers.get(format)
             try:
-                bibitem_serialized = serializer.serialize(bibitem, **kwargs)
+                bibitem_serialized = serializers.serialize(
+                    format,
+                    bibitem,
+                    anchor=request.GET.get('anchor', None))
             except ValueError as err:
                 return JsonResponse({
                     "error":
@@ -84,6 +94,8 @@ def get_by_docid(request):
     (“accepts” header is ignored at this time.)
 
     ``anchor``, if provided in GET query, is passed to serializer.
+    Output stored at indexing time is served if available
+    (see :func:`bib_models.serializers.serialize()`).
 
     Response has extra header ``X-Xml2rfc-Anchor``
     containing xml2rfc-compatible effective anchor string
@@ -151,7 +163,8 @@ def get_by_docid(request):
         else:
             serializer = serializers.get(format)
             try:
-                bibitem_serialized = serializer.serialize(
+                bibitem_serialized = serializers.serialize(
+                    format,
                     bibitem,
                     anchor=requested_anchor)
             except ValueError as err:
@@ -176,6 +189,234 @@ def get_by_docid(request):
     return resp
 
 
+BATCH_MAX_ITEMS: int = getattr(
+    settings,
+    'API_BATCH_MAX_ITEMS',
+    1000)
+"""Maximum number of items resolved by :func:`.get_by_docid_batch`.
+See :data:`bibxml.settings.API_BATCH_MAX_ITEMS`."""
+
+BATCH_OUTPUTS = ('json', 'concatenated', 'zip')
+"""Supported ``output`` values of :func:`.get_by_docid_batch`."""
+
+
+def get_by_docid_batch(request):
+    """Obtains many items at once, equivalent to calling
+    :func:`get_by_docid` with each of ``items`` in POSTed JSON object.
+    Each item is an object with ``docid``
+    and optional ``doctype``, ``anchor`` and ``format``
+    (top-level ``format``, “relaton” by default, is used if not given).
+
+    All items are retrieved
+    using a constant number of queries
+    (see :func:`main.query.build_citations_for_docids()`).
+
+    Items that can’t be obtained don’t fail the request,
+    but are reported under their index among given items.
+    Top-level ``output`` determines response shape:
+
+    - ``json`` (default): an object with ``data``, mapping item index
+      to an object with effective ``anchor``, ``format``
+      and ``data`` (Relaton data, or serialized item as a string),
+      and ``errors``, mapping item index to error description;
+    - ``concatenated``: serialized items one after another,
+      with errors as XML comments in place of items that failed
+      (all items must use the same format, other than Relaton);
+    - ``zip``: a ZIP archive with a file per item
+      named after its effective anchor,
+      and ``errors.json`` if any items failed.
+    """
+
+    try:
+        payload = json.loads(request.body)
+        entries = payload['items']
+        if not isinstance(entries, list):
+            raise TypeError("Items must be a list")
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({
+            "error": "Expected a JSON object with a list of items",
+        }, status=400)
+
+    default_format = payload.get('format', None) or 'relaton'
+    output = payload.get('output', None) or 'json'
+
+    if output not in BATCH_OUTPUTS:
+        return JsonResponse({
+            "error": "Requested output is not supported",
+        }, status=400)
+
+    if len(entries) > BATCH_MAX_ITEMS:
+        return JsonResponse({
+            "error":
+                "Too many items requested ({}, at most {})".
+                format(len(entries), BATCH_MAX_ITEMS),
+        }, status=400)
+
+    errors: Dict[int, str] = {}
+    requested: Dict[int, Tuple[str, Optional[str]]] = {}
+    formats: Dict[int, str] = {}
+    anchors: Dict[int, Optional[str]] = {}
+
+    for idx, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            entry = {}
+        docid, doctype = entry.get('docid', None), entry.get('doctype', None)
+        formats[idx] = entry.get('format', None) or default_format
+        anchors[idx] = entry.get('anchor', None) or None
+
+        if not isinstance(docid, str) or not docid.strip():
+            errors[idx] = "Missing document ID"
+        elif formats[idx] != 'relaton' \
+                and formats[idx] not in serializers.registry:
+            errors[idx] = "Requested format is not supported"
+        else:
+            requested[idx] = (
+                docid.strip(),
+                doctype.strip() if isinstance(doctype, str)
+                and doctype.strip() else None)
+
+    if output == 'concatenated' and (
+        len(set(formats.values())) > 1
+        or not set(formats.values()) <= set(serializers.registry.keys())
+    ):
+        return JsonResponse({
+            "error":
+                "Concatenated output requires all items "
+                "to use the same format, other than Relaton",
+        }, status=400)
+
+    results: Dict[int, Tuple[str, str, Union[str, Dict[str, Any]]]] = {}
+
+    citations = build_citations_for_docids(
+        list(requested.values()),
+        strict=True)
+
+    for (idx, (docid, doctype)), citation in zip(
+        requested.items(),
+        citations,
+    ):
+        format = formats[idx]
+        outcome: str
+
+        try:
+            if isinstance(citation, Exception):
+                raise citation
+            # This will be the latest sourced item.
+            bibitem = list(citation.sources.values())[0].bibitem
+
+        except (RefNotFoundError, AttributeError, IndexError):
+            outcome = 'not_found'
+            errors[idx] = (
+                "Unable to find bibliographic item matching "
+                "document ID {}{}".
+                format(docid, f' (type {doctype})' if doctype else ''))
+
+        except ValidationError as err:
+            outcome = 'validation_error'
+            errors[idx] = (
+                "Source data for item {} ({}) didn’t validate "
+                "(err: {})".
+                format(docid, doctype or "unspecified", str(err)))
+
+        else:
+            anchor = anchors[idx] or get_suitable_anchor(
+                as_list(bibitem.docid or []))
+
+            if format == 'relaton':
+                outcome = 'success'
+                results[idx] = (
+                    anchor,
+                    format,
+                    unpack_dataclasses(bibitem.dict()))
+            else:
+                try:
+                    serialized = serializers.serialize(
+                        format,
+                        bibitem,
+                        anchor=anchors[idx])
+                except ValueError as err:
+                    outcome = 'serialization_error'
+                    errors[idx] = (
+                        "Unable to serialize item {} ({}) "
+                        "into requested format: "
+                        "unsuitable source data (err: {})".
+                        format(docid, doctype or "unspecified", str(err)))
+                else:
+                    outcome = 'success'
+                    results[idx] = (
+                        anchor,
+                        format,
+                        serialized.decode('utf-8')
+                        if isinstance(serialized, bytes)
+                        else serialized)
+
+        metrics.api_bibitem_hits.labels(docid, outcome, format).inc()
+
+    if output == 'concatenated':
+        parts: List[str] = []
+        for idx in range(len(entries)):
+            if idx in results:
+                parts.append(typeCast(str, results[idx][2]))
+            else:
+                parts.append('<!-- Item {}: {} -->'.format(
+                    idx,
+                    errors[idx].replace('--', '- -')))
+        return HttpResponse(
+            '\n'.join(parts),
+            content_type=serializers.get(formats[0]).content_type
+            if entries else 'application/xml',
+            charset='utf-8')
+
+    elif output == 'zip':
+        archive = io.BytesIO()
+        filenames: Set[str] = set()
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zipped:
+            for idx, (anchor, format, data) in sorted(results.items()):
+                # E.g., “xml” for application/xml
+                extension = '.{}'.format(
+                    'json'
+                    if format == 'relaton'
+                    else serializers.get(format).content_type.
+                    split('/')[-1].split('+')[-1])
+                filename = 'reference.{}{}'.format(
+                    re.sub(r'[/\\]', '_', anchor),
+                    extension)
+                if filename in filenames:
+                    filename = 'reference.{}.{}{}'.format(
+                        re.sub(r'[/\\]', '_', anchor),
+                        idx,
+                        extension)
+                filenames.add(filename)
+                if isinstance(data, dict):
+                    content = json.dumps(data, cls=DjangoJSONEncoder)
+                else:
+                    content = data
+                zipped.writestr(filename, content.encode('utf-8'))
+            if errors:
+                zipped.writestr('errors.json', json.dumps({
+                    str(idx): error
+                    for idx, error in sorted(errors.items())
+                }))
+        return HttpResponse(
+            archive.getvalue(),
+            content_type='application/zip',
+            headers={
+                'Content-Disposition': 'attachment; filename="items.zip"',
+            })
+
+    else:
+        return JsonResponse({
+            "data": {
+                str(idx): dict(anchor=anchor, format=format, data=data)
+                for idx, (anchor, format, data) in sorted(results.items())
+            },
+            "errors": {
+                str(idx): error
+                for idx, error in sorted(errors.items())
+            },
+        })
+
+
 class CitationSearchResultListView(BaseCitationSearchView):
     """Allows to search bibliographic data via API."""
 
@@ -187,10 +428,11 @@ class CitationSearchResultListView(BaseCitationSearchView):
         result_count = len(self.object_list)
         meta: Dict[str, Any] = dict(total_records=result_count)
 
+        base_url = self.request.build_absolute_uri(self.request.path)
+        params = self.request.GET.copy()
+
         page_obj = context['page_obj']
         if page_obj:
-            base_url = self.request.build_absolute_uri(self.request.path)
-            params = self.request.GET.copy()
             try:
                 params.pop('page')
             except KeyError:
@@ -209,6 +451,13 @@ class CitationSearchResultListView(BaseCitationSearchView):
                     page_obj.previous_page_number(),
                     params_encoded)
 
+        elif self.cursor is not None:
+            # Keyset pagination only goes forward
+            meta['next_cursor'] = self.next_cursor
+            if self.next_cursor:
+                params['cursor'] = self.next_cursor
+                meta['next'] = "{}?{}".format(base_url, params.urlencode())
+
         return JsonResponse({
             "meta": meta,
             "data": [
@@ -244,7 +493,7 @@ def get_ref(request, dataset_name: str, ref: str):
         bibitem: BibliographicItem
         if dataset_name in external_sources.registry:
             source = external_sources.registry[dataset_name]
-            bibitem = source.get_item(ref.strip()).bibitem
+            bibitem = source.get_item(ref.strip(), True).bibitem
         else:
             indexed_item = get_indexed_item(
                 dataset_name,
@@ -271,11 +520,13 @@ def get_ref(request, dataset_name: str, ref: str):
             return JsonResponse({"data": unpack_dataclasses(bibitem.dict())})
 
         else:
-            kwargs = dict(anchor=request.GET.get('anchor', None))
             serializer = serializers.get(format)
 
             try:
-                bibitem_serialized = serializer.serialize(bibitem, **kwargs)
+                bibitem_serialized = serializers.serialize(
+                    format,
+                    bibitem,
+                    anchor=request.GET.get('anchor', None))
 
             except ValueError as err:
                 return JsonResponse({
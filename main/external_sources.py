@@ -1,6 +1,6 @@
 """Provides an external source registry."""
 
-from typing import Dict, Callable, Any, Optional, Union
+from typing import Dict, Callable, Any, Optional
 import logging
 from functools import wraps
 
@@ -20,12 +20,9 @@ log = logging.getLogger(__name__)
 class ExternalSource:
     """Represents a registered external source."""
 
-    get_item: Union[
-        Callable[[str, bool], ExternalBibliographicItem],
-        Callable[[str], ExternalBibliographicItem],
-    ]
+    get_item: Callable[[str, bool], ExternalBibliographicItem]
     """Returns an item given docid.id. The ``strict`` argument
-    is True by default and means the method must throw
+    means the method must throw
     if received item did not pass validation.
     """
 
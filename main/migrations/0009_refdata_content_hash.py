@@ -0,0 +1,18 @@
+# Generated by Django 4.1.7 on 2023-03-14 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_refdata_latest_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='refdata',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', help_text='SHA-256 of source file contents at indexing time.', max_length=64),
+        ),
+    ]
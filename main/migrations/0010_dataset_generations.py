@@ -0,0 +1,34 @@
+# Generated by Django 4.1.7 on 2023-03-14 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0009_refdata_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatasetGeneration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dataset', models.CharField(help_text='Internal dataset ID.', max_length=24, unique=True)),
+                ('generation', models.PositiveIntegerField(help_text='Generation of dataset items that is currently live.')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='refdata',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='refdata',
+            name='generation',
+            field=models.PositiveIntegerField(default=0, help_text='Dataset generation this item was indexed under.'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='refdata',
+            unique_together={('ref', 'dataset', 'generation')},
+        ),
+    ]
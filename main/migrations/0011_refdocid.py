@@ -0,0 +1,56 @@
+# Generated by Django 4.1.7 on 2023-03-14 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0010_dataset_generations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RefDocID',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('doctype', models.TextField(blank=True, default='', help_text='Document identifier type (docid.type).')),
+                ('docid', models.TextField(help_text='Document identifier (docid.id).')),
+                ('docid_lower', models.TextField(db_index=True, help_text='Lowercased document identifier.')),
+                ('primary', models.BooleanField(default=False)),
+                ('scope', models.TextField(blank=True, default='')),
+                ('ref_data', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='docids', to='main.refdata')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['docid', 'doctype'], name='refdocid_docid_doctype'), models.Index(django.db.models.functions.text.Lower('doctype'), django.db.models.functions.text.Lower('docid'), name='refdocid_lower_doctype_docid')],
+            },
+        ),
+        # Backfill from already indexed items
+        migrations.RunSQL(
+            sql='''
+                INSERT INTO main_refdocid
+                    (ref_data_id, doctype, docid, docid_lower, "primary", scope)
+                SELECT
+                    api_ref_data.id,
+                    coalesce(docid.value->>'type', ''),
+                    docid.value->>'id',
+                    lower(docid.value->>'id'),
+                    coalesce(docid.value->'primary' = 'true'::jsonb, false),
+                    coalesce(docid.value->>'scope', '')
+                FROM api_ref_data
+                CROSS JOIN LATERAL jsonb_array_elements(
+                    CASE jsonb_typeof(api_ref_data.body->'docid')
+                        WHEN 'array' THEN api_ref_data.body->'docid'
+                        WHEN 'object' THEN
+                            jsonb_build_array(api_ref_data.body->'docid')
+                        ELSE '[]'::jsonb
+                    END
+                ) AS docid
+                WHERE jsonb_typeof(docid.value) = 'object'
+                AND docid.value->>'id' IS NOT NULL
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
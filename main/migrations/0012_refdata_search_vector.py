@@ -0,0 +1,41 @@
+# Generated by Django 4.1.7 on 2023-03-14 10:12
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0011_refdocid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='refdata',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(null=True),
+        ),
+        # Backfill before building the index.
+        # Same expression as main.models.SEARCH_VECTOR_SQL at the time.
+        migrations.RunSQL(
+            sql='''
+                UPDATE api_ref_data SET search_vector =
+                    setweight(to_tsvector('english',
+                        jsonb_path_query_array(body, '$.title[*].content')), 'A')
+                    || setweight(to_tsvector('english',
+                        jsonb_path_query_array(body, '$.docid[*].id')), 'A')
+                    || setweight(to_tsvector('english',
+                        coalesce(body->'contributor', '[]'::jsonb)), 'B')
+                    || setweight(to_tsvector('english',
+                        coalesce(body->'abstract', '[]'::jsonb)), 'C')
+                    || setweight(to_tsvector('english', body), 'D')
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='refdata',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='search_vector_gin'),
+        ),
+    ]
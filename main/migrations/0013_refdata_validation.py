@@ -0,0 +1,23 @@
+# Generated by Django 4.1.7 on 2023-03-14 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0012_refdata_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='refdata',
+            name='is_valid',
+            field=models.BooleanField(help_text='Whether body validated at indexing time.', null=True),
+        ),
+        migrations.AddField(
+            model_name='refdata',
+            name='validation_errors',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.1.7 on 2023-03-14 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0013_refdata_validation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Work',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('doctype', models.TextField(help_text='Primary document identifier type (docid.type).')),
+                ('docid', models.TextField(help_text='Primary document identifier (docid.id).')),
+            ],
+            options={
+                'unique_together': {('docid', 'doctype')},
+            },
+        ),
+        migrations.AddField(
+            model_name='refdata',
+            name='work',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='members', to='main.work'),
+        ),
+        # Backfill from already indexed document identifiers,
+        # taking the first suitable primary one per item
+        # like main.models.get_work_key() does
+        migrations.RunSQL(
+            sql='''
+                CREATE TEMPORARY TABLE work_keys ON COMMIT DROP AS
+                SELECT DISTINCT ON (ref_data_id) ref_data_id, doctype, docid
+                FROM main_refdocid
+                WHERE "primary" AND doctype <> '' AND scope = ''
+                ORDER BY ref_data_id, id;
+
+                INSERT INTO main_work (doctype, docid)
+                SELECT DISTINCT doctype, docid FROM work_keys
+                ON CONFLICT DO NOTHING;
+
+                UPDATE api_ref_data
+                SET work_id = main_work.id
+                FROM work_keys
+                JOIN main_work
+                    ON main_work.doctype = work_keys.doctype
+                    AND main_work.docid = work_keys.docid
+                WHERE api_ref_data.id = work_keys.ref_data_id;
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
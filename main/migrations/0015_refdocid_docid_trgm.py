@@ -0,0 +1,20 @@
+# Generated by Django 4.1.7 on 2023-03-14 10:12
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0014_work'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='refdocid',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['docid'], name='refdocid_docid_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
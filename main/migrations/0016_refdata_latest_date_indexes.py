@@ -0,0 +1,21 @@
+# Generated by Django 4.1.7 on 2023-03-14 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0015_refdocid_docid_trgm'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='refdata',
+            index=models.Index(fields=['-latest_date', '-id'], name='refdata_latest_date_id'),
+        ),
+        migrations.AddIndex(
+            model_name='refdata',
+            index=models.Index(fields=['dataset', '-latest_date', '-id'], name='refdata_dataset_latest_date'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.1.7 on 2023-03-14 10:12
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0016_refdata_latest_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='refdata',
+            name='normalized_body',
+            field=models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Body as validated at indexing time, if it is valid.', null=True),
+        ),
+    ]
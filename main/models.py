@@ -1,8 +1,92 @@
+from typing import List, Dict, Any, Optional, Tuple
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
-from django.db.models.functions import Cast
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.db.models import Exists, OuterRef
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Lower
 from django.db.models.fields.json import KeyTransform
 from django.contrib.postgres.indexes import GinIndex
-from django.contrib.postgres.search import SearchVector
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+
+
+SEARCH_VECTOR_SQL = '''
+    setweight(to_tsvector('english',
+        jsonb_path_query_array(body, '$.title[*].content')), 'A')
+    || setweight(to_tsvector('english',
+        jsonb_path_query_array(body, '$.docid[*].id')), 'A')
+    || setweight(to_tsvector('english',
+        coalesce(body->'contributor', '[]'::jsonb)), 'B')
+    || setweight(to_tsvector('english',
+        coalesce(body->'abstract', '[]'::jsonb)), 'C')
+    || setweight(to_tsvector('english', body), 'D')
+'''
+"""SQL expression that computes :attr:`.RefData.search_vector`
+from item’s Relaton data: title and document identifiers
+are weighted A, contributors B, abstract C, and all other strings D."""
+
+
+class DatasetGeneration(models.Model):
+    """Points to the live generation of :class:`.RefData` items
+    for a dataset.
+
+    Rebuilding a dataset writes items under a new generation,
+    which only becomes visible once this pointer is switched to it
+    (see :func:`main.sources.rebuild_dataset`).
+    Datasets that were never rebuilt have no pointer,
+    and all their items (of generation 0) are live.
+    """
+
+    dataset = models.CharField(
+        max_length=24,
+        unique=True,
+        help_text="Internal dataset ID.")
+
+    generation = models.PositiveIntegerField(
+        help_text="Generation of dataset items that is currently live.")
+
+
+class Work(models.Model):
+    """A logical bibliographic item, identified by
+    a :term:`primary document identifier`.
+
+    Indexed :class:`.RefData` items that share their primary
+    document identifier (e.g., the same RFC indexed from different
+    datasets) are members of the same work,
+    which allows retrieving all of them with one lookup
+    (see :func:`main.query.build_citation_for_docid`)
+    rather than by matching document identifiers.
+
+    Maintained by indexer (see :func:`main.sources.assign_works`).
+    Works whose members are all gone are left in place;
+    they are never reached by lookups, which go through members.
+    """
+
+    doctype = models.TextField(
+        help_text="Primary document identifier type (docid.type).")
+    """:term:`document identifier type` of the primary identifier."""
+
+    docid = models.TextField(
+        help_text="Primary document identifier (docid.id).")
+    """:term:`docid.id` of the primary identifier, as given in source."""
+
+    class Meta:
+        unique_together = [['docid', 'doctype']]
+
+
+class LiveRefDataManager(models.Manager):
+    """Default manager for :class:`.RefData`,
+    which only returns items of live generations
+    (see :class:`.DatasetGeneration`)."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(~Exists(
+            DatasetGeneration.objects.
+            filter(dataset=OuterRef('dataset')).
+            exclude(generation=OuterRef('generation'))
+        ))
 
 
 class RefData(models.Model):
@@ -16,9 +100,14 @@ class RefData(models.Model):
     Model meta notes:
 
     - Explicit table name ``api_ref_data`` is used
-    - ``ref`` and ``dataset`` combinations must be unique
+    - ``ref``, ``dataset`` and ``generation`` combinations must be unique
+    - Default manager only returns items of live generations;
+      use ``all_generations`` manager when writing index data
     """
 
+    objects = LiveRefDataManager()
+    all_generations = models.Manager()
+
     dataset = models.CharField(
         max_length=24,
         help_text="Internal dataset ID.",
@@ -54,21 +143,85 @@ class RefData(models.Model):
     instead).
     """
 
+    content_hash = models.CharField(
+        max_length=64,
+        default='',
+        blank=True,
+        help_text="SHA-256 of source file contents at indexing time.")
+    """Hex digest of source file contents this item was indexed from,
+    combined with versions of serializers that stored output
+    in :attr:`representations`.
+
+    Used to skip writing items whose source didn’t change
+    when a dataset is reindexed. Empty if not known.
+    """
+
+    generation = models.PositiveIntegerField(
+        default=0,
+        help_text="Dataset generation this item was indexed under.")
+    """Dataset generation this item belongs to.
+    Items are only visible via default manager
+    if their generation is live, see :class:`.DatasetGeneration`.
+    """
+
+    search_vector = SearchVectorField(null=True)
+    """Weighted full-text search vector computed from :attr:`body`
+    at indexing time (see :data:`.SEARCH_VECTOR_SQL`)."""
+
     representations = models.JSONField(default=dict)
     """Contains alternative representations of the citation.
-    A mapping of ``{ <format_id>: <freeform string> }``,
+    A mapping of ``{ <format_id>@<version>: <freeform string> }``,
     where format is e.g. “bibxml”.
 
-    .. deprecated:: 2022.2
+    Filled in at indexing time by serializers that opt in to it
+    (see :func:`bib_models.serializers.preserialize()`).
+    Formats missing here, or stored by another version of the serializer,
+    are serialized on the fly.
+    """
+
+    is_valid = models.BooleanField(
+        null=True,
+        help_text="Whether body validated at indexing time.")
+    """Whether :attr:`body` validated
+    as a :class:`bib_models.models.bibdata.BibliographicItem`
+    when the item was indexed.
+    ``None`` if the item was indexed without validation
+    (e.g., before validation at indexing time was introduced).
+
+    Read paths use this to avoid revalidating items known to be invalid,
+    see :func:`main.query_utils.build_bibitem()`.
+    """
 
-       XML is obtained on the fly
-       using :mod:`xml2rfc_compat.serializer`.
+    validation_errors = models.JSONField(
+        default=list,
+        blank=True)
+    """Validation errors obtained at indexing time, as a list of strings.
+    Empty if the item is valid."""
 
-       The property is no longer filled in, but is left in place
-       in case a choice is made to pre-serialize representations
-       at indexing stage.
+    normalized_body = models.JSONField(
+        null=True,
+        blank=True,
+        encoder=DjangoJSONEncoder,
+        help_text="Body as validated at indexing time, if it is valid.")
+    """:attr:`body` as it was after validation at indexing time
+    (dumped :class:`bib_models.models.bibdata.BibliographicItem`,
+    dates as ISO strings), so that valid items can be served
+    without validating them again
+    (see :func:`main.query_utils.load_ref_body()`).
+    ``None`` if the item is invalid or was indexed without it.
     """
 
+    work = models.ForeignKey(
+        Work,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='members')
+    """Work this item is a member of,
+    as determined by its primary document identifier
+    (see :func:`.get_work_key()`).
+    ``None`` if the item has no primary document identifier."""
+
     ref_id = models.CharField(max_length=64)
     # DEPRECATED: Use ref
 
@@ -77,7 +230,7 @@ class RefData(models.Model):
 
     class Meta:
         db_table = 'api_ref_data'
-        unique_together = [['ref', 'dataset']]
+        unique_together = [['ref', 'dataset', 'generation']]
         indexes = [
             # TODO: Identify & remove unused indices
             GinIndex(
@@ -102,5 +255,156 @@ class RefData(models.Model):
                     config='english'),
                 name='body_ts_gin',
             ),
+            GinIndex(
+                fields=['search_vector'],
+                name='search_vector_gin',
+            ),
+            # Back keyset pagination (see main.pagination)
+            models.Index(
+                fields=['-latest_date', '-id'],
+                name='refdata_latest_date_id',
+            ),
+            models.Index(
+                fields=['dataset', '-latest_date', '-id'],
+                name='refdata_dataset_latest_date',
+            ),
             # TODO: Add more specific indexes for RefData.body subfields
         ]
+
+
+class RefDocID(models.Model):
+    """Holds a :term:`document identifier`
+    of an indexed :class:`.RefData` item, one per ``docid`` entry
+    in item’s Relaton representation.
+
+    Maintained by indexer, allows document identifier lookups
+    to use B-tree indexes instead of querying JSON data.
+    """
+
+    ref_data = models.ForeignKey(
+        RefData,
+        on_delete=models.CASCADE,
+        related_name='docids')
+    """Indexed item this identifier belongs to."""
+
+    doctype = models.TextField(
+        blank=True,
+        default='',
+        help_text="Document identifier type (docid.type).")
+    """:term:`document identifier type`, empty if not given."""
+
+    docid = models.TextField(
+        help_text="Document identifier (docid.id).")
+    """:term:`docid.id`, as given in source."""
+
+    docid_lower = models.TextField(
+        db_index=True,
+        help_text="Lowercased document identifier.")
+    """:term:`docid.id` in lower case, for case-insensitive lookups."""
+
+    primary = models.BooleanField(default=False)
+    """Whether this is a :term:`primary document identifier`."""
+
+    scope = models.TextField(blank=True, default='')
+    """Identifier scope, empty if not given."""
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['docid', 'doctype'],
+                name='refdocid_docid_doctype',
+            ),
+            models.Index(
+                Lower('doctype'),
+                Lower('docid'),
+                name='refdocid_lower_doctype_docid',
+            ),
+            # Allows regular expression (``~``, ``~*``)
+            # and substring (``LIKE``, ``ILIKE``) matches against docid
+            # to use an index, see :func:`main.query.search_refs_docid_regex`
+            GinIndex(
+                fields=['docid'],
+                name='refdocid_docid_trgm',
+                opclasses=['gin_trgm_ops'],
+            ),
+        ]
+
+
+def extract_docids(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Returns :class:`.RefDocID` field values
+    for each document identifier in given Relaton data.
+    Entries without an ID are skipped."""
+
+    raw_docids = body.get('docid', [])
+    if not isinstance(raw_docids, list):
+        raw_docids = [raw_docids]
+
+    docids: List[Dict[str, Any]] = []
+    for docid in raw_docids:
+        if not isinstance(docid, dict) or not docid.get('id', None):
+            continue
+        docid_id = str(docid['id'])
+        docids.append(dict(
+            doctype=str(docid.get('type', None) or ''),
+            docid=docid_id,
+            docid_lower=docid_id.lower(),
+            primary=docid.get('primary', None) is True,
+            scope=str(docid.get('scope', None) or ''),
+        ))
+    return docids
+
+
+def get_work_key(docids: List[Dict[str, Any]]) -> Optional[Tuple[str, str]]:
+    """Given document identifiers as returned by :func:`.extract_docids()`,
+    returns :class:`.Work` type and ID for an item.
+
+    Like :func:`main.query_utils.get_primary_docid()`,
+    takes the first primary identifier that has a type and no scope.
+
+    :returns: a 2-tuple of (doctype, docid),
+              or ``None`` if there is no suitable primary identifier
+    """
+    for docid in docids:
+        if docid['primary'] and docid['doctype'] and not docid['scope']:
+            return docid['doctype'], docid['docid']
+    return None
+
+
+@receiver(post_save, sender=RefData)
+def update_search_vector(sender, instance: RefData, **kwargs):
+    """Computes :attr:`.RefData.search_vector` for items saved one by one
+    (including fixtures). Bulk writes during indexing are handled
+    by :func:`main.sources.update_search_vectors`."""
+
+    (RefData.all_generations.
+        filter(pk=instance.pk).
+        update(search_vector=RawSQL(SEARCH_VECTOR_SQL, [])))
+
+
+@receiver(post_save, sender=RefData)
+def update_docids(sender, instance: RefData, **kwargs):
+    """Keeps :class:`.RefDocID` rows in sync with items saved one by one
+    (including fixtures). Bulk writes during indexing are handled
+    by :func:`main.sources.replace_docids`."""
+
+    instance.docids.all().delete()
+    RefDocID.objects.bulk_create([
+        RefDocID(ref_data=instance, **docid)
+        for docid in extract_docids(instance.body)
+    ])
+
+
+@receiver(post_save, sender=RefData)
+def update_work(sender, instance: RefData, **kwargs):
+    """Assigns :class:`.Work` to items saved one by one
+    (including fixtures). Bulk writes during indexing are handled
+    by :func:`main.sources.assign_works`."""
+
+    work_key = get_work_key(extract_docids(instance.body))
+    work_id: Optional[int] = None
+    if work_key:
+        work_id = Work.objects.get_or_create(
+            doctype=work_key[0],
+            docid=work_key[1])[0].pk
+    RefData.all_generations.filter(pk=instance.pk).update(work_id=work_id)
+    instance.work_id = work_id
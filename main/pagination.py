@@ -0,0 +1,120 @@
+"""Keyset (cursor) pagination over indexed refs.
+
+Refs are ordered by latest date and then by ID, both descending
+(see :data:`.CURSOR_ORDERING`), and each page continues strictly after
+the last ref of the previous page. Unlike ``OFFSET``-based pagination,
+fetching a page costs the same regardless of how deep it is,
+since the database can seek straight to the position
+using an index on the ordering columns.
+
+Positions are passed around as opaque cursor strings,
+so that clients don’t come to depend on what they contain.
+"""
+
+import base64
+import datetime
+import json
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from django.db.models import Q
+from django.db.models.query import QuerySet
+
+from .models import RefData
+
+
+__all__ = (
+    'CURSOR_ORDERING',
+    'CursorPage',
+    'InvalidCursor',
+    'encode_cursor',
+    'decode_cursor',
+    'paginate_refs_by_cursor',
+)
+
+
+CURSOR_ORDERING = ('-latest_date', '-id')
+"""Ordering of refs in cursor mode.
+Must match the keyset condition in :func:`.paginate_refs_by_cursor()`."""
+
+CursorPosition = Tuple[datetime.date, int]
+"""Latest date and ID of the last ref on a page."""
+
+
+class InvalidCursor(ValueError):
+    """Given cursor string was not obtained
+    from :func:`.encode_cursor()`."""
+    pass
+
+
+@dataclass
+class CursorPage:
+    """A page of refs obtained in cursor mode."""
+
+    object_list: List[RefData]
+    """Refs on this page, in :data:`.CURSOR_ORDERING`."""
+
+    next_cursor: Optional[str]
+    """Cursor pointing at the next page,
+    or ``None`` if this page is the last one."""
+
+
+def encode_cursor(ref: RefData) -> str:
+    """:returns: an opaque cursor string pointing after given ref"""
+
+    position = json.dumps([ref.latest_date.isoformat(), ref.pk])
+    return base64.urlsafe_b64encode(
+        position.encode('utf-8'),
+    ).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> CursorPosition:
+    """:raises InvalidCursor: cursor is malformed"""
+
+    try:
+        position = base64.urlsafe_b64decode(
+            cursor + '=' * (-len(cursor) % 4))
+        latest_date, pk = json.loads(position)
+        return datetime.date.fromisoformat(latest_date), int(pk)
+    except (ValueError, TypeError):
+        raise InvalidCursor("Malformed pagination cursor")
+
+
+def paginate_refs_by_cursor(
+    refs: QuerySet[RefData],
+    after: Optional[CursorPosition],
+    page_size: int,
+) -> CursorPage:
+    """Returns a page of refs from given queryset.
+
+    Existing ordering and slicing of the queryset are dropped
+    in favour of :data:`.CURSOR_ORDERING`,
+    so search functions that cap their results
+    can be used to obtain pages past their limit.
+
+    :param after: position obtained with :func:`.decode_cursor()`,
+                  or ``None`` for the first page
+    :param page_size: maximum number of refs on the page
+    """
+
+    refs = refs.all()
+    refs.query.clear_limits()
+
+    if after is not None:
+        latest_date, pk = after
+        # The redundant first condition lets the database
+        # use the ordering index for a range scan
+        refs = refs.filter(
+            Q(latest_date__lte=latest_date)
+            & (Q(latest_date__lt=latest_date) | Q(pk__lt=pk)))
+
+    found = list(refs.order_by(*CURSOR_ORDERING)[:page_size + 1])
+
+    return CursorPage(
+        object_list=found[:page_size],
+        next_cursor=(
+            encode_cursor(found[page_size - 1])
+            if len(found) > page_size
+            else None
+        ),
+    )
@@ -1,21 +1,25 @@
 """Retrieving bibliographic items from indexed Relaton sources."""
 
 import re
+import hashlib
 import logging
 import json
+import functools
+import operator
 from typing import cast as typeCast, Set, FrozenSet, Optional, Callable
 from typing import Dict, List, Union, Tuple, Any
 
-from pydantic import ValidationError
 
 from django.contrib.postgres.search import SearchQuery, SearchVector
-from django.contrib.postgres.search import SearchHeadline
-from django.db.models.functions import Cast
-from django.db.models import TextField
+from django.contrib.postgres.search import SearchHeadline, SearchRank
+from django.db.models.functions import Cast, Lower
+from django.db.models import TextField, F, Exists, OuterRef
 from django.db.models.query import QuerySet, Q
 from django.db.models.expressions import RawSQL
 from django.db.utils import ProgrammingError, DataError
+from pydantic import ValidationError
 from django.conf import settings
+from django.core.cache import cache
 
 # from sources import list_internal as list_internal_sources
 # from sources import InternalSource
@@ -28,17 +32,22 @@ from .exceptions import RefNotFoundError
 from .types import IndexedBibliographicItem
 from .types import CompositeSourcedBibliographicItem, FoundItem
 from .sources import get_source_meta, get_indexed_object_meta
-from .models import RefData
+from .models import RefData, RefDocID, Work, DatasetGeneration
 from .query_utils import query_suppressing_user_input_error, merge_refs
-from .query_utils import get_primary_docid, get_docid_struct_for_search
+from .query_utils import build_bibitem, ref_to_bibitem
 
 
 __all__ = (
     'list_refs',
     'list_doctypes',
     'build_citation_for_docid',
+    'build_citations_for_docids',
     'build_search_results',
     'search_refs_docids',
+    'get_work_members',
+    'get_merged_work',
+    'search_refs_docid_fields',
+    'search_refs_docid_regex',
     'search_refs_relaton_struct',
     'search_refs_relaton_field',
     'search_refs_json_repr_match',
@@ -50,15 +59,39 @@ __all__ = (
 log = logging.getLogger(__name__)
 
 
+COMPOSITE_ITEM_CACHE_SECONDS: int = getattr(
+    settings,
+    'COMPOSITE_ITEM_CACHE_SECONDS',
+    604800)
+"""How long merged items are cached, see :func:`.get_merged_work()`."""
+
+
+FOUND_REF_FIELDS = (
+    'ref', 'dataset', 'body', 'is_valid', 'validation_errors', 'work',
+    'normalized_body',
+)
+"""Fields of :class:`~.models.RefData` loaded for found refs.
+Other fields are deferred.
+
+Index-time validation outcome is loaded so that items known to be invalid
+are not revalidated (see :func:`main.query_utils.build_bibitem()`),
+and normalized body so that valid items are not revalidated either
+(see :func:`main.query_utils.load_ref_body()`).
+Work is loaded so that found refs can be grouped
+(see :func:`.build_search_results()`).
+"""
+
+
 def list_refs(dataset_id: str) -> QuerySet[RefData]:
-    """Returns all indexed refs in a dataset.
+    """Returns all indexed refs in a dataset,
+    ordered as in :data:`main.pagination.CURSOR_ORDERING`.
 
     :param str dataset_id: given Relaton source ID
     :rtype: django.db.models.query.QuerySet[RefData]
     """
     return (
-        RefData.objects.filter(dataset__iexact=dataset_id).
-        order_by('-latest_date'))
+        RefData.objects.filter(dataset=dataset_id).
+        order_by('-latest_date', '-id'))
 
 
 def list_doctypes() -> List[Tuple[str, str]]:
@@ -88,6 +121,13 @@ def list_doctypes() -> List[Tuple[str, str]]:
                         )
                     ) as sample_id
                     from api_ref_data
+                    where not exists (
+                        select 1 from main_datasetgeneration
+                        where main_datasetgeneration.dataset
+                            = api_ref_data.dataset
+                        and main_datasetgeneration.generation
+                            <> api_ref_data.generation
+                    )
                 ) as item order by doctype, latest_date desc
                 ''')
         )
@@ -116,7 +156,7 @@ def search_refs_json_repr_match(text: str, limit=None) -> QuerySet[RefData]:
         RefData.objects.
         annotate(search=SearchVector(Cast('body', TextField()))).
         filter(search=SearchQuery(text, search_type='websearch')).
-        only('ref', 'dataset', 'body').
+        only(*FOUND_REF_FIELDS).
         order_by('-latest_date')[:limit])
 
 
@@ -153,14 +193,30 @@ def search_refs_relaton_struct(
 
     return (
         RefData.objects.filter(id__in=query).
-        only('ref', 'dataset', 'body').
+        only(*FOUND_REF_FIELDS).
         order_by('-latest_date')[:limit])
 
 
+SEARCH_VECTOR_FIELD_WEIGHTS: Dict[str, str] = {
+    'title': 'a',
+    'docid': 'a',
+    'docid.id': 'a',
+    'contributor': 'b',
+    'abstract': 'c',
+}
+"""Maps field specs to weights they are stored under
+in :attr:`.models.RefData.search_vector`
+(see :data:`.models.SEARCH_VECTOR_SQL`)."""
+
+websearch_negation_re = re.compile(r'(^|\s)-\S')
+"""Matches web search style queries with negated terms."""
+
+
 def search_refs_relaton_field(
         *field_queries: Dict[str, str],
         exact=False,
-        limit=None) -> QuerySet[RefData]:
+        limit=None,
+        rank=False) -> QuerySet[RefData]:
     """
     Each of ``field_queries`` should be a dictionary of the following shape::
 
@@ -178,6 +234,10 @@ def search_refs_relaton_field(
 
     :param int limit: Converts to SQL ``LIMIT``.
 
+    :param bool rank: If ``True``, web search style results are ordered
+        by ``ts_rank_cd`` against the stored search vector
+        (and then by date), and annotated with ``rank``.
+
     :param bool exact: The ``exact`` flag applies to all ``field_queries``
         and determines whether to treat them as JSON path style queries
         or as web search style queries.
@@ -185,9 +245,18 @@ def search_refs_relaton_field(
         - If ``exact`` is ``False`` (default),
           queries are treated web search style.
 
-          A tsvector from JSON data at each specified field is taken,
-          its corresponding query is converted
-          to a fuzzy web search tsquery, and `@@` operator is used.
+          Each query is converted
+          to a fuzzy web search tsquery, and `@@` operator is used
+          against a tsvector.
+
+          If field spec is empty or only contains fields
+          listed in :data:`.SEARCH_VECTOR_FIELD_WEIGHTS`,
+          stored :attr:`~.models.RefData.search_vector` is used
+          (restricted to weights of given fields).
+          Note that fields sharing a weight are not told apart,
+          e.g. a ``title`` query can match document identifiers.
+          Otherwise, a tsvector from JSON data at each specified field
+          is computed at query time, which is slow.
 
           Wildcards in field path specs are not allowed.
 
@@ -241,6 +310,7 @@ def search_refs_relaton_field(
     interpolated_params: List[str] = []
 
     annotate_headline: Union[None, str] = None
+    rank_query: Union[None, str] = None
 
     for idx, fields in enumerate(field_queries):
         anded_queries = []
@@ -261,17 +331,39 @@ def search_refs_relaton_field(
                     )
 
             else:
-                interpolated_params.append(query)
+                rank_query = query
+                fieldpaths = fieldspec.split(',')
                 if fieldspec == '':
                     annotate_headline = 'body'
+                    interpolated_params.append(query)
+                    anded_queries.append('''
+                        search_vector @@ websearch_to_tsquery('english', %s)
+                    ''')
+                elif all(
+                    path in SEARCH_VECTOR_FIELD_WEIGHTS
+                    for path in fieldpaths
+                ):
+                    weights = ','.join(sorted(set(
+                        SEARCH_VECTOR_FIELD_WEIGHTS[path]
+                        for path in fieldpaths)))
+                    interpolated_params.append(query)
                     tpl = '''
-                        to_tsvector(
-                            'english',
-                            body
-                        ) @@ websearch_to_tsquery('english', %s)
-                    '''
+                        ts_filter(search_vector, '{{{weights}}}')
+                        @@ websearch_to_tsquery('english', %s)
+                    '''.format(weights=weights)
+                    if not websearch_negation_re.search(query):
+                        # Without negated terms, a match within some weights
+                        # implies a match against the whole vector,
+                        # which can use the index
+                        interpolated_params.append(query)
+                        tpl = '''
+                            search_vector
+                            @@ websearch_to_tsquery('english', %s)
+                            AND {}
+                        '''.format(tpl)
                     anded_queries.append(tpl)
                 else:
+                    interpolated_params.append(query)
                     tpl = '''
                         to_tsvector(
                             'english',
@@ -300,9 +392,16 @@ def search_refs_relaton_field(
     #     annotate_headline or "no annotation",
     #     field_queries)
 
-    qs = (
-        RefData.objects.filter(id__in=final_query).
-        order_by('-latest_date'))
+    qs = RefData.objects.filter(id__in=final_query)
+
+    if rank and rank_query is not None:
+        qs = qs.annotate(rank=SearchRank(
+            F('search_vector'),
+            SearchQuery(rank_query, config='english', search_type='websearch'),
+            cover_density=True,
+        )).order_by('-rank', '-latest_date')
+    else:
+        qs = qs.order_by('-latest_date')
 
     if annotate_headline is not None:
         # This annotation does not seem to cause perceptible impact
@@ -319,70 +418,133 @@ def search_refs_relaton_field(
             config='english',
         ))
 
-    return qs.only('ref', 'dataset', 'body')[:limit]
+    return qs.only(*FOUND_REF_FIELDS)[:limit]
+
+
+def search_refs_docid_fields(
+    *conditions: Q,
+    limit=None,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> QuerySet[RefData]:
+    """Finds bibliographic items with at least one document identifier
+    (:class:`~.models.RefDocID`) matching any of given conditions.
+
+    Conditions can refer to :class:`~.models.RefDocID` fields,
+    as well as to ``lower_doctype`` and ``lower_docid``,
+    which use the index on lowercased type and ID::
+
+        search_refs_docid_fields(
+            Q(doctype='IETF', docid='RFC 1234'),
+            Q(lower_doctype='ietf', lower_docid='rfc 1234'),
+        )
+
+    :param int limit: how many results to return at the most
+                      (converts to SQL ``LIMIT``)
+    :param fields: :class:`~.models.RefData` fields to load,
+                   by default :data:`.FOUND_REF_FIELDS`
+                   and representations
+    :rtype: django.db.models.query.QuerySet[RefData]
+    """
+    if len(conditions) < 1:
+        return RefData.objects.none()
+
+    limit = limit or getattr(settings, 'DEFAULT_SEARCH_RESULT_LIMIT', 100)
+
+    matching_docids = (
+        RefDocID.objects.
+        alias(
+            lower_doctype=Lower('doctype'),
+            lower_docid=Lower('docid'),
+        ).
+        filter(functools.reduce(operator.or_, conditions)).
+        values('ref_data_id'))
+
+    return (
+        RefData.objects.filter(id__in=matching_docids).
+        only(*(fields or (*FOUND_REF_FIELDS, 'representations'))).
+        order_by('-latest_date')[:limit])
 
 
-def search_refs_docids(*ids: Union[DocID, str]) -> QuerySet[RefData]:
+def search_refs_docid_regex(
+    regex: str,
+    doctype: Optional[str] = None,
+    case_insensitive: bool = False,
+    limit=None,
+) -> QuerySet[RefData]:
+    """Finds bibliographic items with a document identifier
+    (optionally of given type) matching given POSIX regular expression.
+
+    Matches the same items as a JSON path query like
+    ``{'docid[*]': '@.type == "<doctype>" && @.id like_regex "<regex>"'}``
+    passed to :func:`.search_refs_relaton_field()` would,
+    but uses trigram index on extracted document identifiers
+    (see :class:`~.models.RefDocID`) rather than scanning item data.
+
+    :param bool case_insensitive: whether to ignore case,
+                                  like ``(?i)`` flag would
+    :param int limit: how many results to return at the most
+    :rtype: django.db.models.query.QuerySet[RefData]
+    :raises django.db.utils.DataError: given expression is invalid
+        (see :func:`main.query_utils.is_benign_user_input_error()`)
+    """
+    condition = Q(docid__iregex=regex) if case_insensitive \
+        else Q(docid__regex=regex)
+    if doctype:
+        condition &= Q(doctype=doctype)
+
+    return search_refs_docid_fields(condition, limit=limit)
+
+
+def search_refs_docids(
+    *ids: Union[DocID, str],
+    fields: Optional[Tuple[str, ...]] = None,
+) -> QuerySet[RefData]:
     """Given a list of document identifiers
     (``DocID`` instances, or just strings
     which would be treated as ``docid.id``),
     queries and retrieves matching :class:`.models.RefData` objects.
 
+    Tries exact match first,
+    falls back to case-insensitive match if nothing was found.
+
+    :param fields: fields to load, see :func:`.search_refs_docid_fields()`
     :rtype: django.db.models.query.QuerySet[RefData]
     """
 
-    # Exact & fast
-    struct_queries: List[Any] = [
-        struct
-        for id in ids
-        for struct in (
-            {'docid': [get_docid_struct_for_search(id)]}
-            if isinstance(id, DocID) else {'docid': [{'id': id}]},
-            # Support cases where docid is not a list:
-            {'docid': get_docid_struct_for_search(id)}
-            if isinstance(id, DocID) else {'docid': {'id': id}},
-        )
-    ]
-    refs = search_refs_relaton_struct(
-        *struct_queries,
+    # Exact
+    exact_conditions: List[Q] = []
+    for id in ids:
+        if isinstance(id, DocID):
+            condition = Q(docid=id.id, doctype=id.type)
+            if id.primary:
+                condition &= Q(primary=True)
+        else:
+            condition = Q(docid=id)
+        exact_conditions.append(condition)
+
+    refs = search_refs_docid_fields(
+        *exact_conditions,
         limit=15,
-    )
+        fields=fields)
 
     if len(refs) < 1:
-        # Less exact, case-insensitive, slower
-        jsonpath_queries = [
-            {
-                'docid[*]':
-                '@.id like_regex {id}{type_query}{primary_query}'.format(
-                    id=id,
-                    type_query=
-                        ' && @.type like_regex {id_type}' if id_type else '',
-                    primary_query=
-                        ' && @.primary == true' if id_primary else '',
-                ),
-                # To exclude untyped add ' && exists (@.type)'
-            }
-            for (id, id_type, id_primary) in ((
-                '"(?i)^%s$"' % re.escape(
-                    id.id
-                    if isinstance(id, DocID) else id
-                ),
-                '"(?i)^%s$"' % re.escape(typeCast(DocID, id).type)
-                if getattr(id, 'type', None) else None,
-                getattr(id, 'primary', False),
-            ) for id in ids)
-        ]
-        refs = search_refs_relaton_field(
-            *jsonpath_queries,
-            exact=True,
+        # Case-insensitive
+        ci_conditions: List[Q] = []
+        for id in ids:
+            if isinstance(id, DocID):
+                condition = Q(
+                    lower_doctype=id.type.lower(),
+                    lower_docid=id.id.lower())
+                if id.primary:
+                    condition &= Q(primary=True)
+            else:
+                condition = Q(docid_lower=id.lower())
+            ci_conditions.append(condition)
+
+        refs = search_refs_docid_fields(
+            *ci_conditions,
             limit=15,
-        )
-        # try:
-        #     # Force evaluation
-        #     refs[0]
-        # except (IndexError, DataError):
-        #     # No results or malformed JSON path query
-        #     pass
+            fields=fields)
 
     return refs
 
@@ -399,6 +561,9 @@ def build_citation_for_docid(
     Found bibliographic items (there can be more than one matching given ID)
     are merged into a single composite item
     under a primary document identifier (if any).
+    Items are found via the :class:`~.models.Work`
+    of the latest matching item, which takes one query to find
+    and another to retrieve its members (see :func:`.get_work_members()`).
 
     It is different from :func:`~.get_indexed_item` in that *this* function
     uses ``docid.id``, instead of dataset-specific reference (such as filename).
@@ -414,34 +579,310 @@ def build_citation_for_docid(
     :raises main.exceptions.RefNotFoundError: if no matching refs were found.
     """
 
-    # Retrieve pre-indexed refs
-    refs = query_suppressing_user_input_error(
+    # Find matching refs, only loading which works they belong to
+    matches = query_suppressing_user_input_error(
         lambda: search_refs_docids(
-            DocID(id, id_type) if id_type else id)
+            DocID(id, id_type) if id_type else id,
+            fields=('work',))
     ) or []
 
-    if len(refs) < 1:
+    if len(matches) < 1:
         raise RefNotFoundError("Not found in indexed sources by docid", id)
 
-    # Retrieve bibliographic items with the same primary identifier.
-    # This is the preferred scenario.
-    primary_docid = get_primary_docid([
-        id
-        for ref in refs
-        for id in as_list(ref.body.get('docid', []))
-    ])
-    if primary_docid:
-        refs = query_suppressing_user_input_error(
-            lambda: search_refs_docids(typeCast(DocID, primary_docid))
-        ) or []
+    # Retrieve all bibliographic items with the same primary identifier
+    # (members of the same work). This is the preferred scenario.
+    work_id = next((ref.work_id for ref in matches if ref.work_id), None)
+    if work_id:
+        members = list(get_work_members(work_id, fields=('content_hash',)))
+        if members:
+            return get_merged_work(members, strict)
 
     return merge_refs(
-        refs,
-        primary_docid.id if primary_docid else None,
+        get_found_refs([ref.pk for ref in matches]),
+        None,
         strict)
 
 
-DocIDTuple = Tuple[Tuple[str, str], Tuple[str, str]]
+def build_citations_for_docids(
+    ids: List[Tuple[str, Optional[str]]],
+    strict: bool = True,
+) -> List[Union[CompositeSourcedBibliographicItem, Exception]]:
+    """Does what :func:`.build_citation_for_docid()` does
+    for many document identifiers at once,
+    with a number of queries that doesn’t depend on how many are given:
+
+    - one to find refs matching identifiers exactly,
+      and one more to match case-insensitively
+      identifiers that had no exact matches, if any,
+    - one to retrieve members of found works,
+    - one to retrieve data of refs whose merged items are not cached
+      (see :func:`.get_merged_items()`).
+
+    :param ids: a list of 2-tuples of :term:`docid.id`
+                and optional :term:`document identifier type`
+    :returns: a list with a composite item for each of given identifiers,
+              or an exception (:class:`~.exceptions.RefNotFoundError`,
+              or :class:`pydantic.ValidationError` if ``strict`` is set)
+              if an item could not be built
+    """
+    matches = match_docids(dict(enumerate(ids)), case_insensitive=False)
+    unmatched = {
+        idx: id
+        for idx, id in enumerate(ids)
+        if idx not in matches
+    }
+    if unmatched:
+        matches.update(match_docids(unmatched, case_insensitive=True))
+
+    work_ids: Dict[int, int] = {
+        idx: work_id
+        for idx, refs in matches.items()
+        for work_id in [next((r.work_id for r in refs if r.work_id), None)]
+        if work_id
+    }
+    members_by_work: Dict[int, List[RefData]] = {}
+    if work_ids:
+        for member in (
+            RefData.objects.
+            filter(work_id__in=set(work_ids.values())).
+            select_related('work').
+            only('content_hash', 'work__docid').
+            order_by('-latest_date', 'pk')
+        ):
+            members_by_work.setdefault(member.work_id, []).append(member)
+
+    groups: List[Tuple[List[RefData], Optional[str]]] = []
+    group_indexes: Dict[int, int] = {}
+    for idx, refs in matches.items():
+        members = members_by_work.get(work_ids.get(idx, 0), None)
+        group_indexes[idx] = len(groups)
+        if members:
+            groups.append((members, members[0].work.docid))
+        else:
+            groups.append((refs, None))
+
+    merged = get_merged_items(groups, strict)
+
+    return [
+        merged[group_indexes[idx]]
+        if idx in group_indexes
+        else RefNotFoundError("Not found in indexed sources by docid", id)
+        for idx, (id, _) in enumerate(ids)
+    ]
+
+
+def match_docids(
+    ids: Dict[int, Tuple[str, Optional[str]]],
+    case_insensitive: bool,
+) -> Dict[int, List[RefData]]:
+    """Finds refs matching each of given document identifiers
+    in a single query, the same way :func:`.search_refs_docids()` does.
+
+    :param ids: 2-tuples of :term:`docid.id`
+                and optional :term:`document identifier type`, by key
+    :returns: matching refs (at most 15, latest first,
+              with only work loaded) by key of identifiers
+              that had any matches
+    """
+    def normalize(value: str) -> str:
+        return value.lower() if case_insensitive else value
+
+    conditions: List[Q] = []
+    keys: Dict[Tuple[str, Optional[str]], List[int]] = {}
+    for key, (id, id_type) in ids.items():
+        if case_insensitive:
+            if id_type:
+                condition = Q(
+                    lower_doctype=id_type.lower(),
+                    lower_docid=id.lower())
+            else:
+                condition = Q(docid_lower=id.lower())
+        else:
+            condition = Q(docid=id)
+            if id_type:
+                condition &= Q(doctype=id_type)
+        conditions.append(condition)
+        keys.setdefault(
+            (normalize(id), normalize(id_type) if id_type else None),
+            []).append(key)
+
+    if not conditions:
+        return {}
+
+    rows = (
+        RefDocID.objects.
+        alias(
+            lower_doctype=Lower('doctype'),
+            lower_docid=Lower('docid'),
+        ).
+        filter(functools.reduce(operator.or_, conditions)).
+        # Same as what default RefData manager does
+        filter(~Exists(
+            DatasetGeneration.objects.
+            filter(dataset=OuterRef('ref_data__dataset')).
+            exclude(generation=OuterRef('ref_data__generation'))
+        )).
+        order_by('-ref_data__latest_date', 'ref_data_id').
+        values_list('ref_data_id', 'ref_data__work_id', 'docid', 'doctype'))
+
+    matches: Dict[int, List[RefData]] = {}
+    for pk, work_id, docid, doctype in rows:
+        for id_key in (
+            (normalize(docid), normalize(doctype)),
+            (normalize(docid), None),
+        ):
+            for key in keys.get(id_key, []):
+                refs = matches.setdefault(key, [])
+                if len(refs) < 15 and pk not in (r.pk for r in refs):
+                    refs.append(RefData(pk=pk, work_id=work_id))
+    return matches
+
+
+def get_work_members(
+    work_id: int,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> QuerySet[RefData]:
+    """Returns indexed refs that are members
+    of given :class:`~.models.Work`, latest first,
+    with their work’s primary document identifier loaded.
+
+    :param fields: :class:`~.models.RefData` fields to load,
+                   by default :data:`.FOUND_REF_FIELDS`
+                   and representations
+    :rtype: django.db.models.query.QuerySet[RefData]
+    """
+    return (
+        RefData.objects.
+        filter(work_id=work_id).
+        select_related('work').
+        only(
+            *(fields or (*FOUND_REF_FIELDS, 'representations')),
+            'work__docid').
+        order_by('-latest_date', 'pk'))
+
+
+def get_found_refs(pks: List[int]) -> List[RefData]:
+    """Retrieves refs with given primary keys, latest first,
+    loading fields needed to merge them (see :func:`.merge_refs()`)."""
+
+    return list(
+        RefData.objects.
+        filter(pk__in=pks).
+        only(*FOUND_REF_FIELDS, 'representations').
+        order_by('-latest_date', 'pk'))
+
+
+def get_merged_work(
+    members: List[RefData],
+    strict: bool = True,
+) -> CompositeSourcedBibliographicItem:
+    """Returns a composite item merged from given members of a work
+    (as returned by :func:`.get_work_members()`),
+    taking it from cache if it was merged before.
+
+    Merged items are cached
+    for :data:`bibxml.settings.COMPOSITE_ITEM_CACHE_SECONDS`
+    under a key derived from members’ content hashes
+    (see :func:`.get_merged_work_cache_key()`),
+    so that an entry stops being used as soon as any member is reindexed
+    with changed contents, added, or removed.
+    Only content hashes need to be loaded on members;
+    their data is retrieved if the item is not cached.
+
+    :raises pydantic.ValidationError: if ``strict`` is set
+                                      and merged item didn’t validate
+    """
+    composite = get_merged_items(
+        [(members, members[0].work.docid)],
+        strict)[0]
+    if isinstance(composite, ValidationError):
+        raise composite
+    return composite
+
+
+def get_merged_items(
+    groups: List[Tuple[List[RefData], Optional[str]]],
+    strict: bool = True,
+) -> List[Union[CompositeSourcedBibliographicItem, ValidationError]]:
+    """Merges each of given groups of refs into a composite item
+    (see :func:`.merge_refs()`), with one cache lookup
+    and at most one query for data of all refs whose items
+    were not cached.
+
+    :param groups: a list of 2-tuples of refs, latest first,
+                   and primary document identifier.
+                   Groups with primary identifier are members of a work
+                   and are cached (see :func:`.get_merged_work()`);
+                   their refs must have content hash and work loaded.
+                   For other groups, only primary keys are needed.
+    :returns: merged items in the same order as groups;
+              if ``strict`` is set, validation errors are returned
+              in place of items that didn’t validate
+    """
+    cache_keys: List[Optional[str]] = [
+        get_merged_work_cache_key(refs, strict) if primary_docid else None
+        for refs, primary_docid in groups
+    ]
+    cached: Dict[str, CompositeSourcedBibliographicItem] = cache.get_many([
+        key for key in cache_keys if key
+    ])
+
+    refs_by_pk: Dict[int, RefData] = {
+        ref.pk: ref
+        for ref in get_found_refs([
+            ref.pk
+            for (refs, _), key in zip(groups, cache_keys)
+            if key not in cached
+            for ref in refs
+        ])
+    } if len(cached) < len(groups) else {}
+
+    results: List[Union[CompositeSourcedBibliographicItem, ValidationError]]
+    results = []
+    to_cache: Dict[str, CompositeSourcedBibliographicItem] = {}
+
+    for (refs, primary_docid), key in zip(groups, cache_keys):
+        if key in cached:
+            results.append(cached[key])
+            continue
+        try:
+            composite = merge_refs(
+                [refs_by_pk[ref.pk] for ref in refs if ref.pk in refs_by_pk],
+                primary_docid,
+                strict)
+        except ValidationError as err:
+            results.append(err)
+        else:
+            results.append(composite)
+            if key:
+                to_cache[key] = composite
+
+    if to_cache:
+        cache.set_many(to_cache, COMPOSITE_ITEM_CACHE_SECONDS)
+
+    return results
+
+
+def get_merged_work_cache_key(
+    members: List[RefData],
+    strict: bool,
+) -> Optional[str]:
+    """Returns cache key for a composite item merged from given refs,
+    or ``None`` if it should not be cached
+    because content hash of some of them is not known."""
+
+    if not all(member.content_hash for member in members):
+        return None
+
+    fingerprint = hashlib.sha256(' '.join(
+        f'{member.pk}:{member.content_hash}'
+        for member in members
+    ).encode()).hexdigest()
+
+    return 'merged_work_{}_{}_{}'.format(
+        members[0].work_id,
+        'strict' if strict is not False else 'lax',
+        fingerprint)
 
 
 def build_search_results(
@@ -450,8 +891,9 @@ def build_search_results(
     """Given a :class:`django.db.models.query.QuerySet`
     of :class:`~.models.RefData` entries, builds a list
     of :class:`~.types.FoundItem` objects
-    by merging ``RefData`` instances that share
-    their primary document identifier.
+    by merging ``RefData`` instances that are members
+    of the same :class:`~.models.Work`
+    (i.e., share their primary document identifier).
 
     Takes care of merging search headlines, if any.
 
@@ -459,28 +901,31 @@ def build_search_results(
     :rtype: List[FoundItem]
     """
 
-    # Groups refs by primary ID
+    # Primary IDs of found works, in one query
+    work_docids: Dict[int, str] = dict(
+        Work.objects.
+        filter(pk__in=set(ref.work_id for ref in refs if ref.work_id)).
+        values_list('pk', 'docid'))
+
+    # Groups refs by work
     # (in absence of such, a ref will go alone under its first ID)
     refs_by_primary_id: Dict[str, List[int]] = {}
 
     results: List[FoundItem] = []
 
     for idx, ref in enumerate(refs):
-        suitable_ids: List[Dict[str, Any]] = as_list([
-            id
-            for id in ref.body.get('docid', [])
-            if 'id' in id and 'scope' not in id and 'type' in id
-        ])
-        if suitable_ids:
-            primary_id = get_primary_docid(suitable_ids)
-            if primary_id:
-                refs_by_primary_id.setdefault(primary_id.id, [])
-                refs_by_primary_id[primary_id.id].append(idx)
-            else:
+        if ref.work_id in work_docids:
+            refs_by_primary_id.setdefault(work_docids[ref.work_id], [])
+            refs_by_primary_id[work_docids[ref.work_id]].append(idx)
+        else:
+            suitable_ids: List[Dict[str, Any]] = as_list([
+                id
+                for id in ref.body.get('docid', [])
+                if 'id' in id and 'scope' not in id and 'type' in id
+            ])
+            if suitable_ids:
                 refs_by_primary_id[suitable_ids[0]['id']] = [idx]
 
-    processed_docids = set[DocIDTuple]()
-
     for _docid, ref_indexes in refs_by_primary_id.items():
         refs_to_merge: List[RefData] = [refs[idx] for idx in ref_indexes]
 
@@ -519,19 +964,20 @@ def get_indexed_item(
     ref = get_indexed_ref_by_query(dataset_id, Q(ref__iexact=ref))
 
     params = {
-        'bibitem': ref.body,
         'source': get_source_meta(dataset_id),
         'indexed_object': get_indexed_object_meta(dataset_id, ref.ref),
     }
 
     if strict:
-        return IndexedBibliographicItem(**params)
+        return IndexedBibliographicItem(
+            bibitem=ref_to_bibitem(ref),
+            **params)
     else:
-        try:
-            return IndexedBibliographicItem(**params)
-        except ValidationError as e:
-            params['validation_errors'] = [str(e)]
-            return IndexedBibliographicItem.construct(**params)
+        bibitem, validation_errors = build_bibitem(ref)
+        return IndexedBibliographicItem(
+            bibitem=bibitem,
+            validation_errors=validation_errors,
+            **params)
 
 
 def get_indexed_ref_by_query(
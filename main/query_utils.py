@@ -1,6 +1,6 @@
 """Query-related utilities."""
 
-from typing import Callable, Union, List, Dict, Any, Optional
+from typing import Callable, Union, List, Dict, Any, Optional, Tuple
 import logging
 
 from django.db.models.query import QuerySet
@@ -10,6 +10,7 @@ from pydantic import ValidationError
 
 from bib_models.models.bibdata import BibliographicItem, DocID
 from bib_models.merger import bibitem_merger
+from common.pydantic import construct_validated
 
 from .models import RefData
 from .sources import get_source_meta, get_indexed_object_meta
@@ -20,6 +21,8 @@ from .types import IndexedBibliographicItem
 
 __all__ = (
     'merge_refs',
+    'build_bibitem',
+    'ref_to_bibitem',
     'get_primary_docid',
     'get_docid_struct_for_search',
     'query_suppressing_user_input_error',
@@ -70,15 +73,7 @@ def merge_refs(
         sourced_id = f'{ref.ref}@{source.id}'
 
         bibitem_merger.merge(base, ref.body)
-        try:
-            bibitem = BibliographicItem(**ref.body)
-            validation_errors = []
-        except ValidationError as e:
-            log.warn(
-                "Incorrect bibliographic item format: %s, %s",
-                ref.ref, e)
-            bibitem = BibliographicItem.construct(**ref.body)
-            validation_errors = [str(e)]
+        bibitem, validation_errors = build_bibitem(ref)
 
         sources[sourced_id] = IndexedBibliographicItem(
             indexed_object=obj,
@@ -106,6 +101,83 @@ def merge_refs(
             return CompositeSourcedBibliographicItem.construct(**composite)
 
 
+def build_bibitem(ref: RefData) -> Tuple[BibliographicItem, List[str]]:
+    """Constructs a ``BibliographicItem`` from given ref’s Relaton data
+    without raising if it’s invalid.
+
+    Items known to be invalid from indexing time
+    (see :attr:`main.models.RefData.is_valid`)
+    are constructed without validation, and stored errors are returned.
+    Other items are loaded with :func:`.load_ref_body()`.
+
+    Ref’s :attr:`~main.models.RefData.representations` are carried over
+    to the item (see :func:`.ref_to_bibitem()`).
+
+    Fields deferred on given ref are not accessed,
+    so as not to incur an extra query per ref.
+
+    :returns: a 2-tuple of bibliographic item and a list of validation errors
+    """
+    deferred = ref.get_deferred_fields()
+
+    bibitem: BibliographicItem
+    validation_errors: List[str]
+
+    if 'is_valid' not in deferred and ref.is_valid is False:
+        bibitem = BibliographicItem.construct(**ref.body)
+        validation_errors = (
+            ref.validation_errors
+            if 'validation_errors' not in deferred
+            else [])
+    else:
+        try:
+            bibitem = load_ref_body(ref)
+            validation_errors = []
+        except ValidationError as e:
+            log.warn(
+                "Incorrect bibliographic item format: %s, %s",
+                ref.ref, e)
+            bibitem = BibliographicItem.construct(**ref.body)
+            validation_errors = [str(e)]
+
+    if 'representations' not in deferred:
+        bibitem._representations = ref.representations
+
+    return bibitem, validation_errors
+
+
+def ref_to_bibitem(ref: RefData) -> BibliographicItem:
+    """Constructs a ``BibliographicItem`` from given ref’s Relaton data,
+    carrying its :attr:`~main.models.RefData.representations`
+    so that they can be served by
+    :func:`bib_models.serializers.serialize()`.
+
+    :raises pydantic.ValidationError: ref’s data didn’t validate
+    """
+    bibitem = load_ref_body(ref)
+    bibitem._representations = ref.representations
+    return bibitem
+
+
+def load_ref_body(ref: RefData) -> BibliographicItem:
+    """Obtains a ``BibliographicItem`` from given ref’s Relaton data.
+
+    Validation is the bulk of the cost of serving an item,
+    so items that validated at indexing time are constructed
+    without validation from their
+    :attr:`~main.models.RefData.normalized_body`
+    (see :func:`common.pydantic.construct_validated()`).
+    Other refs, including ones with normalized body not loaded,
+    are validated.
+
+    :raises pydantic.ValidationError: ref’s data didn’t validate
+    """
+    if ('normalized_body' not in ref.get_deferred_fields()
+            and ref.normalized_body is not None):
+        return construct_validated(BibliographicItem, ref.normalized_body)
+    return BibliographicItem(**ref.body)
+
+
 def get_docid_struct_for_search(id: DocID) -> Dict[str, Any]:
     """Converts a given ``DocID`` instance into a structure
     suitable for being passed
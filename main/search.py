@@ -1,6 +1,6 @@
 import re
 import json
-from typing import Any, List, Callable, Union, cast
+from typing import Any, List, Callable, Optional, Union, cast
 from urllib.parse import unquote_plus
 
 from django.http import HttpResponseBadRequest, HttpResponseRedirect
@@ -17,7 +17,10 @@ from .models import RefData
 from .query import build_search_results
 from .query import search_refs_relaton_struct
 from .query import search_refs_relaton_field
+from .query import search_refs_docid_regex
 from .query_utils import query_suppressing_user_input_error
+from .pagination import CursorPosition, InvalidCursor
+from .pagination import decode_cursor, paginate_refs_by_cursor
 
 
 QUERY_FORMAT_LABELS = {
@@ -79,7 +82,10 @@ class BaseCitationSearchView(BaseListView):
     """Hard limit for found item count.
 
     If the user hits this limit, they are expected to provide
-    a more precise query."""
+    a more precise query.
+
+    In cursor mode, it is a page size instead
+    (see :attr:`cursor_page_size`)."""
 
     query_in_path = False
     """Whether query will appear as path component named ``query``
@@ -128,6 +134,32 @@ class BaseCitationSearchView(BaseListView):
     ``query_format`` and ``got_results``.
     """
 
+    cursor: Optional[str] = None
+    """Cursor obtained from ``cursor`` GET parameter, if given.
+
+    If not ``None``, the view works in cursor mode:
+    instead of capping results at :attr:`limit_to` and paginating
+    them by page number, found refs are fetched
+    :attr:`cursor_page_size` at a time using keyset pagination
+    (see :mod:`main.pagination`), so that any page costs the same
+    to obtain. Results are ordered by date even if query format
+    would otherwise rank them.
+
+    Refs are merged into found items within a page, so an item
+    whose refs fall on different pages can appear on each of them.
+
+    An empty string stands for the first page."""
+
+    cursor_page_size: Optional[int] = None
+    """Number of refs fetched per page in cursor mode.
+    Defaults to :attr:`limit_to`, so that the cap becomes a page size."""
+
+    cursor_after: Optional[CursorPosition] = None
+    """Position decoded from :attr:`cursor`."""
+
+    next_cursor: Optional[str] = None
+    """In cursor mode, cursor pointing at the next page, if any."""
+
     def get(self, request, *args, **kwargs):
         self.is_gui = hasattr(self, 'template_name')
 
@@ -150,6 +182,20 @@ class BaseCitationSearchView(BaseListView):
             'query_format',
             self.supported_query_formats[0])
 
+        self.cursor = request.GET.get('cursor', None)
+        if self.cursor:
+            try:
+                self.cursor_after = decode_cursor(self.cursor)
+            except InvalidCursor:
+                if self.is_gui:
+                    messages.warning(
+                        request,
+                        "Requested page doesn’t exist in this search. "
+                        "Showing first page instead.")
+                    self.cursor = ''
+                else:
+                    return HttpResponseBadRequest("Invalid cursor")
+
         try:
             self.dispatch_parse_query(
                 request,
@@ -176,6 +222,13 @@ class BaseCitationSearchView(BaseListView):
 
         return super().get(request, *args, **kwargs)
 
+    def get_paginate_by(self, queryset):
+        """Disables page number pagination in cursor mode."""
+
+        if self.cursor is not None:
+            return None
+        return super().get_paginate_by(queryset)
+
     def paginate_queryset(self, queryset, page_size):
         try:
             return super().paginate_queryset(queryset, page_size)
@@ -205,21 +258,26 @@ class BaseCitationSearchView(BaseListView):
         otherwise behavior depends on :attr:`show_all_by_default`."""
 
         if self.query is not None and self.query_format is not None:
-            result_getter = (lambda: build_search_results(
-                self.dispatch_handle_query(self.query)))
+            result_getter = (lambda: (
+                build_search_results(self.dispatch_handle_query(self.query)),
+                self.next_cursor,
+            ))
 
             if self.request.GET.get('bypass_cache'):
-                return result_getter()
+                results, self.next_cursor = result_getter()
             else:
-                return cache.get_or_set(
+                results, self.next_cursor = cache.get_or_set(
                     json.dumps({
                         'query': self.query,
                         'query_format': self.query_format,
                         'limit': self.limit_to,
                         'show_all': self.show_all_by_default,
+                        'cursor': self.cursor,
+                        'cursor_page_size': self.cursor_page_size,
                     }),
                     result_getter,
                     self.result_cache_seconds)
+            return results
         else:
             return []
 
@@ -235,6 +293,8 @@ class BaseCitationSearchView(BaseListView):
             query=self.query,
             query_format=self.query_format,
             query_format_label=query_format_label,
+            cursor=self.cursor,
+            next_cursor=self.next_cursor,
         )
 
     def get_context_data(self, **kwargs):
@@ -356,15 +416,20 @@ class BaseCitationSearchView(BaseListView):
 
         handler = getattr(self, 'handle_%s_query' % self.query_format)
 
-        qs = query_suppressing_user_input_error(lambda: handler(query))
+        qs = query_suppressing_user_input_error(
+            lambda: self.paginate_found_refs(handler(query)))
 
         input_error = qs is None
         found_something = qs is not None and len(qs) > 0
-        found_too_many = qs is not None and len(qs) >= self.limit_to
+        found_too_many = (
+            qs is not None
+            and self.cursor is None
+            and len(qs) >= self.limit_to)
 
         if input_error:
             if self.show_all_by_default:
-                qs = RefData.objects.all()[:self.limit_to]
+                qs = self.paginate_found_refs(
+                    RefData.objects.all()[:self.limit_to])
             else:
                 qs = RefData.objects.none()
 
@@ -422,6 +487,22 @@ class BaseCitationSearchView(BaseListView):
 
         return qs
 
+    def paginate_found_refs(self, refs: QuerySet[RefData]) \
+            -> Union[QuerySet[RefData], List[RefData]]:
+        """In cursor mode, returns requested page of given refs
+        and stores :attr:`next_cursor`.
+        Otherwise, returns refs as is."""
+
+        if self.cursor is None:
+            return refs
+
+        page = paginate_refs_by_cursor(
+            refs,
+            self.cursor_after,
+            self.cursor_page_size or self.limit_to)
+        self.next_cursor = page.next_cursor
+        return page.object_list
+
     def parse_unsupported_query(self, query: str):
         raise UnsupportedQueryFormat()
 
@@ -453,12 +534,13 @@ class BaseCitationSearchView(BaseListView):
     # Handlers
 
     def handle_docid_regex_query(self, query: str) -> QuerySet[RefData]:
-        return search_refs_relaton_field(
-            {
-                'docid[*]': '@.id like_regex "(?i)%s"' % re.escape(query),
-            },
+        # Query used to be escaped for use in a JSON path
+        # ``like_regex`` string, where escapes are undone,
+        # so it is used as a regular expression as is
+        return search_refs_docid_regex(
+            query,
+            case_insensitive=True,
             limit=self.limit_to,
-            exact=True,
         )
 
     def handle_json_struct_query(
@@ -481,6 +563,7 @@ class BaseCitationSearchView(BaseListView):
         return search_refs_relaton_field(
             {'': query},
             limit=self.limit_to,
+            rank=True,
         )
 
 
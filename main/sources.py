@@ -12,23 +12,41 @@ under ``/data/`` directory under repository root
 
 .. seealso:: :rfp:req:`3`
 """
-from typing import Tuple, List, Dict, Any
-import glob
+from typing import Tuple, List, Dict, Any, Iterator, Iterable
+from typing import Optional, Set, Deque
+from collections import deque
+from dataclasses import dataclass
+import hashlib
+import os
 from os import path
 import datetime
+import time
 
 import yaml
+try:
+    from yaml import CSafeLoader as _BaseYAMLLoader
+except ImportError:
+    from yaml import SafeLoader as _BaseYAMLLoader  # type: ignore
+from billiard.pool import ApplyResult, Pool
 from celery.utils.log import get_task_logger
 from django.core.exceptions import ImproperlyConfigured
 from django.conf import settings
-from django.db import transaction
+from django.db import transaction, DatabaseError
+from django.db.models.expressions import RawSQL
+from pydantic import ValidationError
 
+from bib_models import serializers
 from bib_models.models import dates
+from bib_models.models.bibdata import BibliographicItem
+from common.pydantic import unpack_dataclasses
 from common.util import as_list
 from sources import indexable
+from sources.indexable import IndexingStats, IndexingCheckpoint
 
 from .types import IndexedSourceMeta, IndexedObject
-from .models import RefData
+from .models import RefData, RefDocID, DatasetGeneration, Work
+from .models import extract_docids, get_work_key
+from .models import SEARCH_VECTOR_SQL
 
 
 logger = get_task_logger(__name__)
@@ -150,18 +168,42 @@ def register_relaton_source(source_id: str):
         [
             locate_relaton_source_repo(source_id),
         ],
+        sparse_paths=['data'],
     )({
-        'indexer': (lambda dirs, refs, on_progress, on_error: index_dataset(
-            source_id,
-            path.join(dirs[0], 'data'),
-            refs,
-            on_progress,
-            on_error,
-        )),
+        'indexer': (
+            lambda dirs, refs, on_progress, on_error, checkpoint:
+            index_dataset(
+                source_id,
+                path.join(dirs[0], 'data'),
+                refs,
+                on_progress,
+                on_error,
+                checkpoint,
+            )
+        ),
         'reset_index': (lambda: reset_index_for_dataset(source_id)),
         'count_indexed': (
             lambda: RefData.objects.filter(dataset=source_id).count()
         ),
+        'get_refs_for_paths': (lambda paths: get_refs_for_changed_paths(
+            paths[0],
+        )),
+        'list_refs': (lambda dirs: list_refs_in_source(
+            path.join(dirs[0], 'data'),
+        )),
+        'delete_stale': (lambda dirs: delete_stale_refs(
+            source_id,
+            set(list_refs_in_source(path.join(dirs[0], 'data'))),
+        )),
+        'rebuild_indexer': (
+            lambda dirs, on_progress, on_error:
+            rebuild_dataset(
+                source_id,
+                path.join(dirs[0], 'data'),
+                on_progress,
+                on_error,
+            )
+        ),
     })
 
 
@@ -172,90 +214,749 @@ for source_id in settings.RELATON_DATASETS:
 # Indexing implementation
 # =======================
 
+BATCH_SIZE: int = getattr(settings, 'INDEXING_BATCH_SIZE', 1000)
+"""How many parsed items to buffer before writing them to the database
+in a single statement. See :data:`bibxml.settings.INDEXING_BATCH_SIZE`."""
+
+PARSER_WORKERS: int = getattr(settings, 'INDEXING_PARSER_WORKERS', 1)
+"""How many processes to parse Relaton source files with.
+See :data:`bibxml.settings.INDEXING_PARSER_WORKERS`."""
+
+NORMALIZED_BODY_VERSION = '1'
+"""Version of :attr:`~.models.RefData.normalized_body` contents.
+Must be changed along with
+:class:`~bib_models.models.bibdata.BibliographicItem`
+and models it is made of, so that stored normalized bodies
+are refreshed the next time sources are indexed."""
+
+
+class RelatonLoader(_BaseYAMLLoader):
+    """YAML loader for Relaton source files.
+
+    Uses libyaml bindings if PyYAML was built with them,
+    and doesn’t resolve implicit timestamps
+    (dates are kept as strings, as in Relaton JSON).
+    """
+
+
+RelatonLoader.yaml_implicit_resolvers = {
+    k: [r for r in v if r[0] != "tag:yaml.org,2002:timestamp"]
+    for k, v in _BaseYAMLLoader.yaml_implicit_resolvers.items()
+}
+
+
 def index_dataset(ds_id, relaton_path, refs=None,
-                  on_progress=None, on_error=None) -> Tuple[int, int]:
+                  on_progress=None, on_error=None,
+                  checkpoint: Optional[IndexingCheckpoint] = None,
+                  generation: Optional[int] = None) \
+        -> Tuple[int, int, IndexingStats]:
     """Indexes Relaton data into :class:`~.models.RefData` instances.
 
+    Source files are parsed by :func:`.parse_relaton_files()`,
+    and parsed items are written in batches
+    of :data:`.BATCH_SIZE` (see :func:`.upsert_refs()`).
+    Each batch is committed in its own transaction,
+    so a failure doesn’t roll back work done so far.
+
+    Source files whose contents hash matches
+    :attr:`~.models.RefData.content_hash` of already indexed item
+    are neither parsed nor written.
+
+    Items that don’t validate are indexed as well,
+    with validation outcome stored
+    (see :attr:`~.models.RefData.is_valid`).
+
+    Refs that are gone from source are deleted at the end,
+    in a single transaction.
+
     :param ds_id: dataset ID as a string
     :param relaton_path: path to Relaton source files
 
-    :param refs: a list of string refs to index, or nothing to index everything
+    :param refs: a list of string refs to index, or nothing to index everything;
+                 if given, only files for these refs are looked up
+                 (see :func:`.find_relaton_files()`)
     :param on_progress: progress report lambda taking two ints (total, indexed)
+    :param on_error: error report lambda taking two strings (ref, error)
+    :param checkpoint: if given, saved after each committed batch;
+                       files up to its ``resume_after`` path are skipped
+    :param generation: dataset generation to write items under
+                       (see :class:`~.models.DatasetGeneration`),
+                       by default the live one
 
     :returns: a tuple of two integers (total, indexed)
+              and a :class:`sources.indexable.IndexingStats` dictionary
 
     :raise EnvironmentError: passes through any IOError, FileNotFoundError etc.
     """
-    yaml.SafeLoader.yaml_implicit_resolvers = {
-        k: [r for r in v if r[0] != "tag:yaml.org,2002:timestamp"]
-        for k, v in yaml.SafeLoader.yaml_implicit_resolvers.items()
-    }
-
     report_progress = on_progress or (lambda total, current: print(
         "Indexing {}: {} of {}".format(ds_id, total, current))
     )
+    report_error = on_error or (lambda ref, err: logger.warning(
+        "Failed to index %s in %s: %s", ref, ds_id, err)
+    )
 
     requested_refs = set(refs or [])
     indexed_refs = set()
 
-    relaton_source_files = glob.glob("%s/*.yaml" % relaton_path)
+    # Sorted, so that an interrupted run can be resumed
+    # from the last committed path.
+    if refs is not None:
+        if not path.isdir(relaton_path):
+            raise RuntimeError("The source is empty")
+        # Only requested files are looked up, rather than listing
+        # the whole directory, so that cost is proportional
+        # to the number of changed refs
+        relaton_source_files = find_relaton_files(
+            relaton_path,
+            requested_refs)
+    else:
+        relaton_source_files = list(iter_relaton_files(relaton_path))
+    source_refs = set(get_ref(fpath) for fpath in relaton_source_files)
 
     total = len(relaton_source_files)
 
-    if total < 1:
+    if total < 1 and refs is None:
         raise RuntimeError("The source is empty")
 
     report_progress(total, 0)
 
+    resume_after = checkpoint.resume_after if checkpoint else None
+
+    files_to_index: List[Tuple[int, str]] = [
+        (idx, relaton_fpath)
+        for idx, relaton_fpath in enumerate(relaton_source_files)
+        if resume_after is None or relaton_fpath > resume_after
+    ]
+
+    if generation is None:
+        generation = get_live_generation(ds_id)
+
+    existing_refs = RefData.all_generations.filter(
+        dataset=ds_id,
+        generation=generation)
+    if refs is not None:
+        existing_refs = existing_refs.filter(ref__in=requested_refs)
+    known_hashes: Dict[str, str] = dict(
+        existing_refs.values_list('ref', 'content_hash'))
+
+    stats: IndexingStats = dict(
+        inserted=0,
+        updated=0,
+        unchanged=0,
+        deleted=0,
+    )
+
+    started_at = time.monotonic()
+    batch: List[RefData] = []
+    processed_since_commit = 0
+
+    def commit_batch(last_path: str):
+        nonlocal batch, processed_since_commit
+        if batch:
+            for failed_ref, err in write_batch(batch):
+                report_error(failed_ref, err)
+                indexed_refs.discard(failed_ref)
+                if failed_ref in known_hashes:
+                    stats['updated'] -= 1
+                else:
+                    stats['inserted'] -= 1
+        if checkpoint:
+            checkpoint.save(last_path)
+        batch = []
+        processed_since_commit = 0
+
+    parsed_items = parse_relaton_files(
+        [relaton_fpath for _, relaton_fpath in files_to_index],
+        [
+            known_hashes.get(get_ref(relaton_fpath), None)
+            for _, relaton_fpath in files_to_index
+        ],
+    )
+    for (idx, relaton_fpath), item in zip(files_to_index, parsed_items):
+        report_progress(total, idx)
+        processed_since_commit += 1
+
+        if item.error:
+            report_error(item.ref, item.error)
+        elif item.body is None:
+            stats['unchanged'] += 1
+            indexed_refs.add(item.ref)
+        else:
+            if item.ref in known_hashes:
+                stats['updated'] += 1
+            else:
+                stats['inserted'] += 1
+            indexed_refs.add(item.ref)
+
+            if item.validation_errors:
+                # Indexed anyway, logged once here rather than
+                # every time the item is retrieved
+                logger.warning(
+                    "Item %s in %s did not validate: %s",
+                    item.ref,
+                    ds_id,
+                    item.validation_errors[0])
+
+            batch.append(RefData(
+                ref=item.ref,
+                dataset=ds_id,
+                generation=generation,
+                body=item.body,
+                latest_date=item.latest_date,
+                content_hash=item.content_hash,
+                representations=item.representations or dict(),
+                is_valid=not item.validation_errors,
+                validation_errors=item.validation_errors or [],
+                normalized_body=item.normalized_body,
+            ))
+
+        if processed_since_commit >= BATCH_SIZE:
+            commit_batch(relaton_fpath)
+
+    if files_to_index and processed_since_commit > 0:
+        commit_batch(files_to_index[-1][1])
+
+    # Which refs are stale is determined from source listing
+    # rather than from what was indexed during this run,
+    # since a resumed run skips refs committed earlier
+    # and refs that failed to index should keep their previous version.
+    stats['deleted'] = delete_stale_refs(
+        ds_id,
+        source_refs,
+        requested_refs if refs is not None else None,
+        generation)
+
+    elapsed = time.monotonic() - started_at
+    logger.info(
+        "Indexed %s items from %s in %.1f s (%.1f items/s): %s",
+        len(indexed_refs),
+        ds_id,
+        elapsed,
+        len(indexed_refs) / elapsed if elapsed > 0 else 0,
+        stats)
+
+    return total, len(indexed_refs), stats
+
+
+def delete_stale_refs(
+    ds_id: str,
+    source_refs: Set[str],
+    requested_refs: Optional[Set[str]] = None,
+    generation: Optional[int] = None,
+) -> int:
+    """Deletes indexed refs not found in source, in a single transaction.
+
+    :param source_refs: all refs found in source
+    :param requested_refs: if given, only these refs are considered
+    :param generation: dataset generation, by default the live one
+    :returns: number of deleted refs
+    """
+    if generation is None:
+        generation = get_live_generation(ds_id)
+
     with transaction.atomic():
-        for idx, relaton_fpath in enumerate(relaton_source_files):
-            ref = path.splitext(path.basename(relaton_fpath))[0]
-
-            if refs is None or ref in requested_refs:
-                report_progress(total, idx)
-
-                with open(relaton_fpath, 'r', encoding='utf-8') \
-                     as relaton_fhandler:
-                    ref_data = yaml.load(
-                        relaton_fhandler.read(),
-                        Loader=yaml.SafeLoader)
-
-                    latest_date = max(
-                        to_dates(as_list(ref_data.get('date', [])))
-                        or [datetime.datetime.now().date()]
-                    )
-
-                    RefData.objects.update_or_create(
-                        ref=ref,
-                        dataset=ds_id,
-                        defaults=dict(
-                            body=ref_data,
-                            latest_date=latest_date,
-                            representations=dict(),
-                        ),
-                    )
-
-                    indexed_refs.add(ref)
-
-        if refs is not None:
+        stale_refs = RefData.all_generations.filter(
+            dataset=ds_id,
+            generation=generation)
+
+        if requested_refs is not None:
             # If we’re indexing a subset of refs,
             # and some of those refs were not found in source,
             # delete those refs from the dataset.
-            missing_refs = requested_refs - indexed_refs
-            (RefData.objects.
-                filter(dataset=ds_id).
-                exclude(ref__in=missing_refs).
-                delete())
+            stale_refs = stale_refs.filter(
+                ref__in=requested_refs - source_refs)
 
         else:
             # If we’re reindexing the entire dataset,
             # delete all refs not found in source.
-            (RefData.objects.
-                filter(dataset=ds_id).
-                exclude(ref__in=indexed_refs).
-                delete())
+            stale_refs = stale_refs.exclude(ref__in=source_refs)
+
+        _, deleted = stale_refs.delete()
+
+    return deleted.get(RefData._meta.label, 0)
+
+
+def list_refs_in_source(relaton_path: str) -> List[str]:
+    """Returns sorted :term:`refs <ref>` of all Relaton source files
+    under given path."""
+
+    return [get_ref(fpath) for fpath in iter_relaton_files(relaton_path)]
+
+
+def iter_relaton_files(relaton_path: str) -> Iterator[str]:
+    """Yields paths to Relaton source files (``*.yaml``)
+    directly under given path, sorted by path.
+
+    The directory is read with :func:`os.scandir()`,
+    which doesn’t need to stat or pattern-match each entry
+    the way ``glob.glob()`` does. Hidden files are skipped.
+    """
+
+    with os.scandir(relaton_path) as it:
+        fnames = sorted(
+            entry.name
+            for entry in it
+            if entry.name.endswith('.yaml')
+            and not entry.name.startswith('.')
+            and entry.is_file())
+
+    for fname in fnames:
+        yield path.join(relaton_path, fname)
+
+
+def find_relaton_files(relaton_path: str, refs: Iterable[str]) -> List[str]:
+    """Returns sorted paths to Relaton source files
+    for given :term:`refs <ref>` under given path,
+    omitting refs that have no corresponding file.
 
-    return total, len(indexed_refs)
+    Unlike :func:`.iter_relaton_files()`,
+    doesn’t list the directory.
+    """
+
+    fpaths = (
+        path.join(relaton_path, f'{ref}.yaml')
+        for ref in refs
+        # A ref is a file name, never a path
+        if ref and path.basename(ref) == ref and not ref.startswith('.')
+    )
+    return sorted(fpath for fpath in fpaths if path.isfile(fpath))
+
+
+def rebuild_dataset(ds_id, relaton_path, on_progress=None, on_error=None) \
+        -> Tuple[int, int, IndexingStats]:
+    """Reindexes the entire dataset from scratch
+    without affecting availability of indexed data.
+
+    Items are indexed by :func:`.index_dataset()`
+    under a new (shadow) generation, invisible to readers
+    until :class:`~.models.DatasetGeneration` pointer is switched to it
+    after indexing completes. Items of the previous generation
+    are deleted afterwards, in batches, by a separate task
+    (:func:`main.tasks.drop_inactive_generations_task`)
+    queued once the switch is committed.
+
+    :returns: same as :func:`.index_dataset()`
+              (``deleted`` stat doesn’t count items of previous generation)
+    """
+    with transaction.atomic():
+        pointer, _ = (
+            DatasetGeneration.objects.
+            select_for_update().
+            get_or_create(dataset=ds_id, defaults=dict(generation=0)))
+
+    # Items left by an earlier rebuild that didn’t complete
+    drop_inactive_generations(ds_id)
+
+    shadow_generation = pointer.generation + 1
+
+    total, indexed, stats = index_dataset(
+        ds_id,
+        relaton_path,
+        None,
+        on_progress,
+        on_error,
+        generation=shadow_generation)
+
+    # Imported here since tasks module depends on this one
+    from .tasks import drop_inactive_generations as drop_task
+
+    with transaction.atomic():
+        (DatasetGeneration.objects.
+            filter(dataset=ds_id).
+            update(generation=shadow_generation))
+        transaction.on_commit(lambda: drop_task.delay(
+            ds_id,
+            below=shadow_generation))
+
+    logger.info(
+        "Switched %s to generation %s",
+        ds_id,
+        shadow_generation)
+
+    return total, indexed, stats
+
+
+def get_live_generation(ds_id: str) -> int:
+    """Returns live generation of given dataset
+    (see :class:`~.models.DatasetGeneration`)."""
+
+    return (
+        DatasetGeneration.objects.
+        filter(dataset=ds_id).
+        values_list('generation', flat=True).
+        first()
+    ) or 0
+
+
+def drop_inactive_generations(
+    ds_id: str,
+    below: Optional[int] = None,
+) -> int:
+    """Deletes items of given dataset that don’t belong
+    to its live generation, in batches of :data:`.BATCH_SIZE`
+    so as not to hold locks for long.
+
+    :param below: if given, only generations lower than this
+                  are deleted, so that a shadow generation
+                  of a rebuild started in the meantime is left alone
+    :returns: number of deleted items
+    """
+    inactive = (
+        RefData.all_generations.
+        filter(dataset=ds_id).
+        exclude(generation=get_live_generation(ds_id)))
+    if below is not None:
+        inactive = inactive.filter(generation__lt=below)
+
+    deleted_total = 0
+    while True:
+        pks = list(inactive.values_list('pk', flat=True)[:BATCH_SIZE])
+        if not pks:
+            break
+        with transaction.atomic():
+            _, deleted = RefData.all_generations.filter(pk__in=pks).delete()
+        deleted_total += deleted.get(RefData._meta.label, 0)
+
+    return deleted_total
+
+
+def get_refs_for_changed_paths(changed_paths: List[str]) -> List[str]:
+    """Given a list of paths changed in Relaton source repository
+    (relative to repository root), returns corresponding :term:`refs <ref>`.
+    Paths outside of ``data/`` directory are ignored."""
+
+    return [
+        get_ref(changed_path)
+        for changed_path in changed_paths
+        if path.dirname(changed_path) == 'data'
+        and changed_path.endswith('.yaml')
+    ]
+
+
+def get_ref(relaton_fpath: str) -> str:
+    """Returns :term:`ref` corresponding to given Relaton source file path
+    (filename without extension)."""
+
+    return path.splitext(path.basename(relaton_fpath))[0]
+
+
+@dataclass
+class ParsedRelatonFile:
+    """Result of reading a Relaton source file
+    (see :func:`.parse_relaton_file()`)."""
+
+    ref: str
+    """:term:`ref` corresponding to the file."""
+
+    content_hash: str
+    """SHA-256 hex digest of file contents
+    (see :func:`.parse_relaton_file()`)."""
+
+    body: Optional[Dict[str, Any]] = None
+    """Deserialized Relaton data.
+    ``None`` if file contents were unchanged and parsing was skipped."""
+
+    latest_date: Optional[datetime.date] = None
+    """Latest date found in the item, if it was parsed."""
+
+    representations: Optional[Dict[str, str]] = None
+    """Item serialized by opted-in serializers, if it was parsed
+    (see :func:`bib_models.serializers.preserialize()`)."""
+
+    validation_errors: Optional[List[str]] = None
+    """Errors obtained when validating deserialized data
+    as a :class:`~bib_models.models.bibdata.BibliographicItem`,
+    if it was parsed. Empty if data is valid."""
+
+    normalized_body: Optional[Dict[str, Any]] = None
+    """Validated item dumped as a dictionary, if data is valid
+    (see :attr:`~.models.RefData.normalized_body`)."""
+
+    error: Optional[str] = None
+    """Description of the problem, if the file could not be parsed."""
+
+
+def parse_relaton_files(
+    fpaths: List[str],
+    known_hashes: List[Optional[str]],
+) -> Iterator[ParsedRelatonFile]:
+    """Parses given Relaton source files,
+    in a pool of :data:`.PARSER_WORKERS` processes if more than one.
+
+    The pool is billiard’s (the multiprocessing fork Celery uses),
+    which, unlike the standard library one, can be started
+    from daemonic processes such as Celery prefork pool workers.
+
+    Files are handed to the pool in chunks, and no more than
+    two chunks per worker are in flight at a time,
+    so that parsed items don’t pile up in memory
+    faster than the caller writes them.
+
+    :param fpaths: paths to Relaton source files
+    :param known_hashes: previously indexed content hash
+                         for each of ``fpaths``, or ``None`` if not indexed
+
+    Yields results of :func:`.parse_relaton_file()`
+    in the same order as ``fpaths``.
+    """
+    if PARSER_WORKERS > 1 and len(fpaths) > 1:
+        chunk_size = max(1, min(
+            BATCH_SIZE,
+            len(fpaths) // (PARSER_WORKERS * 4)))
+        pending: Deque[ApplyResult] = deque()
+        with Pool(PARSER_WORKERS) as pool:
+            for idx in range(0, len(fpaths), chunk_size):
+                pending.append(pool.apply_async(
+                    parse_relaton_file_chunk,
+                    (
+                        fpaths[idx:idx + chunk_size],
+                        known_hashes[idx:idx + chunk_size],
+                    )))
+                if len(pending) >= PARSER_WORKERS * 2:
+                    yield from pending.popleft().get()
+            while pending:
+                yield from pending.popleft().get()
+    else:
+        yield from map(parse_relaton_file, fpaths, known_hashes)
+
+
+def parse_relaton_file_chunk(
+    fpaths: List[str],
+    known_hashes: List[Optional[str]],
+) -> List[ParsedRelatonFile]:
+    """Parses given files in a parser pool worker."""
+
+    return list(map(parse_relaton_file, fpaths, known_hashes))
+
+
+def parse_relaton_file(
+    relaton_fpath: str,
+    known_hash: Optional[str] = None,
+) -> ParsedRelatonFile:
+    """Reads a Relaton source file.
+
+    If file contents hash matches ``known_hash``,
+    skips deserialization.
+
+    If file contents cannot be deserialized,
+    returns a result with :attr:`~.ParsedRelatonFile.error` set
+    rather than raising, so that one bad file doesn’t abort the run.
+
+    Deserialized data is validated
+    (see :attr:`~.ParsedRelatonFile.validation_errors`),
+    and valid items are also serialized into formats
+    that opted in to that (see :func:`bib_models.serializers.preserialize()`),
+    so that output doesn’t need to be rendered on every request.
+    Content hash covers versions of those serializers
+    (see :func:`bib_models.serializers.get_preserialization_version()`)
+    and :data:`.NORMALIZED_BODY_VERSION`,
+    so that stored output is refreshed for unchanged files
+    the next time they are indexed after a serializer
+    or bibliographic item models change.
+    """
+    with open(relaton_fpath, 'rb') as relaton_fhandler:
+        raw_data = relaton_fhandler.read()
+
+    ref = get_ref(relaton_fpath)
+    content_hash = hashlib.sha256(
+        raw_data
+        + b'\0'
+        + serializers.get_preserialization_version().encode('utf-8')
+        + b'\0'
+        + NORMALIZED_BODY_VERSION.encode('utf-8')
+    ).hexdigest()
+
+    if content_hash == known_hash:
+        return ParsedRelatonFile(ref=ref, content_hash=content_hash)
+
+    try:
+        ref_data = yaml.load(
+            raw_data.decode('utf-8'),
+            Loader=RelatonLoader)
+    except (UnicodeDecodeError, yaml.YAMLError) as err:
+        return ParsedRelatonFile(
+            ref=ref,
+            content_hash=content_hash,
+            error=str(err))
+
+    if not isinstance(ref_data, dict):
+        return ParsedRelatonFile(
+            ref=ref,
+            content_hash=content_hash,
+            error="Source file does not contain a mapping")
+
+    latest_date = max(
+        to_dates(as_list(ref_data.get('date', [])))
+        or [datetime.datetime.now().date()]
+    )
+
+    validation_errors: List[str]
+    normalized_body: Optional[Dict[str, Any]]
+    try:
+        bibitem = BibliographicItem(**ref_data)
+    except ValidationError as err:
+        validation_errors = [str(err)]
+        # Item will be served (if at all) by serializing on the fly
+        representations = {}
+        normalized_body = None
+    else:
+        validation_errors = []
+        representations = serializers.preserialize(bibitem)
+        normalized_body = unpack_dataclasses(
+            bibitem.dict(exclude_unset=True))
+
+    return ParsedRelatonFile(
+        ref=ref,
+        content_hash=content_hash,
+        body=ref_data,
+        latest_date=latest_date,
+        representations=representations,
+        validation_errors=validation_errors,
+        normalized_body=normalized_body,
+    )
+
+
+def upsert_refs(items: List[RefData]):
+    """Writes given unsaved :class:`~.models.RefData` instances
+    using a single
+    ``INSERT … ON CONFLICT (ref, dataset, generation) DO UPDATE``
+    statement, so that already indexed refs are updated in place.
+
+    Search vectors, document identifiers and works of written items
+    are updated as well, see :func:`.update_search_vectors()`,
+    :func:`.replace_docids()` and :func:`.assign_works()`.
+    """
+    RefData.objects.bulk_create(
+        items,
+        update_conflicts=True,
+        unique_fields=['ref', 'dataset', 'generation'],
+        update_fields=[
+            'body',
+            'latest_date',
+            'content_hash',
+            'representations',
+            'is_valid',
+            'validation_errors',
+            'normalized_body',
+        ],
+    )
+    update_search_vectors(items)
+    pks = replace_docids(items)
+    assign_works(items, pks)
+
+
+def update_search_vectors(items: List[RefData]):
+    """Computes :attr:`~.models.RefData.search_vector`
+    for given just written items (which must belong to the same dataset
+    and generation) in a single ``UPDATE`` statement."""
+
+    if not items:
+        return
+
+    (RefData.all_generations.
+        filter(
+            dataset=items[0].dataset,
+            generation=items[0].generation,
+            ref__in=[item.ref for item in items]).
+        update(search_vector=RawSQL(SEARCH_VECTOR_SQL, [])))
+
+
+def replace_docids(items: List[RefData]) -> Dict[str, int]:
+    """Replaces :class:`~.models.RefDocID` rows
+    of given just written items (which must belong to the same dataset
+    and generation) with ones obtained from their Relaton data.
+
+    :returns: primary keys of written items by ref
+    """
+
+    if not items:
+        return {}
+
+    pks: Dict[str, int] = dict(
+        RefData.all_generations.
+        filter(
+            dataset=items[0].dataset,
+            generation=items[0].generation,
+            ref__in=[item.ref for item in items]).
+        values_list('ref', 'pk'))
+
+    RefDocID.objects.filter(ref_data_id__in=pks.values()).delete()
+    RefDocID.objects.bulk_create([
+        RefDocID(ref_data_id=pks[item.ref], **docid)
+        for item in items
+        for docid in extract_docids(item.body)
+    ])
+
+    return pks
+
+
+def assign_works(items: List[RefData], pks: Dict[str, int]):
+    """Points given just written items to their :class:`~.models.Work`
+    (creating missing ones), based on their primary document identifiers.
+
+    :param pks: primary keys of given items by ref,
+                as returned by :func:`.replace_docids()`
+    """
+
+    if not items:
+        return
+
+    work_keys: Dict[str, Optional[Tuple[str, str]]] = {
+        item.ref: get_work_key(extract_docids(item.body))
+        for item in items
+    }
+    keys = set(key for key in work_keys.values() if key)
+
+    work_ids: Dict[Tuple[str, str], int] = {}
+    if keys:
+        Work.objects.bulk_create(
+            [Work(doctype=doctype, docid=docid) for doctype, docid in keys],
+            ignore_conflicts=True)
+        work_ids = {
+            (doctype, docid): pk
+            for pk, doctype, docid in (
+                Work.objects.
+                filter(docid__in=[docid for _, docid in keys]).
+                values_list('pk', 'doctype', 'docid'))
+            if (doctype, docid) in keys
+        }
+
+    RefData.all_generations.bulk_update([
+        RefData(
+            pk=pks[ref],
+            work_id=work_ids[key] if key else None)
+        for ref, key in work_keys.items()
+    ], ['work'])
+
+
+def write_batch(items: List[RefData]) -> List[Tuple[str, str]]:
+    """Writes given items using :func:`.upsert_refs()`
+    in a transaction of their own.
+
+    If the batch fails to write, retries writing items one by one
+    to isolate the problematic ones.
+
+    :returns: a list of (ref, error description) tuples
+              for items that could not be written
+    """
+    try:
+        with transaction.atomic():
+            upsert_refs(items)
+    except DatabaseError:
+        logger.exception(
+            "Failed to write a batch of %s items, retrying one by one",
+            len(items))
+    else:
+        return []
+
+    failed: List[Tuple[str, str]] = []
+    for item in items:
+        try:
+            with transaction.atomic():
+                upsert_refs([item])
+        except DatabaseError as err:
+            failed.append((item.ref, str(err)))
+    return failed
 
 
 def to_dates(items: List[Dict[str, Any]]) -> List[datetime.date]:
@@ -277,9 +978,13 @@ def to_dates(items: List[Dict[str, Any]]) -> List[datetime.date]:
 
 
 def reset_index_for_dataset(ds_id):
-    """Deletes all references for given dataset."""
+    """Deletes all references for given dataset,
+    across all generations."""
 
     with transaction.atomic():
-        (RefData.objects.
+        (RefData.all_generations.
+            filter(dataset=ds_id).
+            delete())
+        (DatasetGeneration.objects.
             filter(dataset=ds_id).
             delete())
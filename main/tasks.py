@@ -0,0 +1,30 @@
+"""
+Celery tasks for maintaining indexed Relaton data.
+"""
+from celery.utils.log import get_task_logger
+
+from sources.celery import app
+
+from . import sources
+
+
+logger = get_task_logger(__name__)
+
+
+def drop_inactive_generations_task(ds_id: str, below: int) -> int:
+    """Deletes items of given dataset left from generations
+    preceding ``below``, once :func:`main.sources.rebuild_dataset`
+    switched the dataset to that generation.
+
+    :returns: number of deleted items
+    """
+    deleted = sources.drop_inactive_generations(ds_id, below=below)
+    logger.info(
+        "Deleted %s items of %s older than generation %s",
+        deleted,
+        ds_id,
+        below)
+    return deleted
+
+
+drop_inactive_generations = app.task(drop_inactive_generations_task)
@@ -1,11 +1,14 @@
 import json
 import re
 from typing import List
-from unittest import TestCase
+from unittest import TestCase, mock
 
 from django.core.management import call_command
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models import QuerySet, Q
 
+from bib_models import BibliographicItem
+from common.pydantic import unpack_dataclasses
 from main.exceptions import RefNotFoundError
 from main.models import RefData
 from main.query import (
@@ -19,6 +22,12 @@ from main.query import (
     get_indexed_ref_by_query,
     search_refs_relaton_struct,
 )
+from main.pagination import (
+    InvalidCursor,
+    decode_cursor,
+    paginate_refs_by_cursor,
+)
+from main.query_utils import build_bibitem
 from main.types import CompositeSourcedBibliographicItem, IndexedBibliographicItem
 
 
@@ -55,6 +64,28 @@ class QueryTestCase(TestCase):
         non_rfcs_queryset = rfcs_refs_queryset.exclude(dataset__iexact=dataset_id)
         self.assertEqual(non_rfcs_queryset.count(), 0)
 
+    def test_paginate_refs_by_cursor(self):
+        """
+        Walking pages of a capped queryset with a cursor should yield
+        all refs past the cap, in date order and without repeats.
+        """
+        expected = list(RefData.objects.order_by("-latest_date", "-id"))
+        self.assertGreater(len(expected), 3)
+
+        found, after = [], None
+        while True:
+            page = paginate_refs_by_cursor(RefData.objects.all()[:1], after, 2)
+            self.assertLessEqual(len(page.object_list), 2)
+            found.extend(page.object_list)
+            if not page.next_cursor:
+                break
+            after = decode_cursor(page.next_cursor)
+
+        self.assertEqual(found, expected)
+
+        with self.assertRaises(InvalidCursor):
+            decode_cursor("not a cursor")
+
     def test_list_doctypes(self):
         doctypes = list_doctypes()
         self.assertIsInstance(doctypes, list)
@@ -231,3 +262,55 @@ class QueryTestCase(TestCase):
         dataset = "rfcs"
         with self.assertRaises(RefNotFoundError):
             get_indexed_ref_by_query(dataset, Q())
+
+
+class NormalizedBodyTestCase(TestCase):
+    body = {
+        "docid": [{"id": "REF0", "type": "IETF", "primary": True}],
+        "title": {"content": "Title", "type": "main"},
+        "date": [
+            {"type": "published", "value": "2021-02"},
+            {"type": "updated", "value": "2021-03-04"},
+        ],
+        "contributor": [{
+            "role": "author",
+            "person": {"name": {"completename": {"content": "Name"}}},
+        }],
+        "relation": [{
+            "type": "updates",
+            "bibitem": {"formattedref": {"content": "REF1"}},
+        }],
+        "copyright": {"from": 2021, "owner": [{"name": "IETF"}]},
+    }
+
+    def _get_normalized_body(self):
+        # As stored at indexing time
+        return json.loads(json.dumps(
+            unpack_dataclasses(
+                BibliographicItem(**self.body).dict(exclude_unset=True)),
+            cls=DjangoJSONEncoder))
+
+    def test_valid_item_is_constructed_without_validation(self):
+        ref = RefData(
+            body=self.body,
+            normalized_body=self._get_normalized_body(),
+            is_valid=True)
+        with mock.patch.object(
+            BibliographicItem,
+            "__init__",
+            side_effect=AssertionError("Item was validated"),
+        ):
+            bibitem, errors = build_bibitem(ref)
+        self.assertEqual(errors, [])
+        self.assertEqual(bibitem, BibliographicItem(**self.body))
+        self.assertEqual(
+            bibitem.__fields_set__,
+            BibliographicItem(**self.body).__fields_set__)
+
+    def test_item_without_normalized_body_is_validated(self):
+        with mock.patch(
+            "main.query_utils.BibliographicItem",
+            wraps=BibliographicItem,
+        ) as bibitem_cls:
+            build_bibitem(RefData(body=self.body, is_valid=True))
+            bibitem_cls.assert_called_once()
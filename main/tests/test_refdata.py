@@ -1,7 +1,9 @@
 import datetime
 from typing import Dict, Any
 from urllib.parse import quote_plus
+import io
 import json
+import zipfile
 
 from django.test import TestCase
 from django.urls import reverse
@@ -64,6 +66,50 @@ class RefDataModelTests(TestCase):
         self.assertEqual(response.status_code, 404)
         self.assertTrue(len(response.json()["error"]) > 0)
 
+    def test_get_by_docid_batch(self):
+        docid = self.ref_body["docid"][0]["id"]
+        items = [
+            {"docid": docid},
+            {"docid": "NONEXISTENTKEY404"},
+            {"doctype": "standard"},
+        ]
+        # Exact and case-insensitive matching, then item data
+        with self.assertNumQueries(3):
+            response = self.client.post(
+                reverse("api_get_by_docid_batch"),
+                json.dumps({"items": items * 10}),
+                content_type="application/json",
+                **self.api_headers)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["data"]["0"]["data"]["id"], self.ref_body["id"])
+        self.assertEqual(data["data"]["0"]["format"], "relaton")
+        self.assertEqual(len(data["data"]), 10)
+        self.assertEqual(data["errors"]["2"], "Missing document ID")
+        self.assertEqual(len(data["errors"]), 20)
+
+    def test_get_by_docid_batch_zip(self):
+        docid = self.ref_body["docid"][0]["id"]
+        response = self.client.post(
+            reverse("api_get_by_docid_batch"),
+            json.dumps({
+                "items": [
+                    {"docid": docid, "anchor": "custom"},
+                    {"docid": "NONEXISTENTKEY404"},
+                ],
+                "output": "zip",
+            }),
+            content_type="application/json",
+            **self.api_headers)
+        self.assertEqual(response.status_code, 200)
+        archive = zipfile.ZipFile(io.BytesIO(response.content))
+        self.assertEqual(
+            archive.namelist(),
+            ["reference.custom.json", "errors.json"])
+        self.assertEqual(
+            list(json.loads(archive.read("errors.json")).keys()),
+            ["1"])
+
     def test_success_search_ref(self):
         struct_query = json.dumps(
             {
@@ -115,6 +161,32 @@ class RefDataModelTests(TestCase):
 
         self.assertEqual(results_count, 0)
 
+    def test_search_ref_with_cursor(self):
+        struct_query = json.dumps(
+            {
+                "docid": [
+                    {"id": self.ref_body["docid"][0]["id"], "type": "standard"}
+                ],
+            }
+        )
+        url = reverse("api_search", args=[quote_plus(struct_query)])
+
+        response = self.client.get(
+            url,
+            {"query_format": "json_struct", "cursor": ""},
+            **self.api_headers,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"][0]["id"], self.ref_body["id"])
+        self.assertIsNone(response.json()["meta"]["next_cursor"])
+
+        response = self.client.get(
+            url,
+            {"query_format": "json_struct", "cursor": "not a cursor"},
+            **self.api_headers,
+        )
+        self.assertEqual(response.status_code, 400)
+
     def test_get_doi_ref(self):
         # Ref link: https://doi.org/10.1093/benz/9780199773787.article.b00004912
         ref = "10.1093/benz/9780199773787.article.b00004912"
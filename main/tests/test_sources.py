@@ -0,0 +1,557 @@
+import os
+import tempfile
+from os import path
+from unittest import mock
+
+import billiard
+from django.test import SimpleTestCase, TestCase, override_settings
+from git import Repo
+from redis.exceptions import LockError
+
+from bib_models import serializers
+from common.git import ensure_commit
+from common.util import as_list
+
+from sources import indexable
+from sources.indexable import IndexingCheckpoint, SourceLocked
+from sources.indexable import refresh_indexing_lock
+from sources.progress import ProgressReporter
+from main.models import RefData, RefDocID, Work
+from main.query import search_refs_docids, search_refs_relaton_field
+from main.query import build_citation_for_docid, search_refs_docid_regex
+from main.query_utils import build_bibitem
+from main.sources import index_dataset, get_refs_for_changed_paths
+from main.sources import rebuild_dataset
+from main.sources import delete_stale_refs, list_refs_in_source
+from main.sources import iter_relaton_files, find_relaton_files
+from main.sources import parse_relaton_files
+from main.tasks import drop_inactive_generations_task
+
+
+RELATON_YAML = """
+docid:
+  - id: {id}
+    type: IETF
+    primary: true
+title:
+  - content: {title}
+    type: main
+date:
+  - type: published
+    value: 2021-02
+"""
+
+
+class IndexDatasetTestCase(TestCase):
+    """
+    Test cases for Relaton dataset indexing in sources.py
+    """
+
+    dataset_id = "test_dataset"
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_path = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write_item(self, ref: str, title: str = "Some title"):
+        with open(path.join(self.data_path, f"{ref}.yaml"), "w") as f:
+            f.write(RELATON_YAML.format(id=ref.upper(), title=title))
+
+    def _remove_item(self, ref: str):
+        os.remove(path.join(self.data_path, f"{ref}.yaml"))
+
+    def _index(self, refs=None, on_error=None, checkpoint=None):
+        return index_dataset(
+            self.dataset_id,
+            self.data_path,
+            refs,
+            lambda total, indexed: None,
+            on_error,
+            checkpoint,
+        )
+
+    def test_index_all(self):
+        for idx in range(5):
+            self._write_item(f"ref{idx}")
+
+        total, indexed, stats = self._index()
+
+        self.assertEqual(total, 5)
+        self.assertEqual(indexed, 5)
+        self.assertEqual(stats["inserted"], 5)
+        self.assertEqual(
+            RefData.objects.filter(dataset=self.dataset_id).count(),
+            5)
+
+    def test_reindex_updates_in_place(self):
+        self._write_item("ref0", "Old title")
+        self._index()
+        original_pk = RefData.objects.get(ref="ref0").pk
+
+        self._write_item("ref0", "New title")
+        self._index()
+
+        ref = RefData.objects.get(ref="ref0")
+        self.assertEqual(ref.pk, original_pk)
+        self.assertEqual(ref.body["title"][0]["content"], "New title")
+
+    def test_reindex_skips_unchanged_items(self):
+        self._write_item("ref0")
+        self._write_item("ref1")
+        self._write_item("ref2")
+        self._index()
+
+        self._write_item("ref1", "New title")
+        self._remove_item("ref2")
+        self._write_item("ref3")
+        _, indexed, stats = self._index()
+
+        self.assertEqual(indexed, 3)
+        self.assertEqual(stats, dict(
+            inserted=1,
+            updated=1,
+            unchanged=1,
+            deleted=1,
+        ))
+
+    def test_reindex_deletes_stale_refs(self):
+        self._write_item("ref0")
+        self._write_item("ref1")
+        self._index()
+
+        self._remove_item("ref1")
+        self._index()
+
+        self.assertEqual(
+            list(RefData.objects.values_list("ref", flat=True)),
+            ["ref0"])
+
+    def test_partial_reindex_deletes_only_missing_requested_refs(self):
+        self._write_item("ref0")
+        self._write_item("ref1")
+        self._write_item("ref2")
+        self._index()
+
+        self._remove_item("ref1")
+        self._index(refs=["ref0", "ref1"])
+
+        self.assertEqual(
+            sorted(RefData.objects.values_list("ref", flat=True)),
+            ["ref0", "ref2"])
+
+    def test_partial_reindex_does_not_list_source(self):
+        for idx in range(3):
+            self._write_item(f"ref{idx}")
+
+        with mock.patch("main.sources.os.scandir") as scandir:
+            total, indexed, _ = self._index(refs=["ref2", "ref1", "../ref0"])
+
+        scandir.assert_not_called()
+        self.assertEqual((total, indexed), (2, 2))
+        self.assertEqual(
+            sorted(RefData.objects.values_list("ref", flat=True)),
+            ["ref1", "ref2"])
+
+    def test_invalid_file_does_not_abort_indexing(self):
+        self._write_item("ref0")
+        with open(path.join(self.data_path, "ref1.yaml"), "w") as f:
+            f.write("docid: [unclosed")
+        self._write_item("ref2")
+        errors = []
+
+        _, indexed, _ = self._index(
+            on_error=lambda ref, err: errors.append(ref))
+
+        self.assertEqual(indexed, 2)
+        self.assertEqual(errors, ["ref1"])
+        self.assertEqual(
+            sorted(RefData.objects.values_list("ref", flat=True)),
+            ["ref0", "ref2"])
+
+    @mock.patch("sources.indexable.cache")
+    def test_resume_from_checkpoint(self, cache):
+        for idx in range(3):
+            self._write_item(f"ref{idx}")
+        checkpoint = IndexingCheckpoint(
+            source_id=self.dataset_id,
+            heads="abc",
+            resume_after=path.join(self.data_path, "ref0.yaml"))
+
+        _, indexed, _ = self._index(checkpoint=checkpoint)
+
+        self.assertEqual(indexed, 2)
+        self.assertEqual(
+            sorted(RefData.objects.values_list("ref", flat=True)),
+            ["ref1", "ref2"])
+        self.assertEqual(
+            checkpoint.resume_after,
+            path.join(self.data_path, "ref2.yaml"))
+        cache.set.assert_called()
+
+    def test_rebuild_keeps_previous_generation_live_until_done(self):
+        self._write_item("ref0", "Old title")
+        self._write_item("ref1", "Old title")
+        self._index()
+
+        self._write_item("ref0", "New title")
+        self._remove_item("ref1")
+        visible_during_rebuild = []
+
+        def on_progress(total, indexed):
+            visible_during_rebuild.append(sorted(
+                (ref.ref, ref.body["title"][0]["content"])
+                for ref in RefData.objects.filter(dataset=self.dataset_id)
+            ))
+
+        with mock.patch(
+            "main.tasks.drop_inactive_generations.delay",
+            side_effect=drop_inactive_generations_task,
+        ) as drop_task, self.captureOnCommitCallbacks(execute=True):
+            rebuild_dataset(
+                self.dataset_id,
+                self.data_path,
+                on_progress)
+            drop_task.assert_not_called()
+
+        for visible in visible_during_rebuild:
+            self.assertEqual(visible, [
+                ("ref0", "Old title"),
+                ("ref1", "Old title"),
+            ])
+        drop_task.assert_called_once_with(self.dataset_id, below=1)
+        self.assertEqual(
+            [(ref.ref, ref.body["title"][0]["content"])
+             for ref in RefData.all_generations.all()],
+            [("ref0", "New title")])
+
+    def test_sharded_indexing_deletes_stale_refs_when_finalized(self):
+        self._write_item("ref0")
+        self._write_item("ref1")
+        self._index()
+
+        self._remove_item("ref1")
+        self._write_item("ref2")
+        self._write_item("ref3")
+
+        source_refs = list_refs_in_source(self.data_path)
+        self.assertEqual(source_refs, ["ref0", "ref2", "ref3"])
+        for shard in (source_refs[:2], source_refs[2:]):
+            self._index(refs=shard)
+
+        self.assertEqual(
+            RefData.objects.filter(dataset=self.dataset_id).count(),
+            4)
+        self.assertEqual(
+            delete_stale_refs(self.dataset_id, set(source_refs)),
+            1)
+        self.assertEqual(
+            sorted(RefData.objects.values_list("ref", flat=True)),
+            source_refs)
+
+    def test_docids_are_indexed(self):
+        self._write_item("ref0")
+        self._index()
+        self._write_item("ref0", "New title")
+        self._index()
+
+        self.assertEqual(
+            list(RefDocID.objects.values_list(
+                "ref_data__ref", "doctype", "docid", "docid_lower", "primary",
+            )),
+            [("ref0", "IETF", "REF0", "ref0", True)])
+        self.assertEqual(
+            [ref.ref for ref in search_refs_docids("REF0")],
+            ["ref0"])
+        self.assertEqual(
+            [ref.ref for ref in search_refs_docids("Ref0")],
+            ["ref0"])
+
+    def test_refs_sharing_primary_docid_are_members_of_one_work(self):
+        self._write_item("ref0")
+        self._index()
+        index_dataset(
+            "other_dataset",
+            self.data_path,
+            None,
+            lambda total, indexed: None)
+
+        work = Work.objects.get()
+        self.assertEqual((work.doctype, work.docid), ("IETF", "REF0"))
+        self.assertEqual(
+            sorted(work.members.values_list("dataset", flat=True)),
+            ["other_dataset", self.dataset_id])
+
+        with self.assertNumQueries(3):
+            citation = build_citation_for_docid("REF0")
+        self.assertEqual(citation.primary_docid, "REF0")
+        self.assertEqual(len(citation.sources), 2)
+
+    def test_merged_work_is_cached_until_member_changes(self):
+        self._write_item("ref0", "Old title")
+        self._index()
+        build_citation_for_docid("REF0")
+
+        with self.assertNumQueries(2), \
+                mock.patch("main.query.merge_refs") as merge_refs:
+            citation = build_citation_for_docid("REF0")
+        merge_refs.assert_not_called()
+        self.assertEqual(
+            as_list(citation.title or [])[0].content,
+            "Old title")
+
+        self._write_item("ref0", "New title")
+        self._index()
+        citation = build_citation_for_docid("REF0")
+        self.assertEqual(
+            as_list(citation.title or [])[0].content,
+            "New title")
+
+    def test_docid_regex_search(self):
+        self._write_item("ref0")
+        self._write_item("ref10")
+        self._index()
+
+        self.assertEqual(
+            sorted(ref.ref for ref in search_refs_docid_regex(
+                "ref.0", case_insensitive=True)),
+            ["ref10"])
+        self.assertEqual(
+            [ref.ref for ref in search_refs_docid_regex("ref0")],
+            [])
+        self.assertEqual(
+            sorted(ref.ref for ref in search_refs_docid_regex("REF", "IETF")),
+            ["ref0", "ref10"])
+
+    def test_search_vector_is_indexed(self):
+        self._write_item("ref0", "Congestion control")
+        self._write_item("ref1", "Something else")
+        self._index()
+
+        self.assertEqual(
+            [ref.ref for ref in search_refs_relaton_field(
+                {"": "congestion"},
+                rank=True,
+            )],
+            ["ref0"])
+        self.assertEqual(
+            [ref.ref for ref in search_refs_relaton_field(
+                {"title": "something"},
+            )],
+            ["ref1"])
+
+    def test_bibxml_is_preserialized(self):
+        self._write_item("ref0")
+        self._index()
+
+        ref = RefData.objects.get(ref="ref0")
+        self.assertIn(
+            'anchor="REF0"',
+            ref.representations[serializers.get_representation_key("bibxml")])
+
+    def test_validation_outcome_is_stored(self):
+        self._write_item("ref0")
+        with open(path.join(self.data_path, "ref1.yaml"), "w") as f:
+            f.write("docid: [{id: REF1, type: IETF}]\ntitle: [{type: main}]")
+        self._index()
+
+        valid_ref = RefData.objects.get(ref="ref0")
+        self.assertTrue(valid_ref.is_valid)
+        self.assertEqual(valid_ref.validation_errors, [])
+        self.assertEqual(
+            valid_ref.normalized_body["date"][0]["value"],
+            "February 2021")
+
+        invalid_ref = RefData.objects.get(ref="ref1")
+        self.assertFalse(invalid_ref.is_valid)
+        self.assertEqual(len(invalid_ref.validation_errors), 1)
+        self.assertIsNone(invalid_ref.normalized_body)
+
+        with mock.patch("main.query_utils.BibliographicItem") as bibitem_cls:
+            _, errors = build_bibitem(invalid_ref)
+            bibitem_cls.assert_not_called()
+            bibitem_cls.construct.assert_called_once()
+        self.assertEqual(errors, invalid_ref.validation_errors)
+
+    def test_dates_are_kept_as_strings(self):
+        self._write_item("ref0")
+        self._index()
+
+        ref = RefData.objects.get(ref="ref0")
+        self.assertEqual(ref.body["date"][0]["value"], "2021-02")
+        self.assertEqual(ref.latest_date.year, 2021)
+
+
+class ChangedPathsTestCase(TestCase):
+    def test_get_refs_for_changed_paths(self):
+        refs = get_refs_for_changed_paths([
+            "data/RFC.1234.yaml",
+            "data/RFC.1235.yaml",
+            "README.adoc",
+            "data/nested/RFC.1236.yaml",
+            "data/RFC.1237.xml",
+        ])
+        self.assertEqual(refs, ["RFC.1234", "RFC.1235"])
+
+
+class RelatonFilesTestCase(SimpleTestCase):
+    def test_iter_relaton_files_order_matches_sorted_glob(self):
+        with tempfile.TemporaryDirectory() as data_path:
+            for fname in (
+                "RFC.10.yaml",
+                "RFC.1.yaml",
+                "RFC.2.yml",
+                ".hidden.yaml",
+                "README.adoc",
+            ):
+                open(path.join(data_path, fname), "w").close()
+            os.mkdir(path.join(data_path, "nested.yaml"))
+
+            self.assertEqual(
+                list(iter_relaton_files(data_path)),
+                [path.join(data_path, "RFC.1.yaml"),
+                 path.join(data_path, "RFC.10.yaml")])
+            self.assertEqual(
+                find_relaton_files(
+                    data_path,
+                    ["RFC.10", "RFC.1", "RFC.3", "nested", "../RFC.1"]),
+                [path.join(data_path, "RFC.1.yaml"),
+                 path.join(data_path, "RFC.10.yaml")])
+
+    def test_parse_relaton_files_in_bounded_pool(self):
+        with tempfile.TemporaryDirectory() as data_path:
+            fpaths = []
+            for idx in range(20):
+                fpath = path.join(data_path, f"ref{idx}.yaml")
+                with open(fpath, "w") as f:
+                    f.write(RELATON_YAML.format(id=f"REF{idx}", title="T"))
+                fpaths.append(fpath)
+
+            with mock.patch("main.sources.PARSER_WORKERS", 2), \
+                    mock.patch("main.sources.BATCH_SIZE", 2):
+                parsed = list(parse_relaton_files(fpaths, [None] * 20))
+                self.assertEqual(
+                    [item.ref for item in parsed],
+                    [f"ref{idx}" for idx in range(20)])
+
+                # Celery prefork pool workers are daemonic billiard processes
+                with billiard.Pool(1) as worker_pool:
+                    refs = worker_pool.apply(parse_relaton_refs, (fpaths,))
+                self.assertEqual(refs, [f"ref{idx}" for idx in range(20)])
+
+
+def parse_relaton_refs(fpaths):
+    return [
+        item.ref
+        for item in parse_relaton_files(fpaths, [None] * len(fpaths))
+    ]
+
+
+class ProgressReporterTestCase(SimpleTestCase):
+    def test_updates_are_coalesced(self):
+        now = [0.0]
+        reported = []
+        reporter = ProgressReporter(
+            lambda *args: reported.append(args),
+            interval=2,
+            every_items=100,
+            clock=lambda: now[0])
+
+        reporter("indexing", 300, 0)
+        for indexed in range(1, 50):
+            reporter("indexing", 300, indexed)
+        now[0] = 5.0
+        reporter("indexing", 300, 50)
+        for indexed in range(51, 150):
+            reporter("indexing", 300, indexed)
+        reporter("indexing", 300, 150)
+        reporter("indexing", 300, 151)
+        reporter.flush()
+        reporter("indexing", 300, 300)
+
+        self.assertEqual(reported, [
+            ("indexing", 300, 0, None, None),
+            ("indexing", 300, 50, 10.0, 25),
+            ("indexing", 300, 150, 30.0, 5),
+            ("indexing", 300, 151, 30.2, 5),
+            ("indexing", 300, 300, 60.0, 0),
+        ])
+
+
+class ShardCheckoutTestCase(SimpleTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.tmp_root = path.realpath(self.tmp_dir.name)
+
+        self.upstream_path = path.join(self.tmp_root, "upstream")
+        upstream = Repo.init(self.upstream_path, initial_branch="main")
+        upstream.config_writer().set_value("user", "name", "ci").release()
+        upstream.config_writer().set_value(
+            "user", "email", "ci@local").release()
+        self.shas = []
+        for idx in range(2):
+            with open(path.join(self.upstream_path, "ref.yaml"), "w") as f:
+                f.write(str(idx))
+            upstream.index.add(["ref.yaml"])
+            self.shas.append(upstream.index.commit(f"Commit {idx}").hexsha)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_planned_commit_is_checked_out(self):
+        url = f"file://{self.upstream_path}"
+        work_dir = path.join(self.tmp_root, "work", "repo")
+
+        with override_settings(DATASET_TMP_ROOT=self.tmp_root):
+            # Missing working directory is cloned and moved
+            # back to the planned commit
+            repo = ensure_commit(url, "main", work_dir, self.shas[0])
+            self.assertEqual(repo.head.commit.hexsha, self.shas[0])
+            with open(path.join(work_dir, "ref.yaml")) as f:
+                self.assertEqual(f.read(), "0")
+
+            repo = ensure_commit(url, "main", work_dir, self.shas[1])
+            self.assertEqual(repo.head.commit.hexsha, self.shas[1])
+
+            with self.assertRaises(RuntimeError):
+                ensure_commit(url, "main", work_dir, "0" * 40)
+
+    @mock.patch("sources.indexable.cache")
+    def test_forced_run_indexes_unchanged_source(self, cache):
+        indexed_heads = {"test_forced_latest_indexed_heads": self.shas[1]}
+        cache.get.side_effect = lambda key: indexed_heads.get(key, None)
+        indexer = mock.Mock(return_value=(1, 1, {}))
+
+        with override_settings(DATASET_TMP_ROOT=self.tmp_root):
+            indexable.register_git_source(
+                "test_forced",
+                [(f"file://{self.upstream_path}", "main")],
+            )({
+                "indexer": indexer,
+                "count_indexed": lambda: 0,
+                "reset_index": lambda: None,
+            })
+            try:
+                source = indexable.registry["test_forced"]
+
+                self.assertEqual(
+                    source.index(None, None, None, False),
+                    (0, 0, {}))
+                indexer.assert_not_called()
+
+                self.assertEqual(
+                    source.index(None, None, None, True),
+                    (1, 1, {}))
+                indexer.assert_called_once()
+                # Forced run covers all refs
+                self.assertIsNone(indexer.call_args[0][1])
+            finally:
+                indexable.registry.pop("test_forced", None)
+
+    @mock.patch("sources.indexable.cache")
+    def test_lost_lock_is_reported(self, cache):
+        cache.lock.return_value.reacquire.side_effect = LockError()
+        with self.assertRaises(SourceLocked):
+            refresh_indexing_lock("test_dataset", "token")
@@ -4,6 +4,7 @@ import logging
 from math import log as log_, floor
 from urllib.parse import unquote_plus
 import json
+from typing import List, Optional, Union
 
 from django.db.models.query import QuerySet
 from django.urls import reverse
@@ -29,6 +30,8 @@ from .query import get_indexed_item, list_refs
 from .query import build_citation_for_docid
 from .search import BaseCitationSearchView
 from .search import QUERY_FORMAT_LABELS
+from .pagination import InvalidCursor
+from .pagination import decode_cursor, paginate_refs_by_cursor
 from .exceptions import RefNotFoundError
 from .api import get_by_docid
 from datatracker import auth
@@ -216,6 +219,7 @@ class CitationSearchResultListView(MultipleObjectTemplateResponseMixin,
 
     template_name = 'browse/search_citations.html'
     metric_counter = metrics.gui_search_hits
+    cursor_page_size = BaseCitationSearchView.paginate_by
 
     def get_context_data(self, **kwargs):
         return dict(
@@ -242,7 +246,7 @@ def browse_external_reference(request, dataset_id):
         source = external_sources.registry[dataset_id]
 
         try:
-            _data = source.get_item(ref.strip()).dict()
+            _data = source.get_item(ref.strip(), True).dict()
             data = unpack_dataclasses(_data)
         except RuntimeError as exc:
             log.exception(
@@ -303,27 +307,71 @@ def browse_indexed_reference(request, dataset_id, ref):
 
 
 class IndexedDatasetCitationListView(ListView):
+    """Lists indexed refs in a dataset, latest first.
+
+    Pages are obtained using keyset pagination
+    (see :mod:`main.pagination`), so that browsing deep into
+    a large dataset doesn’t get slower with each page.
+    Page number pagination is still used if ``page`` GET parameter
+    is given, so that existing links keep working."""
+
     model = RefData
     paginate_by = 10
     template_name = 'browse/dataset.html'
 
+    cursor: Optional[str] = None
+    """Cursor obtained from ``cursor`` GET parameter,
+    or an empty string for the first page.
+    ``None`` if page number pagination is used."""
+
+    next_cursor: Optional[str] = None
+
     def get(self, request, *args, **kwargs):
         dataset_id = kwargs.get('dataset_id', None)
         if dataset_id not in settings.RELATON_DATASETS:
             raise Http404("No Relaton dataset with such ID")
 
+        if 'page' not in request.GET:
+            self.cursor = request.GET.get('cursor', '')
+
         return super().get(request, *args, **kwargs)
 
-    def get_queryset(self) -> QuerySet[RefData]:
-        return list_refs(self.kwargs['dataset_id'])
+    def get_paginate_by(self, queryset):
+        if self.cursor is not None:
+            return None
+        return super().get_paginate_by(queryset)
+
+    def get_queryset(self) -> Union[QuerySet[RefData], List[RefData]]:
+        refs = list_refs(self.kwargs['dataset_id'])
+
+        if self.cursor is None:
+            return refs
+
+        try:
+            after = decode_cursor(self.cursor) if self.cursor else None
+        except InvalidCursor:
+            messages.warning(
+                self.request,
+                "Requested page doesn’t exist in this source. "
+                "Showing first page instead.")
+            self.cursor, after = '', None
+
+        page = paginate_refs_by_cursor(refs, after, self.paginate_by)
+        self.next_cursor = page.next_cursor
+        return page.object_list
 
     def get_context_data(self, **kwargs):
         ctx = dict(
             **super().get_context_data(**kwargs),
             dataset_id=self.kwargs['dataset_id'],
+            cursor=self.cursor,
+            next_cursor=self.next_cursor,
             **shared_context,
         )
         for item in ctx['object_list']:
+            if item.is_valid is False:
+                # Known not to validate since indexing time
+                continue
             try:
                 item.bibitem = BibliographicItem(**item.body)
             except ValidationError:
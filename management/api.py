@@ -4,21 +4,37 @@ from django.http import JsonResponse
 
 from celery.result import AsyncResult
 
-from sources.tasks import fetch_and_index
+from sources.tasks import fetch_and_index, refresh_sources
 from sources.celery import app
 from sources.task_status import get_dataset_task_history, push_task
+from sources.task_status import RefreshRun
 from sources import indexable
 
 
 def run_indexer(request, dataset_name):
-    """Starts indexing for given dataset."""
+    """Starts indexing for given dataset.
 
-    # TODO: Quickly check sources for given dataset before queueing indexing
+    Unless specific refs or ``force`` are given, indexing is not queued
+    if source repositories didn’t change since dataset was last indexed
+    (see :func:`sources.indexable.check_upstream_changes`).
+    """
 
     refs_raw = request.POST.get('refs', None)
     refs = refs_raw.split(',') if refs_raw else None
+    force = request.POST.get('force', None) in ('1', 'true', 'yes')
 
-    result = fetch_and_index.delay(dataset_name, refs)
+    if all([
+        refs is None,
+        not force,
+        dataset_name in indexable.registry,
+    ]) and not indexable.check_upstream_changes([dataset_name])[dataset_name]:
+        return JsonResponse({
+            "message": "Sources for {} did not change "
+                       "since last indexed, indexing not queued".format(
+                           dataset_name),
+        })
+
+    result = fetch_and_index.delay(dataset_name, refs, force=force)
     task_id = result.id
 
     if (task_id):
@@ -31,6 +47,41 @@ def run_indexer(request, dataset_name):
     })
 
 
+def rebuild_index(request, dataset_name):
+    """Starts rebuilding index for given dataset from scratch,
+    keeping currently indexed data available until rebuild completes."""
+
+    try:
+        source = indexable.registry[dataset_name]
+    except KeyError:
+        return JsonResponse({
+            "error": {
+                "message": "Unknown dataset {}".format(dataset_name),
+            }
+        }, status=404)
+
+    if not source.rebuild_index:
+        return JsonResponse({
+            "error": {
+                "message":
+                    "Dataset {} does not support rebuilding index".
+                    format(dataset_name),
+            }
+        }, status=400)
+
+    result = fetch_and_index.delay(dataset_name, None, rebuild=True)
+    task_id = result.id
+
+    if (task_id):
+        push_task(dataset_name, task_id)
+
+    return JsonResponse({
+        "message": "Queued index rebuild for {} with task ID {}".format(
+            dataset_name,
+            task_id),
+    })
+
+
 def reset_index(request, dataset_name):
     """Clears index for dataset."""
 
@@ -57,6 +108,55 @@ def indexer_status(request, dataset_name):
     })
 
 
+def run_refresh(request):
+    """Starts refreshing given (by default, all) indexable sources,
+    a limited number at a time
+    (see :func:`sources.tasks.refresh_sources_task`)."""
+
+    dataset_ids_raw = request.POST.get('dataset_ids', None)
+    dataset_ids = dataset_ids_raw.split(',') if dataset_ids_raw else None
+
+    unknown = [
+        dataset_id
+        for dataset_id in (dataset_ids or [])
+        if dataset_id not in indexable.registry
+    ]
+    if unknown:
+        return JsonResponse({
+            "error": {
+                "message": "Unknown datasets {}".format(', '.join(unknown)),
+            }
+        }, status=404)
+
+    try:
+        concurrency_raw = request.POST.get('concurrency', None)
+        concurrency = int(concurrency_raw) if concurrency_raw else None
+    except ValueError:
+        return JsonResponse({
+            "error": {
+                "message": "Concurrency must be a number",
+            }
+        }, status=400)
+
+    result = refresh_sources.delay(
+        dataset_ids,
+        concurrency,
+        request.POST.get('force', None) in ('1', 'true', 'yes'))
+
+    return JsonResponse({
+        "message": "Queued refresh of {} with task ID {}".format(
+            ', '.join(dataset_ids) if dataset_ids else 'all datasets',
+            result.id),
+        "run_id": result.id,
+    })
+
+
+def refresh_status(request, run_id):
+    """Retrieves combined status of a refresh run."""
+
+    return JsonResponse(RefreshRun(run_id).describe())
+
+
 def stop_task(request, task_id):
     """Revokes and attempts to terminate a task given its ID."""
 
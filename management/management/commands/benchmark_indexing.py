@@ -0,0 +1,314 @@
+"""Measures indexing throughput against local source repositories,
+such as ones created by ``generate_synthetic_sources`` command.
+
+Each scenario runs in its own transaction that is rolled back
+once measurements are taken, so indexed data is left as it was.
+The xml2rfc scenario replaces all xml2rfc items, so it refuses to run
+against a database that has any (use a separate database).
+Note that this makes per-batch commits savepoint releases,
+so absolute numbers are somewhat optimistic
+compared to production runs; they are meant for comparing runs
+made the same way.
+"""
+
+import json
+import os
+import resource
+import shutil
+import time
+from os import path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from common.git import get_object_cache_path
+from sources import cache, indexable
+from main.models import RefData
+from main.sources import index_dataset, reset_index_for_dataset
+from main.sources import get_refs_for_changed_paths
+from xml2rfc_compat.models import Xml2rfcItem
+from xml2rfc_compat.source import index_xml2rfc_source
+
+
+BENCHMARK_DATASET_ID = 'benchmark'
+"""Dataset ID Relaton items are indexed under."""
+
+BENCHMARK_SOURCE_ID = 'benchmark-git'
+"""ID of the temporary indexable source
+used to measure :func:`sources.indexable.register_git_source` wrapper."""
+
+
+class StatementCounter:
+    """Counts executed SQL statements.
+    Meant to be used with ``connection.execute_wrapper()``.
+
+    Unlike :class:`common.query_profiler.QueryProfiler`,
+    doesn’t keep queries around, so that long runs don’t skew
+    memory measurements."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def reset_peak_rss():
+    """Resets peak RSS of current process, where supported (Linux),
+    so that scenarios are measured separately."""
+
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+    except OSError:
+        pass
+
+
+def get_peak_rss_kb() -> int:
+    """:returns: peak RSS of current process in KiB
+                 (since last :func:`reset_peak_rss()` where supported)"""
+
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def get_children_peak_rss_kb() -> int:
+    """:returns: largest peak RSS among finished child processes
+                 (e.g., parser workers) in KiB"""
+
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+
+def measure(
+    run: Callable[[], Tuple[int, int, Any]],
+) -> Dict[str, Any]:
+    """Runs given indexing function in a transaction that is rolled back,
+    and returns measurements."""
+
+    counter = StatementCounter()
+    reset_peak_rss()
+
+    with transaction.atomic():
+        with connection.execute_wrapper(counter):
+            started = time.monotonic()
+            found, indexed, stats = run()
+            elapsed = time.monotonic() - started
+        transaction.set_rollback(True)
+
+    return dict(
+        found=found,
+        indexed=indexed,
+        stats=stats,
+        seconds=round(elapsed, 3),
+        items_per_second=round(found / elapsed, 1) if elapsed else None,
+        peak_rss_kb=get_peak_rss_kb(),
+        children_peak_rss_kb=get_children_peak_rss_kb(),
+        sql_statements=counter.count,
+    )
+
+
+def get_benchmark_repo_url(repo_path: str) -> str:
+    return 'file://{}'.format(path.abspath(repo_path))
+
+
+def register_benchmark_source(repo_path: str, branch: str):
+    """Registers a Relaton source pointing to a local repository,
+    the same way :func:`main.sources.register_relaton_source()` does."""
+
+    indexable.register_git_source(
+        BENCHMARK_SOURCE_ID,
+        [(get_benchmark_repo_url(repo_path), branch)],
+    )({
+        'indexer': (
+            lambda dirs, refs, on_progress, on_error, checkpoint:
+            index_dataset(
+                BENCHMARK_SOURCE_ID,
+                path.join(dirs[0], 'data'),
+                refs,
+                on_progress,
+                on_error,
+                checkpoint,
+            )
+        ),
+        'reset_index': (
+            lambda: reset_index_for_dataset(BENCHMARK_SOURCE_ID)
+        ),
+        'count_indexed': (
+            lambda: RefData.objects.filter(
+                dataset=BENCHMARK_SOURCE_ID).count()
+        ),
+        'get_refs_for_paths': (lambda paths: get_refs_for_changed_paths(
+            paths[0],
+        )),
+    })
+
+
+def clear_benchmark_source_state(repo_path: str):
+    """Removes cloned repositories, Git object cache and cached state
+    of the benchmark source, so that each run starts from a fresh clone."""
+
+    for key in (
+        f'{BENCHMARK_SOURCE_ID}_latest_indexed_heads',
+        indexable.IndexingCheckpoint(
+            source_id=BENCHMARK_SOURCE_ID,
+            heads='',
+        ).key,
+    ):
+        cache.delete(key)
+    shutil.rmtree(
+        indexable._get_dataset_tmp_path(BENCHMARK_SOURCE_ID),
+        ignore_errors=True)
+
+    object_cache_path = get_object_cache_path(
+        get_benchmark_repo_url(repo_path))
+    shutil.rmtree(object_cache_path, ignore_errors=True)
+    try:
+        os.remove('{}.lock'.format(object_cache_path))
+    except FileNotFoundError:
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Times indexing of local source repositories "
+        "and writes results to a JSON file, "
+        "optionally comparing them to a previous run.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--relaton-repo',
+            help="Path to a Git repository with Relaton data "
+                 "(data/<ref>.yaml).")
+        parser.add_argument(
+            '--relaton-branch',
+            default='main',
+            help="Branch of Relaton repository to index "
+                 "via indexable source wrapper.")
+        parser.add_argument(
+            '--xml2rfc-repo',
+            help="Path to a directory with xml2rfc archive data.")
+        parser.add_argument(
+            '--output',
+            default='benchmark-results.json',
+            help="Path to write results to.")
+        parser.add_argument(
+            '--compare',
+            help="Path to results of a previous run to compare against.")
+
+    def handle(self, *args, **options):
+        if not options['relaton_repo'] and not options['xml2rfc_repo']:
+            raise CommandError(
+                "Specify --relaton-repo, --xml2rfc-repo, or both")
+
+        # Indexing xml2rfc source deletes and locks all existing items,
+        # which would block fallback requests while the scenario runs
+        if options['xml2rfc_repo'] and Xml2rfcItem.objects.exists():
+            raise CommandError(
+                "Database contains indexed xml2rfc items; "
+                "run xml2rfc scenario against a separate database")
+
+        scenarios: Dict[str, Dict[str, Any]] = {}
+
+        if options['relaton_repo']:
+            relaton_path = path.join(
+                path.abspath(options['relaton_repo']),
+                'data')
+
+            scenarios['index_dataset'] = self.run_scenario(
+                'index_dataset',
+                lambda: index_dataset(
+                    BENCHMARK_DATASET_ID,
+                    relaton_path,
+                    None,
+                    lambda total, indexed: None,
+                    lambda ref, err: None))
+
+            register_benchmark_source(
+                options['relaton_repo'],
+                options['relaton_branch'])
+            clear_benchmark_source_state(options['relaton_repo'])
+            try:
+                scenarios['register_git_source'] = self.run_scenario(
+                    'register_git_source',
+                    lambda: indexable.registry[BENCHMARK_SOURCE_ID].index(
+                        None,
+                        lambda action, total, indexed: None,
+                        None,
+                        False,
+                    ))
+            finally:
+                clear_benchmark_source_state(options['relaton_repo'])
+                indexable.registry.pop(BENCHMARK_SOURCE_ID, None)
+
+        if options['xml2rfc_repo']:
+            xml2rfc_path = path.abspath(options['xml2rfc_repo'])
+            scenarios['index_xml2rfc_source'] = self.run_scenario(
+                'index_xml2rfc_source',
+                lambda: index_xml2rfc_source(
+                    [xml2rfc_path],
+                    None,
+                    lambda total, indexed: None,
+                    lambda fpath, err: None))
+
+        results = dict(
+            timestamp=time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            relaton_repo=options['relaton_repo'],
+            xml2rfc_repo=options['xml2rfc_repo'],
+            scenarios=scenarios,
+        )
+        with open(options['output'], 'w') as out:
+            json.dump(results, out, indent=2)
+        self.stdout.write(self.style.SUCCESS(
+            "Results written to {}".format(options['output'])))
+
+        if options['compare']:
+            with open(options['compare'], 'r') as previous_file:
+                previous = json.load(previous_file)
+            self.compare(previous.get('scenarios', {}), scenarios)
+
+    def run_scenario(
+        self,
+        name: str,
+        run: Callable[[], Tuple[int, int, Any]],
+    ) -> Dict[str, Any]:
+        self.stdout.write("Running {}…".format(name))
+        result = measure(run)
+        self.stdout.write(
+            "  {found} items in {seconds}s ({items_per_second} items/s), "
+            "peak RSS {peak_rss_kb} KiB, "
+            "{sql_statements} SQL statements".format(**result))
+        return result
+
+    def compare(
+        self,
+        previous: Dict[str, Dict[str, Any]],
+        current: Dict[str, Dict[str, Any]],
+    ):
+        metrics: List[str] = [
+            'items_per_second',
+            'peak_rss_kb',
+            'sql_statements',
+        ]
+        for name, result in current.items():
+            before: Optional[Dict[str, Any]] = previous.get(name, None)
+            if not before:
+                self.stdout.write(
+                    "{}: no previous results to compare".format(name))
+                continue
+            self.stdout.write("{}:".format(name))
+            for metric in metrics:
+                old, new = before.get(metric), result.get(metric)
+                if not old or new is None:
+                    change = "n/a"
+                else:
+                    change = "{:+.1f}%".format((new - old) / old * 100)
+                self.stdout.write("  {}: {} → {} ({})".format(
+                    metric, old, new, change))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from management.snapshot import export_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Exports indexed data, along with latest indexed source heads, "
+        "into a snapshot file that can be loaded "
+        "with import_snapshot command.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help="Snapshot file to write (conventionally *.ndjson.gz).")
+
+    def handle(self, *args, **kwargs):
+        with open(kwargs['path'], 'wb') as out:
+            manifest = export_snapshot(out)
+
+        for table, count in manifest['counts'].items():
+            self.stdout.write("{}: {} rows".format(table, count))
+        self.stdout.write(self.style.SUCCESS(
+            "Exported snapshot with heads of {} sources to {}".format(
+                len(manifest['heads']),
+                kwargs['path'])))
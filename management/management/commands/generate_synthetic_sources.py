@@ -0,0 +1,278 @@
+"""Generates synthetic indexable source repositories,
+for measuring indexing performance
+without cloning real source repositories
+(see also ``benchmark_indexing`` command).
+
+Relaton sources follow the layout expected by
+:func:`main.sources.index_dataset()`
+(``data/<ref>.yaml``), xml2rfc sources follow the layout expected by
+:func:`xml2rfc_compat.source.index_xml2rfc_source()`
+(``<dirname>/reference.<anchor>.xml``).
+"""
+
+import random
+from dataclasses import dataclass
+from os import makedirs, path, listdir
+from typing import Any, Dict, List
+
+import yaml
+try:
+    from yaml import CSafeDumper as _YAMLDumper
+except ImportError:
+    from yaml import SafeDumper as _YAMLDumper  # type: ignore
+from git import Repo
+from django.core.management.base import BaseCommand, CommandError
+
+from bib_models import BibliographicItem
+from xml2rfc_compat.serializer import to_xml_string
+
+
+WORDS = (
+    "protocol network transport congestion control security datagram "
+    "stream routing address extension framework architecture message "
+    "header session identifier registry encoding authentication key "
+    "exchange multicast interface management domain name service "
+    "resource record path discovery tunnel label switching media "
+    "signaling negotiation capability profile considerations update"
+).split()
+
+
+@dataclass
+class ItemShape:
+    """Determines the size of generated bibliographic items."""
+
+    contributors: int
+    """Maximum number of person contributors per item."""
+
+    extra_docids: int
+    """Number of document identifiers per item,
+    besides primary and anchor ones."""
+
+    abstract_words: int
+    """Number of words in abstract."""
+
+    keywords: int
+    """Number of keywords per item."""
+
+
+def make_words(rng: random.Random, count: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(count))
+
+
+def make_item(
+    rng: random.Random,
+    num: int,
+    shape: ItemShape,
+    revision: int = 0,
+) -> Dict[str, Any]:
+    """Returns Relaton data of a synthetic bibliographic item
+    with given number. Different revisions of the same item
+    share identifiers, but not the rest of data."""
+
+    year = 1990 + num % 33
+    title = make_words(rng, rng.randint(3, 12)).capitalize()
+    if revision:
+        title = f"{title} (revision {revision})"
+
+    return {
+        'id': f'SYN{num}',
+        'docnumber': f'SYN{num}',
+        'type': 'standard',
+        'language': ['en'],
+        'script': ['Latn'],
+        'docid': [
+            {'id': f'SYN {num}', 'type': 'SYN', 'primary': True},
+            {'id': f'SYN{num}', 'type': 'SYN', 'scope': 'anchor'},
+            *[
+                {'id': f'10.0000/SYN{num}.{idx}', 'type': 'DOI'}
+                for idx in range(shape.extra_docids)
+            ],
+        ],
+        'title': [{
+            'type': 'main',
+            'format': 'text/plain',
+            'content': title,
+        }],
+        'date': [{
+            'type': 'published',
+            'value': f'{year}-{num % 12 + 1:02d}',
+        }],
+        'link': [{
+            'type': 'src',
+            'content': f'https://example.com/syn/{num}',
+        }],
+        'contributor': [
+            {
+                'role': ['author'],
+                'person': {
+                    'name': {
+                        'completename': {
+                            'content': make_words(rng, 2).title(),
+                            'language': ['en'],
+                        },
+                    },
+                },
+            }
+            for _ in range(rng.randint(1, max(1, shape.contributors)))
+        ] + [{
+            'role': ['publisher'],
+            'organization': {
+                'name': 'Synthetic Standards Organization',
+            },
+        }],
+        'abstract': [{
+            'format': 'text/plain',
+            'content': make_words(rng, shape.abstract_words).capitalize(),
+        }],
+        'keyword': [make_words(rng, 2) for _ in range(shape.keywords)],
+        'series': [{
+            'title': {'format': 'text/plain', 'content': 'SYN'},
+            'number': str(num),
+        }],
+    }
+
+
+def get_item_path(kind: str, root: str, num: int, dirnames: List[str]) -> str:
+    if kind == 'relaton':
+        return path.join(root, 'data', f'SYN.{num}.yaml')
+    else:
+        dirname = dirnames[num % len(dirnames)]
+        return path.join(root, dirname, f'reference.SYN.{num}.xml')
+
+
+def write_item(fpath: str, item: Dict[str, Any]):
+    if fpath.endswith('.yaml'):
+        data = yaml.dump(
+            item,
+            Dumper=_YAMLDumper,
+            allow_unicode=True,
+            sort_keys=False)
+    else:
+        data = to_xml_string(BibliographicItem(**item)).decode('utf-8')
+
+    with open(fpath, 'w') as fhandler:
+        fhandler.write(data)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates a Git repository with synthetic source data "
+        "for indexing benchmarks. If the repository exists, "
+        "rewrites a fraction of its items and commits the change instead.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output_dir',
+            help="Repository path. Created if it doesn’t exist.")
+        parser.add_argument(
+            '--kind',
+            choices=['relaton', 'xml2rfc'],
+            default='relaton',
+            help="Source layout to generate.")
+        parser.add_argument(
+            '--items',
+            type=int,
+            default=1000,
+            help="Number of items to generate.")
+        parser.add_argument(
+            '--contributors',
+            type=int,
+            default=4,
+            help="Maximum number of authors per item.")
+        parser.add_argument(
+            '--extra-docids',
+            type=int,
+            default=1,
+            help="Number of extra document identifiers per item.")
+        parser.add_argument(
+            '--abstract-words',
+            type=int,
+            default=150,
+            help="Number of words in item abstract.")
+        parser.add_argument(
+            '--keywords',
+            type=int,
+            default=3,
+            help="Number of keywords per item.")
+        parser.add_argument(
+            '--xml2rfc-dirs',
+            default='bibxml,bibxml2,bibxml3',
+            help="Comma-separated directory names "
+                 "to spread xml2rfc items across.")
+        parser.add_argument(
+            '--change-fraction',
+            type=float,
+            default=0.01,
+            help="Fraction of items to rewrite in an existing repository.")
+        parser.add_argument(
+            '--branch',
+            default='main',
+            help="Branch to commit to.")
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help="Random seed, so that runs are reproducible.")
+
+    def handle(self, *args, **options):
+        root = path.abspath(options['output_dir'])
+        kind = options['kind']
+        rng = random.Random(options['seed'])
+        dirnames = options['xml2rfc_dirs'].split(',')
+        shape = ItemShape(
+            contributors=options['contributors'],
+            extra_docids=options['extra_docids'],
+            abstract_words=options['abstract_words'],
+            keywords=options['keywords'],
+        )
+
+        if path.isdir(path.join(root, '.git')):
+            repo = Repo(root)
+            nums = self.list_item_numbers(root)
+            if not nums:
+                raise CommandError("Repository contains no synthetic items")
+            revision = len(list(repo.iter_commits())) + 1
+            nums = rng.sample(
+                nums,
+                max(1, int(len(nums) * options['change_fraction'])))
+            message = f"Rewrite {len(nums)} items (revision {revision})"
+        else:
+            makedirs(root, exist_ok=True)
+            repo = Repo.init(root)
+            repo.git.checkout('-b', options['branch'])
+            repo.config_writer().set_value("user", "name", "ci").release()
+            repo.config_writer().set_value(
+                "user", "email", "ci@local").release()
+            revision = 0
+            nums = list(range(1, options['items'] + 1))
+            message = f"Generate {len(nums)} {kind} items"
+
+        for dirname in (['data'] if kind == 'relaton' else dirnames):
+            makedirs(path.join(root, dirname), exist_ok=True)
+
+        for idx, num in enumerate(nums):
+            write_item(
+                get_item_path(kind, root, num, dirnames),
+                make_item(rng, num, shape, revision))
+            if (idx + 1) % 1000 == 0:
+                self.stdout.write(f"Written {idx + 1} of {len(nums)} items")
+
+        repo.git.add('--all')
+        repo.git.commit('--quiet', '-m', message)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{message} in {root} "
+            f"(head {repo.head.commit.hexsha})"))
+
+    def list_item_numbers(self, root: str) -> List[int]:
+        nums: List[int] = []
+        for dirname in listdir(root):
+            if dirname.startswith('.') or not path.isdir(
+                    path.join(root, dirname)):
+                continue
+            for fname in listdir(path.join(root, dirname)):
+                # SYN.<num>.yaml or reference.SYN.<num>.xml
+                parts = fname.split('.')
+                if len(parts) >= 3 and parts[-3] == 'SYN':
+                    nums.append(int(parts[-2]))
+        return sorted(nums)
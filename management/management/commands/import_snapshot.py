@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from management.snapshot import import_snapshot, SnapshotError
+
+
+class Command(BaseCommand):
+    help = (
+        "Loads indexed data from a snapshot file "
+        "made by export_snapshot command.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help="Snapshot file to load.")
+        parser.add_argument(
+            '--replace',
+            action='store_true',
+            help="Replace currently indexed data, if any.")
+
+    def handle(self, *args, **kwargs):
+        try:
+            with open(kwargs['path'], 'rb') as snapshot:
+                manifest = import_snapshot(
+                    snapshot,
+                    replace=kwargs['replace'],
+                    on_table=lambda table, count: self.stdout.write(
+                        "Loading {} rows into {}".format(count, table)))
+        except SnapshotError as err:
+            raise CommandError(str(err))
+
+        self.stdout.write(self.style.SUCCESS(
+            "Imported snapshot created at {}; "
+            "next indexing runs continue from heads of {} sources".format(
+                manifest['created_at'],
+                len(manifest['heads']))))
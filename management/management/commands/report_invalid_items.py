@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+
+from main.models import RefData
+
+
+class Command(BaseCommand):
+    help = (
+        "Reports indexed items that didn’t validate at indexing time, "
+        "per dataset.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'dataset_ids',
+            nargs='*',
+            help="Datasets to report on (all by default).")
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help="List invalid refs along with their first validation error.")
+
+    def handle(self, *args, **kwargs):
+        refs = RefData.objects.all()
+        if kwargs['dataset_ids']:
+            refs = refs.filter(dataset__in=kwargs['dataset_ids'])
+
+        counts = (
+            refs.
+            values('dataset').
+            annotate(
+                total=Count('pk'),
+                invalid=Count('pk', filter=Q(is_valid=False)),
+                unvalidated=Count('pk', filter=Q(is_valid__isnull=True)),
+            ).
+            order_by('dataset'))
+
+        for row in counts:
+            self.stdout.write(
+                "{dataset}: {invalid} of {total} items invalid, "
+                "{unvalidated} not validated".format(**row))
+
+            if kwargs['list'] and row['invalid'] > 0:
+                invalid_refs = (
+                    refs.
+                    filter(dataset=row['dataset'], is_valid=False).
+                    order_by('ref').
+                    values_list('ref', 'validation_errors'))
+                for ref, errors in invalid_refs.iterator():
+                    first_error = (errors or ["no details"])[0]
+                    self.stdout.write("  {}: {}".format(
+                        ref,
+                        ' '.join(first_error.split())))
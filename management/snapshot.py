@@ -0,0 +1,362 @@
+"""Export and import of indexed data as a portable snapshot,
+so that a new environment can be brought up
+without cloning and indexing every source.
+
+A snapshot is a gzip-compressed NDJSON file:
+
+- The first line is a manifest (see :class:`.SnapshotManifest`).
+- Each table starts with a header line, an object
+  with ``table`` and ``columns`` keys.
+- Each row follows as an array of column values, in header order.
+  Dates are ISO strings, binary values are base64 strings,
+  JSON values are kept as is.
+
+Derived data that is cheap to recompute
+(:attr:`main.models.RefData.search_vector`) is not included.
+"""
+
+import base64
+import gzip
+import json
+from typing import Any, Callable, Dict, IO, Iterator, List, Optional, Type
+from typing import TypedDict
+
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+from django.db.migrations.recorder import MigrationRecorder
+from django.utils import timezone
+
+from main.models import DatasetGeneration, RefData, RefDocID, Work
+from main.models import SEARCH_VECTOR_SQL
+from sources import cache, indexable
+from xml2rfc_compat.models import Xml2rfcItem, ManualPathMap
+
+
+FORMAT_ID = 'bibxml-service-snapshot'
+
+FORMAT_VERSION = 1
+"""Incremented whenever snapshot layout changes incompatibly."""
+
+MODELS: List[Type[models.Model]] = [
+    DatasetGeneration,
+    Work,
+    RefData,
+    RefDocID,
+    Xml2rfcItem,
+    ManualPathMap,
+]
+"""Models included in snapshots, in import order."""
+
+EXCLUDED_COLUMNS = {'search_vector'}
+
+MIGRATION_APPS = ('main', 'xml2rfc_compat')
+"""Apps whose latest applied migrations must match between
+exporting and importing environments."""
+
+
+class SnapshotManifest(TypedDict):
+    """First line of a snapshot file."""
+
+    format: str
+    """Always :data:`.FORMAT_ID`."""
+
+    version: int
+    """:data:`.FORMAT_VERSION` of the exporting service."""
+
+    created_at: str
+    """ISO timestamp."""
+
+    migrations: Dict[str, str]
+    """Latest applied migration per app in :data:`.MIGRATION_APPS`."""
+
+    heads: Dict[str, str]
+    """Latest indexed head commits per indexable source,
+    as stored by :func:`sources.indexable.register_git_source`."""
+
+    counts: Dict[str, int]
+    """Number of rows per table."""
+
+
+class SnapshotError(ValueError):
+    """Snapshot cannot be imported into this environment."""
+    pass
+
+
+def get_columns(model: Type[models.Model]) -> List[models.Field]:
+    return [
+        field
+        for field in model._meta.concrete_fields
+        if field.column not in EXCLUDED_COLUMNS
+    ]
+
+
+def get_latest_migrations() -> Dict[str, str]:
+    migrations: Dict[str, str] = {}
+    for app, name in MigrationRecorder.Migration.objects.filter(
+        app__in=MIGRATION_APPS,
+    ).order_by('app', 'name').values_list('app', 'name'):
+        migrations[app] = name
+    return migrations
+
+
+def get_heads_key(source_id: str) -> str:
+    return f'{source_id}_latest_indexed_heads'
+
+
+def export_snapshot(out: IO[bytes]) -> SnapshotManifest:
+    """Writes indexed data to given binary file object.
+
+    Data is read within a single repeatable read transaction,
+    so that the snapshot is consistent even if indexing is running.
+
+    Latest indexed heads are not part of that transaction,
+    so they are read before it starts. Indexing runs record heads
+    only after their data is committed, so recorded heads are never
+    newer than snapshot data: at worst, the importing environment
+    reindexes some items it already has, but never misses changes.
+    """
+
+    heads: Dict[str, str] = {
+        source_id: heads
+        for source_id, heads in (
+            (source_id, cache.get(get_heads_key(source_id)))
+            for source_id in indexable.registry.keys()
+        )
+        if heads
+    }
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY')
+
+        manifest: SnapshotManifest = dict(
+            format=FORMAT_ID,
+            version=FORMAT_VERSION,
+            created_at=timezone.now().isoformat(),
+            migrations=get_latest_migrations(),
+            heads=heads,
+            counts={
+                model._meta.db_table: model._base_manager.count()
+                for model in MODELS
+            },
+        )
+
+        with gzip.open(out, 'wt', encoding='utf-8') as stream:
+            stream.write(json.dumps(manifest) + '\n')
+            for model in MODELS:
+                fields = get_columns(model)
+                stream.write(json.dumps(dict(
+                    table=model._meta.db_table,
+                    columns=[field.column for field in fields],
+                )) + '\n')
+                encoders = [get_encoder(field) for field in fields]
+                rows = (
+                    model._base_manager.
+                    order_by('pk').
+                    values_list(*[field.attname for field in fields]).
+                    iterator(chunk_size=2000))
+                for row in rows:
+                    stream.write(json.dumps([
+                        encode(value)
+                        for encode, value in zip(encoders, row)
+                    ], ensure_ascii=False) + '\n')
+
+    return manifest
+
+
+def read_manifest(snapshot: IO[bytes]) -> SnapshotManifest:
+    """Reads manifest from the beginning of given snapshot file object."""
+
+    with gzip.open(snapshot, 'rt', encoding='utf-8') as stream:
+        return json.loads(stream.readline())
+
+
+def import_snapshot(
+    snapshot: IO[bytes],
+    replace: bool = False,
+    on_table: Optional[Callable[[str, int], None]] = None,
+) -> SnapshotManifest:
+    """Loads indexed data from given snapshot file object
+    using ``COPY``, in a single transaction.
+
+    Recorded head commits are stored as latest indexed heads,
+    so that subsequent indexing runs only pick up later changes.
+
+    :param replace: wipe existing indexed data first;
+                    if not given, tables must be empty
+    :param on_table: called with table name and expected row count
+                     before each table is loaded
+    :raises SnapshotError: snapshot is incompatible with this environment,
+                           or tables are not empty and ``replace``
+                           was not given
+    """
+
+    with gzip.open(snapshot, 'rt', encoding='utf-8') as stream:
+        manifest: SnapshotManifest = json.loads(stream.readline())
+        validate_manifest(manifest)
+
+        tables = {model._meta.db_table: model for model in MODELS}
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            if replace:
+                cursor.execute('TRUNCATE {} CASCADE'.format(', '.join(
+                    connection.ops.quote_name(table)
+                    for table in tables.keys()
+                )))
+            elif any(model._base_manager.exists() for model in MODELS):
+                raise SnapshotError(
+                    "Indexed data exists, refusing to import "
+                    "without replacing it")
+
+            lines = iter(stream)
+            header_line: Optional[str] = next(lines, None)
+            while header_line:
+                header = json.loads(header_line)
+                model = tables.get(header['table'], None)
+                if model is None:
+                    raise SnapshotError(
+                        "Unknown table {}".format(header['table']))
+                fields_by_column = {
+                    field.column: field
+                    for field in get_columns(model)
+                }
+                fields = [
+                    fields_by_column[column]
+                    for column in header['columns']
+                ]
+
+                if on_table:
+                    on_table(
+                        header['table'],
+                        manifest['counts'].get(header['table'], 0))
+
+                rows = CopyStream(lines, [get_copy_encoder(f) for f in fields])
+                cursor.copy_expert(
+                    'COPY {} ({}) FROM STDIN'.format(
+                        connection.ops.quote_name(header['table']),
+                        ', '.join(
+                            connection.ops.quote_name(column)
+                            for column in header['columns'])),
+                    rows)
+                header_line = rows.next_header
+
+            for sql in connection.ops.sequence_reset_sql(
+                    no_style(), MODELS):
+                cursor.execute(sql)
+
+            cursor.execute(
+                'UPDATE {} SET search_vector = {}'.format(
+                    RefData._meta.db_table,
+                    SEARCH_VECTOR_SQL))
+
+    for source_id, heads in manifest['heads'].items():
+        cache.set(get_heads_key(source_id), heads)
+
+    return manifest
+
+
+def validate_manifest(manifest: SnapshotManifest):
+    if manifest.get('format') != FORMAT_ID:
+        raise SnapshotError("Not a snapshot file")
+    if manifest.get('version') != FORMAT_VERSION:
+        raise SnapshotError(
+            "Snapshot format version {} is not supported "
+            "(expected {})".format(manifest.get('version'), FORMAT_VERSION))
+    migrations = get_latest_migrations()
+    if manifest.get('migrations') != migrations:
+        raise SnapshotError(
+            "Snapshot was made with different migrations applied "
+            "({}, here: {})".format(manifest.get('migrations'), migrations))
+
+
+class CopyStream:
+    """File-like object that converts snapshot rows
+    into ``COPY`` text format for ``copy_expert()``,
+    consuming lines until the next table header.
+
+    The header line that ended the stream is kept
+    in :attr:`next_header`.
+    """
+
+    def __init__(
+        self,
+        lines: Iterator[str],
+        encoders: List[Callable[[Any], str]],
+    ):
+        self.lines = lines
+        self.encoders = encoders
+        self.buffer = ''
+        self.next_header: Optional[str] = None
+        self.exhausted = False
+
+    def read(self, size: int = -1) -> str:
+        while not self.exhausted and (size < 0 or len(self.buffer) < size):
+            line = next(self.lines, None)
+            if line is None or line.startswith('{'):
+                self.next_header = line
+                self.exhausted = True
+                break
+            self.buffer += '\t'.join(
+                encode(value)
+                for encode, value in zip(self.encoders, json.loads(line))
+            ) + '\n'
+
+        if size < 0:
+            chunk, self.buffer = self.buffer, ''
+        else:
+            chunk, self.buffer = self.buffer[:size], self.buffer[size:]
+        return chunk
+
+    def readline(self, size: int = -1) -> str:
+        return self.read(size)
+
+
+def get_encoder(field: models.Field) -> Callable[[Any], Any]:
+    """Returns a function that converts field value
+    into a JSON-serializable value."""
+
+    if isinstance(field, models.BinaryField):
+        return lambda value: (
+            base64.b64encode(bytes(value)).decode('ascii')
+            if value is not None
+            else None)
+    if isinstance(field, (models.DateField, models.DateTimeField)):
+        return lambda value: value.isoformat() if value is not None else None
+    return lambda value: value
+
+
+def get_copy_encoder(field: models.Field) -> Callable[[Any], str]:
+    """Returns a function that converts snapshot value
+    into ``COPY`` text format."""
+
+    if isinstance(field, models.BinaryField):
+        def encode_binary(value: Any) -> str:
+            return '\\\\x{}'.format(base64.b64decode(value).hex())
+        encode: Callable[[Any], str] = encode_binary
+    elif isinstance(field, models.JSONField):
+        def encode_json(value: Any) -> str:
+            return _escape_copy_text(json.dumps(value, ensure_ascii=False))
+        encode = encode_json
+    elif isinstance(field, models.BooleanField):
+        def encode_bool(value: Any) -> str:
+            return 't' if value else 'f'
+        encode = encode_bool
+    else:
+        def encode_text(value: Any) -> str:
+            return _escape_copy_text(str(value))
+        encode = encode_text
+
+    def encode_nullable(value: Any) -> str:
+        return '\\N' if value is None else encode(value)
+
+    return encode_nullable
+
+
+def _escape_copy_text(value: str) -> str:
+    return (
+        value.
+        replace('\\', '\\\\').
+        replace('\t', '\\t').
+        replace('\n', '\\n').
+        replace('\r', '\\r'))
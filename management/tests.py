@@ -1,11 +1,17 @@
 import datetime
+import io
+from unittest import mock
 
-from django.test import TestCase, Client
+from django.test import SimpleTestCase, TestCase, Client
 from django.db.utils import IntegrityError
 from django.conf import settings
 from django.urls import reverse
 
 from main.models import RefData
+from sources.tasks import dispatch_next, fetch_and_index_task
+from sources.tasks import order_by_priority
+from management.snapshot import CopyStream, get_columns, get_copy_encoder
+from management.snapshot import export_snapshot
 
 
 class RefDataModelTests(TestCase):
@@ -59,6 +65,67 @@ class IndexerTest(TestCase):
         """
         pass
 
+    @mock.patch("management.api.fetch_and_index")
+    @mock.patch("sources.indexable.cache")
+    @mock.patch("sources.indexable.get_remote_head")
+    def test_run_indexer_skips_unchanged_sources(
+        self,
+        get_remote_head,
+        cache,
+        fetch_and_index,
+    ):
+        cache.get.return_value = "abc"
+        get_remote_head.return_value = "abc"
+        fetch_and_index.delay.return_value.id = None
+        url = reverse("api_run_indexer", args=[self.real_dataset])
+
+        self.client.post(url, **self.auth)
+        fetch_and_index.delay.assert_not_called()
+
+        self.client.post(url, {"force": "true"}, **self.auth)
+        fetch_and_index.delay.assert_called_once_with(
+            self.real_dataset, None, force=True)
+
+    def test_run_refresh_rejects_unknown_datasets(self):
+        url = reverse("api_run_refresh")
+        response = self.client.post(
+            url,
+            {"dataset_ids": "{},nonexistent".format(self.real_dataset)},
+            **self.auth)
+        self.assertEqual(response.status_code, 404)
+
+    def test_refresh_order_puts_authoritative_datasets_first(self):
+        self.assertEqual(
+            order_by_priority(["w3c", "ids", "ieee", "rfcs"]),
+            ["ids", "rfcs", "w3c", "ieee"])
+
+    @mock.patch("sources.tasks.push_task")
+    @mock.patch("sources.tasks.fetch_and_index")
+    def test_forced_refresh_forces_indexing(self, fetch_and_index, push_task):
+        run = mock.Mock(run_id="run", force=True)
+        run.pop_pending.return_value = "rfcs"
+
+        dispatch_next(run)
+        fetch_and_index.si.assert_called_once_with("rfcs", force=True)
+
+    @mock.patch("sources.tasks.registry")
+    def test_last_progress_update_is_reported(self, registry):
+        def index(refs, on_progress, on_item_error, force):
+            on_progress("indexing", 10, 1)
+            # Coalesced with the previous update
+            on_progress("indexing", 10, 2)
+            return 10, 2, {}
+
+        registry.__getitem__.return_value = mock.Mock(
+            sharding=None,
+            index=index)
+        task = mock.Mock()
+
+        fetch_and_index_task(task, "rfcs")
+        self.assertEqual(
+            task.update_state.call_args.kwargs["meta"]["progress"]["current"],
+            2)
+
     # NOTE: To test index process abortion, we need to test new stop_task() API;
     # but let’s be mindful about not testing Celery itself and perhaps mock things instead.
     # def test_stop_indexer(self):
@@ -80,3 +147,59 @@ class IndexerTest(TestCase):
         response = self.client.post(url, **self.auth)
         self.assertEqual(response.status_code, 200)
         self.assertTrue(RefData.objects.count() == 0)
+
+
+class SnapshotCopyStreamTests(SimpleTestCase):
+    def test_rows_are_converted_until_next_table(self):
+        fields = [
+            field
+            for field in get_columns(RefData)
+            if field.column in ('ref', 'body', 'is_valid', 'latest_date')
+        ]
+        lines = iter([
+            '["ref\\t1", {"title": "A\\nB"}, "2021-02-01", true]\n',
+            '["ref2", {}, "2021-02-01", null]\n',
+            '{"table": "next_table", "columns": []}\n',
+        ])
+
+        stream = CopyStream(lines, [get_copy_encoder(f) for f in fields])
+
+        self.assertEqual(
+            [field.column for field in fields],
+            ['ref', 'body', 'latest_date', 'is_valid'])
+        self.assertEqual(stream.read(), (
+            'ref\\t1\t{"title": "A\\\\nB"}\t2021-02-01\tt\n'
+            'ref2\t{}\t2021-02-01\t\\N\n'
+        ))
+        self.assertEqual(stream.read(), '')
+        self.assertEqual(
+            stream.next_header,
+            '{"table": "next_table", "columns": []}\n')
+
+
+class SnapshotExportTests(SimpleTestCase):
+    @mock.patch.dict(
+        "sources.indexable.registry",
+        {"rfcs": mock.Mock()},
+        clear=True)
+    def test_heads_are_read_before_data(self):
+        calls = []
+
+        def get_heads(key):
+            calls.append("heads")
+            return "abc"
+
+        def start_transaction():
+            calls.append("transaction")
+            raise RuntimeError("Stop before reading data")
+
+        with mock.patch(
+            "management.snapshot.cache.get",
+            side_effect=get_heads,
+        ), mock.patch(
+            "management.snapshot.transaction.atomic",
+            side_effect=start_transaction,
+        ), self.assertRaises(RuntimeError):
+            export_snapshot(io.BytesIO())
+
+        self.assertEqual(calls, ["heads", "transaction"])
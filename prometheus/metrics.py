@@ -6,7 +6,7 @@ rather than in corresponding modules.
 # Empty docstrings are workarounds
 # to include these self-explanatory metrics in Sphinx autodoc.
 
-from prometheus_client import Counter
+from prometheus_client import Counter, Gauge, Histogram
 
 
 _prefix_ = 'bibxml_service_'
@@ -63,3 +63,33 @@ xml2rfc_api_bibitem_hits = Counter(
     # outcome should be either success, fallback or not_found
 )
 """"""
+
+
+indexing_duration = Histogram(
+    f'{_prefix_}indexing_duration_seconds',
+    "Duration of indexing tasks",
+    ['dataset_id', 'outcome'],
+    # outcome should be success, failure or dispatched
+    # (the latter for tasks that split work into shards)
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200),
+)
+""""""
+
+
+indexing_items_per_second = Gauge(
+    f'{_prefix_}indexing_items_per_second',
+    "Throughput of latest indexing action",
+    ['dataset_id'],
+    # Shards of a source can be indexed by several worker processes
+    # at once (see sources.celery), and their throughput adds up
+    multiprocess_mode='livesum',
+)
+""""""
+
+
+indexing_item_errors = Counter(
+    f'{_prefix_}indexing_item_errors_total',
+    "Items that failed to index",
+    ['dataset_id'],
+)
+""""""
@@ -3,15 +3,18 @@ this module provides an API for adding tasks to the queue.
 
 When run as Celery worker, this module sets up
 Celery to discover Django settings and task queue,
-and a signal listener that runs a simple HTTP server in a thread
-to export Celery-level Prometheus metrics.
+and signal listeners that run a simple HTTP server in a thread
+to export Celery-level Prometheus metrics
+(see :func:`.start_prometheus_exporter`).
 """
 
 from __future__ import absolute_import
 
 import os
 from celery import Celery
-from celery.signals import worker_process_init
+from celery.signals import celeryd_init, worker_process_init
+from celery.signals import worker_process_shutdown
+from prometheus_client import CollectorRegistry, multiprocess
 from prometheus_client import start_http_server
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bibxml.settings')
@@ -22,33 +25,58 @@ app.conf.task_track_started = True
 app.autodiscover_tasks()
 
 
-@worker_process_init.connect
-def start_prometheus_exporter(*args, **kwargs):
-    """Starts Prometheus exporter when worker process initializes.
+EXPORTER_PORT = 9080
+"""Port Prometheus metrics of Celery worker are exported on."""
 
-    .. important::
 
-       **No accommodations are made for multiprocessing mode.**
+def is_multiprocess_export() -> bool:
+    """Whether metrics are recorded in prometheus_client multiprocess mode,
+    which is enabled by ``PROMETHEUS_MULTIPROC_DIR`` environment variable
+    set (to an existing, empty directory) before the worker starts."""
+
+    return bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+
+@celeryd_init.connect
+def start_prometheus_exporter(*args, **kwargs):
+    """Starts Prometheus exporter in worker’s main process,
+    if metrics are recorded in multiprocess mode
+    (see :func:`.is_multiprocess_export`).
+
+    Metrics are recorded by prefork pool processes that run tasks,
+    and each of them writes its values into the shared directory.
+    The exporter aggregates values from all of them,
+    so any worker concurrency can be used.
 
-       Prometheus support for multi-process export is finicky,
-       not so great, and not enabled.
+    See :doc:`/howto/run-in-production` for more regarding production setup.
+    """
+    if is_multiprocess_export():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        start_http_server(EXPORTER_PORT, registry=registry)
 
-       This handler should break your setup if you run more than
-       one worker process
-       (since the first process should occupy the port below),
-       and this is left intentional.
 
-       Key takeaway is:
+@worker_process_init.connect
+def start_single_process_prometheus_exporter(*args, **kwargs):
+    """Starts Prometheus exporter when worker process initializes,
+    if multiprocess mode is not enabled.
 
-       - Don’t run Celery in default worker mode (prefork)
-         with more than one worker.
-         It’ll be a problem for other reasons than Prometheus export,
-         unless tasks are properly parallelized.
-       - Once parallelized into smaller I/O bound tasks,
-         switch to eventlet/gevent pooling,
-         and use the appropriate signal (possibly ``celeryd_init``)
-         for Prometheus exporter service startup.
+    .. important::
 
-       See :doc:`/howto/run-in-production` for more regarding production setup.
+       Only metrics of the pool process that occupies the port
+       are exported this way (others fail to bind it),
+       so this only works with worker concurrency of 1.
+       Enable multiprocess mode for higher concurrency
+       (see :func:`.start_prometheus_exporter`).
     """
-    start_http_server(9080)
+    if not is_multiprocess_export():
+        start_http_server(EXPORTER_PORT)
+
+
+@worker_process_shutdown.connect
+def mark_prometheus_process_dead(pid=None, *args, **kwargs):
+    """Lets multiprocess collector discard live gauge values
+    of a pool process that exited."""
+
+    if is_multiprocess_export():
+        multiprocess.mark_process_dead(pid or os.getpid())
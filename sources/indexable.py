@@ -7,21 +7,36 @@ and don’t necessarily need to contain bibliographic data.
 """
 import functools
 import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Callable, Union, List, Tuple, Dict, TypedDict
+from typing import Callable, Union, List, Tuple, Dict, TypedDict, Optional
 from os import path, makedirs
 
 from celery.utils.log import get_task_logger
 from django.conf import settings
+from git import Repo
+from redis.exceptions import LockError
+from redis.lock import Lock
 
-from common.git import ensure_latest
+from common.git import ensure_latest, ensure_commit
+from common.git import get_changed_paths, get_remote_head
 
 from . import cache
 
 
 __all__ = (
     'register_git_source',
+    'check_upstream_changes',
     'IndexableSourceToRegister',
+    'IndexingStats',
+    'IndexingCheckpoint',
+    'IndexingPlan',
+    'ShardedIndexing',
+    'SourceLocked',
+    'acquire_indexing_lock',
+    'refresh_indexing_lock',
+    'release_indexing_lock',
     'context_processor',
     'get_work_dir_path',
     'registry',
@@ -35,6 +50,241 @@ Log events are expected only when ran in Celery context.
 """
 
 
+LOCK_SECONDS: int = getattr(settings, 'INDEXING_LOCK_SECONDS', 6 * 3600)
+"""How long an indexing lock is held unless released or refreshed.
+See :data:`bibxml.settings.INDEXING_LOCK_SECONDS`."""
+
+
+class SourceLocked(RuntimeError):
+    """Another indexing run of the same source is in progress,
+    or the run that acquired the lock no longer holds it."""
+    pass
+
+
+class IndexingStats(TypedDict, total=False):
+    """Describes changes made to the index during an indexing run.
+    Indexers may omit counts they don’t track."""
+
+    inserted: int
+    """Items that were not indexed before."""
+
+    updated: int
+    """Previously indexed items whose source data changed."""
+
+    unchanged: int
+    """Previously indexed items skipped because source data didn’t change."""
+
+    deleted: int
+    """Previously indexed items removed because they are gone from source."""
+
+
+class IndexingPlan(TypedDict):
+    """Describes an indexing run whose work is split into shards
+    (see :class:`ShardedIndexing`).
+    Must remain JSON-serializable, since it is passed between tasks."""
+
+    refs: List[str]
+    """References to index."""
+
+    full: bool
+    """Whether the entire source is being indexed,
+    in which case items not found in source are deleted
+    when finalizing the run."""
+
+    heads: str
+    """Serialized head commits of source repositories being indexed.
+    Shards check these out before indexing,
+    so that every shard indexes the same content."""
+
+    lock_token: str
+    """Token of the indexing lock acquired for this run,
+    held until the run is finalized or aborted."""
+
+
+@dataclass
+class IndexingCheckpoint:
+    """
+    Tracks progress of an indexing run, allowing an indexer
+    that commits its work in chunks to resume an interrupted run
+    instead of starting over.
+
+    Checkpoint is stored in Redis and only applies to the run
+    against the same head commits it was recorded for.
+    """
+
+    source_id: str
+    """ID of the indexable source being indexed."""
+
+    heads: str
+    """Serialized head commits of source repositories being indexed."""
+
+    resume_after: Optional[str] = None
+    """Last source path committed by an interrupted run
+    against the same head commits, if any.
+    The indexer should skip paths up to and including this one."""
+
+    @property
+    def key(self) -> str:
+        return f'{self.source_id}_indexing_checkpoint'
+
+    @classmethod
+    def load(cls, source_id: str, heads: str) -> 'IndexingCheckpoint':
+        """Returns a checkpoint for the run against given heads,
+        with :attr:`resume_after` filled in if an earlier run
+        against the same heads was interrupted."""
+
+        checkpoint = cls(source_id=source_id, heads=heads)
+        try:
+            stored = json.loads(cache.get(checkpoint.key) or 'null')
+        except json.JSONDecodeError:
+            stored = None
+        if stored and stored.get('heads') == heads:
+            checkpoint.resume_after = stored.get('last_path')
+        return checkpoint
+
+    def save(self, last_path: str):
+        """Records that everything up to and including ``last_path``
+        has been committed. Paths are expected to be processed
+        in sorted order."""
+
+        self.resume_after = last_path
+        cache.set(self.key, json.dumps(dict(
+            dataset=self.source_id,
+            heads=self.heads,
+            last_path=last_path,
+        )))
+
+    def clear(self):
+        """Removes the checkpoint once the run has completed."""
+
+        self.resume_after = None
+        cache.delete(self.key)
+
+
+def acquire_indexing_lock(source_id: str) -> str:
+    """Acquires the lock that keeps indexing runs of given source
+    from overlapping, for :data:`.LOCK_SECONDS`.
+
+    :returns: lock token, to be passed to :func:`.refresh_indexing_lock()`
+              and :func:`.release_indexing_lock()`
+    :raises SourceLocked: another run holds the lock
+    """
+
+    lock = _get_indexing_lock(source_id)
+    if not lock.acquire(blocking=False):
+        raise SourceLocked(
+            "Indexing of {} is already in progress".format(source_id))
+    token = lock.local.token
+    if token is None:
+        raise RuntimeError("Acquired lock has no token")
+    return token if isinstance(token, str) else token.decode('utf-8')
+
+
+def refresh_indexing_lock(source_id: str, token: str):
+    """Makes sure the run with given lock token still holds the lock,
+    and resets its expiry.
+
+    :raises SourceLocked: lock expired or is held by another run
+    """
+
+    try:
+        _get_indexing_lock(source_id, token).reacquire()
+    except LockError:
+        raise SourceLocked(
+            "Indexing run of {} no longer holds the lock".format(source_id))
+
+
+def release_indexing_lock(source_id: str, token: str):
+    """Releases the lock if it is still held with given token."""
+
+    try:
+        _get_indexing_lock(source_id, token).release()
+    except LockError:
+        log.warning(
+            "Indexing lock of %s was already released or expired",
+            source_id)
+
+
+def _get_indexing_lock(source_id: str, token: Optional[str] = None) -> Lock:
+    # Lock token is not thread-local, since the lock
+    # may be released by a different task than the one that acquired it
+    lock = cache.lock(
+        f'{source_id}_indexing_lock',
+        timeout=LOCK_SECONDS,
+        thread_local=False)
+    if token is not None:
+        lock.local.token = token.encode('utf-8')
+    return lock
+
+
+@dataclass
+class ShardedIndexing:
+    """
+    Functions that allow an indexing run to be split into shards
+    that can be indexed independently (e.g., by different workers).
+
+    An instance is available on :attr:`IndexableSource.sharding`
+    if registered source provides ``list_refs`` and ``delete_stale``
+    (see :class:`IndexableSourceToRegister`).
+    """
+
+    plan: Callable[
+        [
+            Union[List[str], None],
+            Union[Callable[[str, int, int], None], None],
+            bool,
+        ],
+        Union[IndexingPlan, None],
+    ]
+    """
+    Acquires the indexing lock of the source,
+    syncs repositories and determines which refs to index.
+    Takes requested refs (or None), an on-progress handler
+    and whether to force indexing (see :attr:`IndexableSource.index`).
+    Returns ``None`` (and releases the lock)
+    if there is nothing to index.
+
+    :raises SourceLocked: another run of the source is in progress
+    """
+
+    index_shard: Callable[
+        [
+            IndexingPlan,
+            Union[Callable[[str, int, int], None], None],
+            Union[Callable[[str, str], None], None],
+        ],
+        Tuple[int, int, IndexingStats],
+    ]
+    """
+    Indexes a shard, given as a plan whose refs are limited to the shard.
+
+    Checks out planned head commits first, if the working directory
+    on this worker doesn’t have them (e.g., it is missing or was
+    synced by a later run). Takes the plan, on-progress and on-error
+    handlers (see :attr:`IndexableSource.index`),
+    and returns the same 3-tuple.
+
+    :raises SourceLocked: the run no longer holds the indexing lock
+    :raises RuntimeError: planned head commits could not be checked out
+    """
+
+    finalize: Callable[[IndexingPlan], int]
+    """
+    Completes the run after all shards were indexed:
+    deletes items not found in source (if the plan is for full reindex),
+    records indexed head commits and releases the indexing lock.
+    Returns the number of deleted items.
+
+    :raises SourceLocked: the run no longer holds the indexing lock
+    """
+
+    abort: Callable[[IndexingPlan], None]
+    """
+    Releases the indexing lock of a run that failed to complete
+    (e.g., because a shard failed).
+    """
+
+
 @dataclass
 class IndexableSource:
     """
@@ -49,12 +299,13 @@ class IndexableSource:
             Union[List[str], None],
             Union[Callable[[str, int, int], None], None],
             Union[Callable[[str, str], None], None],
+            bool,
         ],
-        Tuple[int, int],
+        Tuple[int, int, IndexingStats],
     ]
     """
-    The indexer function. Takes 3 positional arguments,
-    any of which can be None:
+    The indexer function. Takes 4 positional arguments,
+    any of the first 3 of which can be None:
 
     1) a list of source-specific references to index
        (absence means “index all”)
@@ -63,9 +314,12 @@ class IndexableSource:
        and 2 ints, total and indexed).
     3) an on-error handler, called with 2 strings
        (problematic item and error description).
+    4) whether to force indexing: if ``True``, requested refs
+       (or all refs) are indexed even if source repositories
+       didn’t change since last indexed.
 
-    Returns 2-tuple of integers
-    (number of found items, number of indexed items).
+    Returns 3-tuple
+    (number of found items, number of indexed items, :class:`IndexingStats`).
     """
 
     count_indexed: Callable[[], int]
@@ -75,6 +329,34 @@ class IndexableSource:
     """A function that wipes all indexed data for this source.
     Takes no arguments and returns nothing."""
 
+    rebuild_index: Optional[Callable[
+        [
+            Union[Callable[[str, int, int], None], None],
+            Union[Callable[[str, str], None], None],
+        ],
+        Tuple[int, int, IndexingStats],
+    ]] = None
+    """
+    The rebuild function, if the source supports it.
+    Takes on-progress and on-error handlers (see :attr:`index`),
+    reindexes the entire source regardless of whether repositories changed,
+    and returns the same 3-tuple as :attr:`index`.
+
+    Unlike resetting the index and reindexing, previously indexed data
+    stays available until rebuilt data replaces it.
+    """
+
+    sharding: Optional[ShardedIndexing] = None
+    """Functions for splitting indexing runs into shards,
+    if the source supports it."""
+
+    has_upstream_changes: Optional[Callable[[], bool]] = None
+    """A function that cheaply checks whether source repositories
+    may have changed since the source was last indexed,
+    without fetching them or touching working directories.
+
+    Returns ``False`` only if it is certain nothing changed."""
+
 
 registry: Dict[str, IndexableSource] = {}
 """
@@ -85,8 +367,7 @@ that handles data retrieval and indexing.
 """
 
 
-class IndexableSourceToRegister(TypedDict, total=True):
-    """A dictionary expected by indexable source registration."""
+class _RequiredIndexableSourceToRegister(TypedDict, total=True):
 
     indexer: Callable[
         [
@@ -94,11 +375,12 @@ class IndexableSourceToRegister(TypedDict, total=True):
             Union[List[str], None],
             Callable[[int, int], None],
             Callable[[str, str], None],
+            Optional[IndexingCheckpoint],
         ],
-        Tuple[int, int]
+        Tuple[int, int, IndexingStats]
     ]
     """
-    A function that will receive 4 positional arguments:
+    A function that will receive 5 positional arguments:
 
     1) a list of directories pre-filled with repository contents
        (one for each of repository sources specified during registration),
@@ -106,9 +388,16 @@ class IndexableSourceToRegister(TypedDict, total=True):
     3) an on-progress handler that should be called
        with 2 ints (total and indexed) on each indexed item,
     4) an on-error handler that should be called
-       with 2 strings (problematic item name and error description).
+       with 2 strings (problematic item name and error description),
+    5) an :class:`IndexingCheckpoint` for this run, or None.
+       If given, the indexer should skip paths up to and including
+       :attr:`~IndexingCheckpoint.resume_after` and call
+       :meth:`~IndexingCheckpoint.save` after committing each chunk.
+       If None (e.g., when indexing specific refs or a shard),
+       the indexer should neither resume nor record progress.
 
-    It must return a 2-tuple (number of found items, number of indexed items).
+    It must return a 3-tuple (number of found items, number of indexed items,
+    :class:`IndexingStats`).
 
     It should raise an exception if the source had not been indexed
     due to a problem.
@@ -122,13 +411,76 @@ class IndexableSourceToRegister(TypedDict, total=True):
     Takes no arguments and returns nothing."""
 
 
-def register_git_source(source_id: str, repos: List[Tuple[str, str]]):
+class IndexableSourceToRegister(
+    _RequiredIndexableSourceToRegister,
+    total=False,
+):
+    """A dictionary expected by indexable source registration."""
+
+    get_refs_for_paths: Callable[[List[List[str]]], List[str]]
+    """
+    Optional. A function that receives paths changed since last indexing run
+    (a list of paths relative to repository root for each repository source,
+    in the same order the sources were specified during registration)
+    and returns a list of references that need to be reindexed.
+
+    It must include references whose files were deleted,
+    the indexer is expected to remove those from the index.
+
+    If provided, and previously indexed commits are still available,
+    only returned references will be passed to the indexer
+    instead of reindexing the whole source.
+    """
+
+    rebuild_indexer: Callable[
+        [
+            List[str],
+            Callable[[int, int], None],
+            Callable[[str, str], None],
+        ],
+        Tuple[int, int, IndexingStats]
+    ]
+    """
+    Optional. A function that reindexes the entire source from scratch,
+    receiving the same arguments as ``indexer``
+    except for references and checkpoint.
+
+    It is expected to keep previously indexed data available
+    until the new data is complete, and then replace it at once.
+    """
+
+    list_refs: Callable[[List[str]], List[str]]
+    """
+    Optional. A function that receives a list of directories
+    (same as ``indexer``) and returns all references found in source.
+
+    Required, along with ``delete_stale``,
+    for indexing runs to be split into shards.
+    """
+
+    delete_stale: Callable[[List[str]], int]
+    """
+    Optional. A function that receives a list of directories
+    (same as ``indexer``), deletes indexed items
+    not found in source anymore and returns the number of deleted items.
+    """
+
+
+def register_git_source(
+    source_id: str,
+    repos: List[Tuple[str, str]],
+    sparse_paths: Optional[List[str]] = None,
+):
     """
     Parametrized decorator that returns a registration function
     for an indexable source that uses one or more Git repositories.
 
     Each repository is configured by a 2-tuple of strings
-    (Git HTTPS URL, Git branch).
+    (Git HTTPS URL, Git branch). Repositories are synced concurrently.
+
+    If the indexer only needs some directories in repositories,
+    they can be given as ``sparse_paths``, and with partial clones enabled
+    only those will be checked out (see :func:`common.git.reclone`).
 
     The indexable source being registered should be a dictionary conforming
     to :class:`IndexableSourceToRegister`.
@@ -136,6 +488,27 @@ def register_git_source(source_id: str, repos: List[Tuple[str, str]]):
     Returned wrapper will handle things like fetching Git repositories
     and checking that head commits changed before calling registered
     indexer implementation.
+
+    If the source provides ``get_refs_for_paths``
+    and no specific refs were requested, only refs affected by files
+    changed since previously indexed head commits are reindexed.
+    The whole source is reindexed if previous commits are unavailable
+    (e.g., on first run or after the repository was recloned).
+
+    Unless specific refs were requested, the indexer receives
+    an :class:`IndexingCheckpoint`, which lets a run that was interrupted
+    (e.g., worker crash or revoked task) resume on the next attempt.
+
+    Unless specific refs were requested or indexing is forced,
+    remote heads are checked first
+    (see :attr:`IndexableSource.has_upstream_changes`),
+    and if they match previously indexed heads
+    repositories are neither fetched nor indexed.
+    Forced runs reindex all refs (unless specific refs were requested).
+
+    Runs of the same source don’t overlap: each run holds
+    an indexing lock (see :func:`acquire_indexing_lock`), which
+    sharded runs keep from planning until they are finalized or aborted.
     """
 
     latest_indexed_heads_key = f'{source_id}_latest_indexed_heads'
@@ -164,78 +537,385 @@ def register_git_source(source_id: str, repos: List[Tuple[str, str]]):
                 source_id,
                 err)
 
+        def sync_repos(
+            on_progress: Callable[[str, int, int], None],
+        ) -> Tuple[List[str], List[Repo], str]:
+            """Pulls or clones source repositories concurrently.
+
+            :returns: a 3-tuple (working directory paths, repositories,
+                      serialized head commits)
+            """
+            work_dir_paths: List[str] = [
+                get_work_dir_path(source_id, repo_url, repo_branch)
+                for repo_url, repo_branch in repos
+            ]
+
+            on_progress(
+                'pulling or cloning {} into {}'.format(
+                    ', '.join(
+                        '{} (branch {})'.format(repo_url, repo_branch)
+                        for repo_url, repo_branch in repos),
+                    ', '.join(work_dir_paths)),
+                total_repos,
+                0,
+            )
+
+            with ThreadPoolExecutor(max_workers=total_repos) as executor:
+                futures = [
+                    executor.submit(
+                        ensure_latest,
+                        repo_url,
+                        repo_branch,
+                        work_dir_path,
+                        sparse_paths)
+                    for (repo_url, repo_branch), work_dir_path
+                    in zip(repos, work_dir_paths)
+                ]
+                # Progress is reported from this thread only
+                for idx, future in enumerate(as_completed(futures)):
+                    future.result()
+                    on_progress(
+                        'pulled or cloned {} of {} repositories'.format(
+                            idx + 1,
+                            total_repos),
+                        total_repos,
+                        idx + 1,
+                    )
+
+            synced_repos: List[Repo] = [
+                future.result()[0]
+                for future in futures
+            ]
+            repo_heads: List[str] = [
+                repo.head.commit.hexsha
+                for repo in synced_repos
+            ]
+
+            return work_dir_paths, synced_repos, ', '.join(repo_heads)
+
+        def has_upstream_changes() -> bool:
+            """Compares remote heads of source repositories
+            with latest indexed heads, without fetching anything.
+
+            :returns: ``False`` if remote heads match latest indexed heads,
+                      ``True`` if they don’t or could not be determined
+            """
+            previous_heads_serialized = cache.get(latest_indexed_heads_key)
+            if not previous_heads_serialized:
+                return True
+
+            with ThreadPoolExecutor(max_workers=total_repos) as executor:
+                remote_heads = list(executor.map(
+                    lambda repo: get_remote_head(*repo),
+                    repos))
+
+            known_heads = [head for head in remote_heads if head is not None]
+            if len(known_heads) < len(remote_heads):
+                return True
+
+            if ', '.join(known_heads) == previous_heads_serialized:
+                log.info(
+                    "Remote heads of %s match latest indexed heads",
+                    source_id)
+                return False
+
+            return True
+
+        def get_index_progress_handler(
+            on_progress: Callable[[str, int, int], None],
+        ) -> Callable[[int, int], None]:
+            return (lambda total, indexed: on_progress(
+                'indexing using data in {}'
+                .format(', '.join(repo[0] for repo in repos)),
+                total,
+                indexed,
+            ))
+
+        def get_refs_to_index(
+            refs: Union[List[str], None],
+            synced_repos: List[Repo],
+            heads_serialized: str,
+        ) -> Tuple[bool, Union[List[str], None]]:
+            """Determines whether indexing is needed given synced repositories,
+            and which refs to index if not all
+            (see ``get_refs_for_paths`` in :class:`IndexableSourceToRegister`).
+
+            :returns: a 2-tuple (whether to index, refs to index or None)
+            """
+            previous_heads_serialized = cache.get(latest_indexed_heads_key)
+
+            if previous_heads_serialized == heads_serialized:
+                log.info(
+                    "No repositories changed for %s, skipping indexing",
+                    source_id)
+                return False, refs
+
+            log.info(
+                "Repositories changed for %s, starting index",
+                source_id)
+
+            get_refs_for_paths = index_info.get('get_refs_for_paths')
+            if (
+                refs is None
+                and get_refs_for_paths is not None
+                and previous_heads_serialized
+            ):
+                changed_paths = _get_changed_paths(
+                    synced_repos,
+                    previous_heads_serialized.split(', '))
+                if changed_paths is not None:
+                    refs = get_refs_for_paths(changed_paths)
+                    log.info(
+                        "Reindexing %s changed items in %s",
+                        len(refs),
+                        source_id)
+                    if len(refs) < 1:
+                        cache.set(
+                            latest_indexed_heads_key,
+                            heads_serialized)
+                        return False, refs
+                else:
+                    log.info(
+                        "Unable to determine changes for %s, "
+                        "reindexing everything",
+                        source_id)
+
+            return True, refs
+
         @functools.wraps(index_info['indexer'])
         def handle_index(
             refs: Union[List[str], None],
             on_progress: Union[Callable[[str, int, int], None], None],
             on_item_error: Union[Callable[[str, str], None], None],
-        ) -> Tuple[int, int]:
-            work_dir_paths: List[str] = []
-            repo_heads: List[str] = []
-
+            force: bool = False,
+        ) -> Tuple[int, int, IndexingStats]:
             on_progress = on_progress or default_on_progress
             on_item_error = on_item_error or default_on_item_error
+            refs_requested = refs is not None
+
+            if not (refs_requested or force) and not has_upstream_changes():
+                return 0, 0, {}
+
+            lock_token = acquire_indexing_lock(source_id)
+            try:
+                return index_locked(refs, on_progress, on_item_error, force)
+            finally:
+                release_indexing_lock(source_id, lock_token)
 
-            for idx, (repo_url, repo_branch) in enumerate(repos):
-                work_dir_path = get_work_dir_path(
+        def index_locked(
+            refs: Union[List[str], None],
+            on_progress: Callable[[str, int, int], None],
+            on_item_error: Callable[[str, str], None],
+            force: bool,
+        ) -> Tuple[int, int, IndexingStats]:
+            refs_requested = refs is not None
+
+            work_dir_paths, synced_repos, heads_serialized = \
+                sync_repos(on_progress)
+
+            should_index, refs = (
+                (True, refs)
+                if force
+                else get_refs_to_index(refs, synced_repos, heads_serialized))
+
+            if not should_index:
+                return 0, 0, {}
+
+            on_index_progress = get_index_progress_handler(on_progress)
+
+            # Checkpoints are only used for runs whose scope
+            # is determined by repository state, so that a rerun
+            # after interruption covers the same refs.
+            checkpoint = (
+                IndexingCheckpoint.load(source_id, heads_serialized)
+                if not refs_requested
+                else None)
+            if checkpoint and checkpoint.resume_after:
+                log.info(
+                    "Resuming interrupted indexing of %s after %s",
                     source_id,
-                    repo_url,
-                    repo_branch)
-                work_dir_paths.append(work_dir_path)
+                    checkpoint.resume_after)
 
-                on_progress(
-                    'pulling or cloning '
-                    'from {} (branch {}) into {}'
-                    .format(
-                        repo_url,
-                        repo_branch,
-                        work_dir_path),
-                    total_repos,
-                    idx + 1,
-                )
+            found, indexed, stats = index_info['indexer'](
+                work_dir_paths,
+                refs,
+                on_index_progress,
+                on_item_error,
+                checkpoint,
+            )
 
-                repo, _ = ensure_latest(
-                    repo_url,
-                    repo_branch,
-                    work_dir_path)
+            # If next indexing run encounters same heads combo, skip index.
+            # Only set this key after index run completed without errors.
+            cache.set(latest_indexed_heads_key, heads_serialized)
+            if checkpoint:
+                checkpoint.clear()
 
-                repo_heads.append(repo.head.commit.hexsha)
+            return found, indexed, stats
 
-            heads_serialized = ', '.join(repo_heads)
+        rebuild_indexer = index_info.get('rebuild_indexer')
 
-            if cache.get(latest_indexed_heads_key) != heads_serialized:
-                log.info(
-                    "Repositories changed for %s, starting index",
-                    source_id)
-                on_index_progress = (lambda total, indexed: on_progress(
-                    'indexing using data in {}'
-                    .format(', '.join(repo[0] for repo in repos)),
-                    total,
-                    indexed,
-                ))
-                found, indexed = index_info['indexer'](
+        def handle_rebuild(
+            on_progress: Union[Callable[[str, int, int], None], None],
+            on_item_error: Union[Callable[[str, str], None], None],
+        ) -> Tuple[int, int, IndexingStats]:
+            if rebuild_indexer is None:
+                raise RuntimeError(
+                    "Source {} does not support rebuilding index"
+                    .format(source_id))
+
+            on_progress = on_progress or default_on_progress
+            on_item_error = on_item_error or default_on_item_error
+
+            lock_token = acquire_indexing_lock(source_id)
+            try:
+                work_dir_paths, _, heads_serialized = sync_repos(on_progress)
+
+                log.info("Rebuilding index for %s", source_id)
+
+                found, indexed, stats = rebuild_indexer(
                     work_dir_paths,
-                    refs,
-                    on_index_progress,
+                    get_index_progress_handler(on_progress),
                     on_item_error,
                 )
 
-                # If next indexing run encounters same heads combo, skip index.
-                # Only set this key after index run completed without errors.
                 cache.set(latest_indexed_heads_key, heads_serialized)
+                IndexingCheckpoint(source_id, heads_serialized).clear()
+            finally:
+                release_indexing_lock(source_id, lock_token)
+
+            return found, indexed, stats
+
+        list_refs = index_info.get('list_refs')
+        delete_stale = index_info.get('delete_stale')
+
+        def checkout_heads(heads_serialized: str) -> List[str]:
+            """Checks out given head commits in working directories
+            of this worker (see :func:`common.git.ensure_commit`).
+
+            :returns: working directory paths
+            """
+            work_dir_paths: List[str] = [
+                get_work_dir_path(source_id, repo_url, repo_branch)
+                for repo_url, repo_branch in repos
+            ]
+            for (repo_url, repo_branch), work_dir_path, sha in zip(
+                repos,
+                work_dir_paths,
+                heads_serialized.split(', '),
+            ):
+                ensure_commit(
+                    repo_url,
+                    repo_branch,
+                    work_dir_path,
+                    sha,
+                    sparse_paths)
+            return work_dir_paths
 
-                return found, indexed
+        def handle_plan(
+            refs: Union[List[str], None],
+            on_progress: Union[Callable[[str, int, int], None], None],
+            force: bool = False,
+        ) -> Union[IndexingPlan, None]:
+            if list_refs is None:
+                raise RuntimeError(
+                    "Source {} does not support sharded indexing"
+                    .format(source_id))
 
-            else:
-                log.info(
-                    "No repositories changed for %s, skipping indexing",
-                    source_id)
-                return 0, 0
+            on_progress = on_progress or default_on_progress
+
+            if refs is None and not force and not has_upstream_changes():
+                return None
+
+            lock_token = acquire_indexing_lock(source_id)
+            try:
+                work_dir_paths, synced_repos, heads_serialized = \
+                    sync_repos(on_progress)
+
+                should_index, refs = (
+                    (True, refs)
+                    if force
+                    else get_refs_to_index(
+                        refs,
+                        synced_repos,
+                        heads_serialized))
+
+                if not should_index:
+                    release_indexing_lock(source_id, lock_token)
+                    return None
+
+                return dict(
+                    refs=(
+                        refs
+                        if refs is not None
+                        else list_refs(work_dir_paths)),
+                    full=refs is None,
+                    heads=heads_serialized,
+                    lock_token=lock_token,
+                )
+            except:  # noqa: E722
+                release_indexing_lock(source_id, lock_token)
+                raise
+
+        def handle_index_shard(
+            plan: IndexingPlan,
+            on_progress: Union[Callable[[str, int, int], None], None],
+            on_item_error: Union[Callable[[str, str], None], None],
+        ) -> Tuple[int, int, IndexingStats]:
+            refresh_indexing_lock(source_id, plan['lock_token'])
+
+            found, indexed, stats = index_info['indexer'](
+                checkout_heads(plan['heads']),
+                plan['refs'],
+                get_index_progress_handler(
+                    on_progress or default_on_progress),
+                on_item_error or default_on_item_error,
+                None,
+            )
+
+            # Fails the shard if another run took over meanwhile,
+            # so that the run is not finalized
+            refresh_indexing_lock(source_id, plan['lock_token'])
+
+            return found, indexed, stats
+
+        def handle_finalize(plan: IndexingPlan) -> int:
+            if delete_stale is None:
+                raise RuntimeError(
+                    "Source {} does not support sharded indexing"
+                    .format(source_id))
+
+            refresh_indexing_lock(source_id, plan['lock_token'])
+            try:
+                deleted = (
+                    delete_stale(checkout_heads(plan['heads']))
+                    if plan['full']
+                    else 0)
+
+                cache.set(latest_indexed_heads_key, plan['heads'])
+                IndexingCheckpoint(source_id, plan['heads']).clear()
+            finally:
+                release_indexing_lock(source_id, plan['lock_token'])
+
+            return deleted
+
+        def handle_abort(plan: IndexingPlan):
+            log.warning(
+                "Sharded indexing of %s did not complete",
+                source_id)
+            release_indexing_lock(source_id, plan['lock_token'])
 
         indexable_source = IndexableSource(
             index=handle_index,
             reset_index=index_info['reset_index'],
             count_indexed=index_info['count_indexed'],
+            rebuild_index=handle_rebuild if rebuild_indexer else None,
+            sharding=ShardedIndexing(
+                plan=handle_plan,
+                index_shard=handle_index_shard,
+                finalize=handle_finalize,
+                abort=handle_abort,
+            ) if list_refs and delete_stale else None,
+            has_upstream_changes=has_upstream_changes,
         )
 
         registry[source_id] = indexable_source
@@ -243,6 +923,52 @@ def register_git_source(source_id: str, repos: List[Tuple[str, str]]):
     return wrapper
 
 
+def check_upstream_changes(source_ids: List[str]) -> Dict[str, bool]:
+    """Checks given sources for upstream changes concurrently
+    (see :attr:`IndexableSource.has_upstream_changes`).
+
+    Sources that don’t support the check are considered changed.
+
+    :returns: a dictionary mapping source IDs to whether they changed
+    """
+
+    def check(source_id: str) -> bool:
+        source = registry[source_id]
+        if source.has_upstream_changes is None:
+            return True
+        return source.has_upstream_changes()
+
+    if not source_ids:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=len(source_ids)) as executor:
+        return dict(zip(source_ids, executor.map(check, source_ids)))
+
+
+def _get_changed_paths(
+    repos: List[Repo],
+    previous_heads: List[str],
+) -> Union[List[List[str]], None]:
+    """
+    For each repository, obtains a list of paths
+    changed between corresponding previous head and current head.
+
+    :returns: a list of path lists, or ``None`` if changes
+              could not be determined for any of the repositories.
+    """
+    if len(previous_heads) != len(repos):
+        return None
+
+    changed_paths: List[List[str]] = []
+    for repo, previous_head in zip(repos, previous_heads):
+        paths = get_changed_paths(repo, previous_head)
+        if paths is None:
+            return None
+        changed_paths.append(paths)
+
+    return changed_paths
+
+
 def _get_dataset_tmp_path(source_id: str):
     """
     :returns string: Path to fetched source data root
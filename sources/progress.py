@@ -0,0 +1,122 @@
+"""Rate-limited reporting of indexing progress.
+
+Indexers call their on-progress handler for every item,
+while reporting progress somewhere (e.g., Celery task state in Redis)
+has a cost of its own. :class:`ProgressReporter` sits in between
+and passes on only some of the updates, along with throughput and ETA.
+"""
+
+import time
+from typing import Callable, Optional
+
+from django.conf import settings
+
+
+REPORT_INTERVAL: float = getattr(
+    settings,
+    'INDEXING_PROGRESS_INTERVAL',
+    2.0)
+"""Minimum number of seconds between reported updates.
+See :data:`bibxml.settings.INDEXING_PROGRESS_INTERVAL`."""
+
+REPORT_EVERY_ITEMS: int = getattr(
+    settings,
+    'INDEXING_PROGRESS_ITEMS',
+    1000)
+"""Number of items after which an update is reported
+regardless of :data:`.REPORT_INTERVAL`.
+See :data:`bibxml.settings.INDEXING_PROGRESS_ITEMS`."""
+
+
+class ProgressReporter:
+    """Wraps a progress handler that takes action and progress
+    (see :attr:`sources.indexable.IndexableSource.index`),
+    coalescing updates.
+
+    An instance is called the same way as the handler it wraps.
+    An update is passed on if any of the following is true:
+
+    - it’s the first one, or the action changed since last update,
+    - indexing is complete (``indexed`` reached ``total``),
+    - :data:`.REPORT_INTERVAL` seconds passed since last reported update,
+    - :data:`.REPORT_EVERY_ITEMS` items were indexed since then.
+
+    Reported updates are given throughput and ETA in addition to
+    action and progress, both measured since current action started.
+    """
+
+    def __init__(
+        self,
+        report: Callable[[str, int, int, Optional[float], Optional[int]],
+                         None],
+        interval: float = REPORT_INTERVAL,
+        every_items: int = REPORT_EVERY_ITEMS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param report: a function that takes action, total, indexed,
+                       items per second and ETA in seconds
+                       (latter two are ``None`` until known)
+        """
+        self.report = report
+        self.interval = interval
+        self.every_items = every_items
+        self.clock = clock
+
+        self.action: Optional[str] = None
+        self.action_started_at: float = 0.0
+        self.action_started_from: int = 0
+        self.last_reported_at: float = 0.0
+        self.last_reported_indexed: int = 0
+        self.last_total: int = 0
+        self.last_indexed: int = 0
+
+    def __call__(self, action: str, total: int, indexed: int):
+        now = self.clock()
+        self.last_total, self.last_indexed = total, indexed
+
+        if action != self.action:
+            self.action = action
+            self.action_started_at = now
+            self.action_started_from = indexed
+        elif not any([
+            total > 0 and indexed >= total,
+            now - self.last_reported_at >= self.interval,
+            indexed - self.last_reported_indexed >= self.every_items,
+        ]):
+            return
+
+        self._report(now)
+
+    def flush(self):
+        """Reports latest received update, if it wasn’t reported yet."""
+
+        if self.action is not None \
+                and self.last_indexed != self.last_reported_indexed:
+            self._report(self.clock())
+
+    @property
+    def items_per_second(self) -> Optional[float]:
+        """Throughput of current action so far."""
+
+        elapsed = self.clock() - self.action_started_at
+        done = self.last_indexed - self.action_started_from
+        if elapsed <= 0 or done <= 0:
+            return None
+        return done / elapsed
+
+    def _report(self, now: float):
+        self.last_reported_at = now
+        self.last_reported_indexed = self.last_indexed
+
+        rate = self.items_per_second
+        eta: Optional[int] = None
+        if rate and self.last_total >= self.last_indexed:
+            eta = round((self.last_total - self.last_indexed) / rate)
+
+        self.report(
+            self.action or '',
+            self.last_total,
+            self.last_indexed,
+            round(rate, 1) if rate else None,
+            eta)
@@ -1,11 +1,14 @@
 """Primitives for working with indexing task status."""
 
-from typing import List, Optional, TypedDict, Union, cast
+from typing import Dict, List, Optional, TypedDict, Union, cast
 import traceback
 
 from celery.result import AsyncResult
+from celery.states import READY_STATES
+from django.conf import settings
 
 from .celery import app
+from .indexable import IndexingStats
 from . import cache
 
 
@@ -15,10 +18,19 @@ TaskError = TypedDict(
 """Error description for a failed task."""
 
 
-TaskProgress = TypedDict(
-    'TaskProgress',
-    {'total': Union[int, None], 'current': int})
-"""Progress description for task in progress."""
+class _RequiredTaskProgress(TypedDict, total=True):
+    total: Union[int, None]
+    current: int
+
+
+class TaskProgress(_RequiredTaskProgress, total=False):
+    """Progress description for task in progress."""
+
+    items_per_second: Optional[float]
+    """Throughput of current action, if known."""
+
+    eta_seconds: Optional[int]
+    """Estimated time until current action completes, if known."""
 
 
 class IndexingTaskCeleryMeta(TypedDict):
@@ -39,6 +51,25 @@ class IndexingTaskCeleryMeta(TypedDict):
     progress: TaskProgress
     """Indexation progress status."""
 
+    stats: IndexingStats
+    """Changes made to the index, for a completed task."""
+
+
+class ShardedIndexingTaskCeleryMeta(IndexingTaskCeleryMeta):
+    """
+    Metadata returned by an indexing task that split its work into shards
+    (see :func:`sources.tasks.dispatch_shards`).
+    """
+
+    shard_task_ids: List[str]
+    """Celery task IDs of dispatched shard tasks."""
+
+    shard_sizes: List[int]
+    """Number of refs in each shard, in the same order."""
+
+    finalizer_task_id: Optional[str]
+    """Celery task ID of the task that runs after all shards succeed."""
+
 
 class IndexingTaskDescription(TypedDict):
     """
@@ -70,6 +101,9 @@ class IndexingTaskDescription(TypedDict):
     progress: Union[TaskProgress, None]
     """Indexation progress status."""
 
+    stats: Union[IndexingStats, None]
+    """Changes made to the index, normally for a successful task."""
+
     error: Union[TaskError, None]
     """Error description, for a failed task."""
 
@@ -113,6 +147,142 @@ def list_running_tasks() -> List[str]:
         for task in jobs.get(hostname, [])]
 
 
+class RefreshRunDescription(TypedDict):
+    """Combined status of a refresh run
+    (see :func:`sources.tasks.refresh_sources_task`)."""
+
+    run_id: str
+    """Refresh run ID (same as orchestrator Celery task ID)."""
+
+    status: str
+    """``PROGRESS`` while any sources are pending or being indexed,
+    afterwards ``FAILURE`` if indexing any of them failed
+    and ``SUCCESS`` otherwise."""
+
+    concurrency: int
+    """How many sources are indexed at a time."""
+
+    dataset_ids: List[str]
+    """Sources to be refreshed, in priority order."""
+
+    skipped: List[str]
+    """Sources skipped since their repositories didn’t change."""
+
+    pending: List[str]
+    """Sources not yet dispatched."""
+
+    tasks: Dict[str, IndexingTaskDescription]
+    """Descriptions of dispatched indexing tasks, by source ID."""
+
+
+class RefreshRun:
+    """State of a refresh run stored in Redis,
+    shared between orchestrator and indexing tasks."""
+
+    expires: int = getattr(settings, 'CELERY_TASK_RESULT_EXPIRES', 604800)
+    """Refresh run state expires along with task results."""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+
+    def _key(self, suffix: str) -> str:
+        return 'refresh_run_{}_{}'.format(self.run_id, suffix)
+
+    @property
+    def concurrency(self) -> int:
+        return int(cache.hget(self._key('meta'), 'concurrency') or 1)
+
+    @property
+    def force(self) -> bool:
+        """Whether sources are indexed even if they didn’t change."""
+        return cache.hget(self._key('meta'), 'force') == '1'
+
+    def start(
+        self,
+        dataset_ids: List[str],
+        skipped: List[str],
+        concurrency: int,
+        force: bool = False,
+    ):
+        """Records sources to refresh as pending, in given order."""
+
+        pipe = cache.pipeline()
+        pipe.hset(self._key('meta'), mapping=dict(
+            concurrency=concurrency,
+            dataset_ids=','.join(dataset_ids),
+            skipped=','.join(skipped),
+            force='1' if force else '0',
+        ))
+        if dataset_ids:
+            pipe.rpush(self._key('pending'), *dataset_ids)
+        for suffix in ('meta', 'pending'):
+            pipe.expire(self._key(suffix), self.expires)
+        pipe.lpush(REFRESH_RUNS_KEY, self.run_id)
+        pipe.ltrim(REFRESH_RUNS_KEY, 0, 99)
+        pipe.execute()
+
+    def pop_pending(self) -> Optional[str]:
+        """Takes next pending source off the list, atomically."""
+
+        return cache.lpop(self._key('pending'))
+
+    def add_task(self, dataset_id: str, task_id: str):
+        """Records indexing task dispatched for given source."""
+
+        pipe = cache.pipeline()
+        pipe.hset(self._key('tasks'), dataset_id, task_id)
+        pipe.expire(self._key('tasks'), self.expires)
+        pipe.execute()
+
+    def describe(self) -> RefreshRunDescription:
+        meta = cache.hgetall(self._key('meta'))
+        pending = cache.lrange(self._key('pending'), 0, -1)
+        tasks = {
+            dataset_id: describe_indexing_task(task_id)
+            for dataset_id, task_id
+            in cache.hgetall(self._key('tasks')).items()
+        }
+
+        if pending or any(
+            task['status'] not in READY_STATES
+            for task in tasks.values()
+        ):
+            status = 'PROGRESS'
+        elif any(task['status'] == 'FAILURE' for task in tasks.values()):
+            status = 'FAILURE'
+        else:
+            status = 'SUCCESS'
+
+        return dict(
+            run_id=self.run_id,
+            status=status,
+            concurrency=int(meta.get('concurrency', 1)),
+            dataset_ids=[
+                dataset_id
+                for dataset_id in meta.get('dataset_ids', '').split(',')
+                if dataset_id
+            ],
+            skipped=[
+                dataset_id
+                for dataset_id in meta.get('skipped', '').split(',')
+                if dataset_id
+            ],
+            pending=pending,
+            tasks=tasks,
+        )
+
+
+REFRESH_RUNS_KEY = 'refresh_runs'
+"""Redis key of the list of recent refresh run IDs,
+most recent first."""
+
+
+def get_refresh_run_ids(limit=10) -> List[str]:
+    """Retrieves IDs of most recently started refresh runs."""
+
+    return cache.lrange(REFRESH_RUNS_KEY, 0, limit - 1)
+
+
 def describe_indexing_task(tid: str) -> IndexingTaskDescription:
     """Using Celery task ID, collects indexing task description.
 
@@ -130,6 +300,7 @@ def describe_indexing_task(tid: str) -> IndexingTaskDescription:
         requested_refs=None,
         action=None,
         progress=None,
+        stats=None,
         error=None,
         outcome_summary=None,
     )
@@ -154,11 +325,15 @@ def describe_indexing_task(tid: str) -> IndexingTaskDescription:
         total, current = \
             prog.get('total', None), prog.get('current', None)
 
-        if result.successful():
-            task['outcome_summary'] = \
-                "Succeeded (total: {}, indexed: {})".format(
-                    total if total is not None else 'N/A',
-                    current if current is not None else 'N/A')
+        if result.successful() and meta.get('finalizer_task_id', None):
+            _describe_shards(
+                task,
+                cast(ShardedIndexingTaskCeleryMeta, meta))
+
+        elif result.successful():
+            stats = meta.get('stats', None)
+            task['stats'] = stats
+            task['outcome_summary'] = _summarize_outcome(total, current, stats)
             if result.date_done:
                 task['completed_at'] = \
                     result.date_done.strftime('%Y-%m-%dT%H:%M:%SZ')
@@ -179,6 +354,82 @@ def describe_indexing_task(tid: str) -> IndexingTaskDescription:
                     total=None)
                 if total is not None:
                     progress['total'] = total
+                for key in ('items_per_second', 'eta_seconds'):
+                    if prog.get(key, None) is not None:
+                        progress[key] = prog[key]
                 task['progress'] = progress
 
     return task
+
+
+def _summarize_outcome(
+    total: Optional[int],
+    current: Optional[int],
+    stats: Optional[IndexingStats],
+) -> str:
+    return "Succeeded (total: {}, indexed: {}{})".format(
+        total if total is not None else 'N/A',
+        current if current is not None else 'N/A',
+        ''.join(
+            f', {key}: {count}'
+            for key, count in stats.items()
+        ) if stats else '')
+
+
+def _describe_shards(
+    task: IndexingTaskDescription,
+    meta: ShardedIndexingTaskCeleryMeta,
+):
+    """Fills in given task description
+    with status aggregated across shard tasks
+    and the finalizer task dispatched by the described task."""
+
+    finalizer = AsyncResult(meta['finalizer_task_id'], app=app)
+
+    if finalizer.successful():
+        final_meta = cast(IndexingTaskCeleryMeta, finalizer.info or {})
+        prog = final_meta.get('progress', {})
+        task['stats'] = final_meta.get('stats', None)
+        task['outcome_summary'] = _summarize_outcome(
+            prog.get('total', None),
+            prog.get('current', None),
+            task['stats'])
+        if finalizer.date_done:
+            task['completed_at'] = \
+                finalizer.date_done.strftime('%Y-%m-%dT%H:%M:%SZ')
+        return
+
+    shards = [
+        AsyncResult(shard_id, app=app)
+        for shard_id in meta['shard_task_ids']
+    ]
+
+    failed = [
+        result
+        for result in [*shards, finalizer]
+        if result.failed()
+    ]
+    if failed:
+        exc = failed[0].info
+        task['status'] = failed[0].status
+        task['error'] = dict(
+            type=getattr(exc.__class__, '__name__', 'N/A'),
+            message=str(exc))
+        return
+
+    current = 0
+    completed = 0
+    for shard, size in zip(shards, meta['shard_sizes']):
+        if shard.successful():
+            completed += 1
+            current += size
+        elif isinstance(shard.info, dict):
+            current += shard.info.get('progress', {}).get('current', 0)
+
+    task['status'] = 'PROGRESS'
+    task['action'] = 'indexing in {} shards ({} completed)'.format(
+        len(shards),
+        completed)
+    task['progress'] = dict(
+        current=current,
+        total=sum(meta['shard_sizes']))
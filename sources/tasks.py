@@ -1,24 +1,64 @@
 """
 Celery task for working with indexable sources.
 """
+import time
 import traceback
+from typing import Callable, List, Dict, Any, Optional, Union
+
+from celery import chord
 from celery.utils.log import get_task_logger
+from django.conf import settings
+
+from prometheus import metrics
 
 from .celery import app
 
-from .indexable import registry
+from .indexable import registry, IndexingPlan, IndexingStats
+from .indexable import check_upstream_changes, ShardedIndexing
+from .progress import ProgressReporter
 from .task_status import IndexingTaskCeleryMeta
+from .task_status import ShardedIndexingTaskCeleryMeta
+from .task_status import push_task, RefreshRun
 
 
 logger = get_task_logger(__name__)
 
 
-def fetch_and_index_task(task, dataset_id: str, refs=None):
+SHARD_SIZE: int = getattr(settings, 'INDEXING_SHARD_SIZE', 0)
+"""How many refs to index per shard task, if positive.
+See :data:`bibxml.settings.INDEXING_SHARD_SIZE`."""
+
+REFRESH_CONCURRENCY: int = getattr(settings, 'INDEXING_REFRESH_CONCURRENCY', 3)
+"""How many sources :func:`.refresh_sources_task` indexes at once
+by default. See :data:`bibxml.settings.INDEXING_REFRESH_CONCURRENCY`."""
+
+PRIORITY_SOURCES: List[str] = getattr(settings, 'AUTHORITATIVE_DATASETS', [])
+"""Sources that :func:`.refresh_sources_task` indexes first."""
+
+
+def fetch_and_index_task(
+    task,
+    dataset_id: str,
+    refs=None,
+    rebuild=False,
+    force=False,
+):
     """(Re)indexes indexable source with given ID.
 
     :param str dataset_id: source ID used during registration.
     :param refs: a list of items to index,
                  if not provided the entire dataset is indexed
+    :param bool rebuild: rebuild the entire index from scratch
+                         (see :attr:`.IndexableSource.rebuild_index`),
+                         ``refs`` are ignored
+    :param bool force: index even if source repositories didn’t change
+                       since last indexed (see :attr:`.IndexableSource.index`)
+
+    If :data:`.SHARD_SIZE` is positive and the source supports it
+    (see :attr:`.IndexableSource.sharding`), this task only syncs
+    source repositories and dispatches a chord of :func:`.index_shard`
+    tasks followed by :func:`.finalize_index`, and returns
+    a :class:`sources.task_status.ShardedIndexingTaskCeleryMeta`.
 
     :rtype: sources.task_status.IndexingTaskCeleryMeta
     """
@@ -32,10 +72,13 @@ def fetch_and_index_task(task, dataset_id: str, refs=None):
         return
 
     task_desc: IndexingTaskCeleryMeta = dict(
-        action='starting indexing {}'.format(dataset_id),
+        action='starting {} {}'.format(
+            'rebuilding index for' if rebuild else 'indexing',
+            dataset_id),
         progress={'total': 0, 'current': 0},
         dataset_id=dataset_id,
         requested_refs=','.join(refs or []),
+        stats={},
     )
 
     task.update_state(
@@ -43,22 +86,41 @@ def fetch_and_index_task(task, dataset_id: str, refs=None):
         meta=task_desc,
     )
 
-    update_status = (lambda action, total, indexed: task.update_state(
-        state='PROGRESS',
-        meta={
-            **task_desc,
-            'action': action,
-            'progress': {
-                'total': total,
-                'current': indexed,
-            },
-        },
-    ))
+    update_status = get_status_reporter(task, task_desc)
+
+    on_item_error = get_item_error_handler(dataset_id)
+    started_at = time.monotonic()
+
+    def observe_duration(outcome: str):
+        metrics.indexing_duration.labels(dataset_id, outcome).observe(
+            time.monotonic() - started_at)
 
     try:
-        found, indexed = indexable_source.index(refs, update_status, None)
+        if SHARD_SIZE > 0 and indexable_source.sharding and not rebuild:
+            result = dispatch_shards(
+                dataset_id,
+                indexable_source.sharding.plan(refs, update_status, force),
+                task_desc)
+            observe_duration('dispatched')
+            return result
+
+        elif rebuild:
+            if not indexable_source.rebuild_index:
+                raise RuntimeError(
+                    "Source {} does not support rebuilding index"
+                    .format(dataset_id))
+            found, indexed, stats = indexable_source.rebuild_index(
+                update_status,
+                on_item_error)
+        else:
+            found, indexed, stats = indexable_source.index(
+                refs,
+                update_status,
+                on_item_error,
+                force)
 
     except SystemExit:
+        observe_duration('failure')
         logger.exception(
             "Failed to index dataset %s: Task aborted with SystemExit",
             dataset_id)
@@ -67,6 +129,7 @@ def fetch_and_index_task(task, dataset_id: str, refs=None):
         raise
 
     except:  # noqa: E722
+        observe_duration('failure')
         logger.exception(
             "Failed to index dataset %s: Task failed",
             dataset_id)
@@ -75,13 +138,371 @@ def fetch_and_index_task(task, dataset_id: str, refs=None):
         raise
 
     else:
+        observe_duration('success')
         return {
             **task_desc,
             'progress': {
                 'total': found,
                 'current': indexed,
             },
+            'stats': stats,
         }
 
+    finally:
+        update_status.flush()
+
 
 fetch_and_index = app.task(bind=True)(fetch_and_index_task)
+
+
+def get_status_reporter(
+    task,
+    task_desc: IndexingTaskCeleryMeta,
+) -> ProgressReporter:
+    """Returns an on-progress handler that updates task state
+    (see :class:`.progress.ProgressReporter` regarding how often)
+    and exports throughput to Prometheus.
+
+    Tasks should call its ``flush()`` once indexing is done,
+    so that the last coalesced update is not lost.
+    """
+
+    def report(
+        action: str,
+        total: int,
+        indexed: int,
+        items_per_second: Optional[float],
+        eta_seconds: Optional[int],
+    ):
+        if items_per_second is not None:
+            metrics.indexing_items_per_second.labels(
+                task_desc['dataset_id'],
+            ).set(items_per_second)
+        task.update_state(
+            state='PROGRESS',
+            meta={
+                **task_desc,
+                'action': action,
+                'progress': {
+                    'total': total,
+                    'current': indexed,
+                    'items_per_second': items_per_second,
+                    'eta_seconds': eta_seconds,
+                },
+            },
+        )
+
+    return ProgressReporter(report)
+
+
+def get_item_error_handler(dataset_id: str) -> Callable[[str, str], None]:
+    """Returns an on-error handler that logs the error
+    and counts it in Prometheus metrics."""
+
+    def handle_item_error(item: str, err: str):
+        metrics.indexing_item_errors.labels(dataset_id).inc()
+        logger.warning(
+            "Error indexing item %s in %s: %s",
+            item,
+            dataset_id,
+            err)
+
+    return handle_item_error
+
+
+def get_sharding(dataset_id: str) -> ShardedIndexing:
+    """:returns: sharded indexing hooks of given source
+    :raises RuntimeError: source does not support sharded indexing"""
+
+    sharding = registry[dataset_id].sharding
+    if sharding is None:
+        raise RuntimeError(
+            "Source {} does not support sharded indexing".format(dataset_id))
+    return sharding
+
+
+def dispatch_shards(
+    dataset_id: str,
+    plan: Union[IndexingPlan, None],
+    task_desc: IndexingTaskCeleryMeta,
+) -> ShardedIndexingTaskCeleryMeta:
+    """Splits refs in indexing plan into shards of :data:`.SHARD_SIZE`
+    and dispatches them as a chord, with :func:`.finalize_index`
+    as the callback and :func:`.abort_index` as its error callback,
+    so that indexing lock acquired by the plan is released
+    whether or not the run completes.
+
+    :returns: task metadata referencing dispatched task IDs
+              (empty if there was nothing to index)
+    """
+    refs = plan['refs'] if plan else []
+
+    shards: List[List[str]] = [
+        refs[idx:idx + SHARD_SIZE]
+        for idx in range(0, len(refs), SHARD_SIZE)
+    ]
+
+    result: ShardedIndexingTaskCeleryMeta = dict(
+        **task_desc,
+        shard_task_ids=[],
+        shard_sizes=[len(shard) for shard in shards],
+        finalizer_task_id=None,
+    )
+    result['progress'] = {'total': len(refs), 'current': 0}
+
+    if plan is None:
+        return result
+
+    if not shards:
+        # Requested refs can be empty for incremental runs
+        # that only touched files outside of indexed data.
+        get_sharding(dataset_id).finalize(plan)
+        return result
+
+    header = [
+        index_shard.s(dataset_id, {**plan, 'refs': shard, 'full': False})
+        for shard in shards
+    ]
+    callback = finalize_index.s(dataset_id, plan)
+    callback.link_error(abort_index.s(dataset_id, plan))
+
+    result['shard_task_ids'] = [sig.freeze().id for sig in header]
+    result['finalizer_task_id'] = callback.freeze().id
+    result['action'] = 'dispatched {} shards'.format(len(shards))
+
+    logger.info(
+        "Dispatching %s refs of %s in %s shards",
+        len(refs),
+        dataset_id,
+        len(shards))
+
+    try:
+        chord(header)(callback)
+    except:  # noqa: E722
+        get_sharding(dataset_id).abort(plan)
+        raise
+
+    return result
+
+
+def index_shard_task(task, dataset_id: str, plan: IndexingPlan):
+    """Indexes refs of a shard dispatched by :func:`.dispatch_shards`,
+    given as a plan limited to the shard’s refs.
+
+    Planned head commits are checked out first if this worker’s
+    working directories don’t have them
+    (see :attr:`.indexable.ShardedIndexing.index_shard`).
+
+    :rtype: sources.task_status.IndexingTaskCeleryMeta
+    """
+    refs = plan['refs']
+
+    sharding = get_sharding(dataset_id)
+
+    task_desc: IndexingTaskCeleryMeta = dict(
+        action='indexing shard of {}'.format(dataset_id),
+        progress={'total': len(refs), 'current': 0},
+        dataset_id=dataset_id,
+        requested_refs=None,
+        stats={},
+    )
+
+    update_status = get_status_reporter(task, task_desc)
+
+    try:
+        found, indexed, stats = sharding.index_shard(
+            plan,
+            update_status,
+            get_item_error_handler(dataset_id))
+    finally:
+        update_status.flush()
+
+    return {
+        **task_desc,
+        'progress': {
+            'total': found,
+            'current': indexed,
+        },
+        'stats': stats,
+    }
+
+
+def finalize_index_task(
+    shard_results: List[Dict[str, Any]],
+    dataset_id: str,
+    plan: IndexingPlan,
+):
+    """Completes sharded indexing run
+    once all :func:`.index_shard` tasks succeeded.
+
+    Deletes stale refs (for full runs), records indexed head commits,
+    and aggregates shard stats.
+
+    :rtype: sources.task_status.IndexingTaskCeleryMeta
+    """
+
+    sharding = get_sharding(dataset_id)
+
+    stats: IndexingStats = {}
+    for shard_result in shard_results:
+        for key, count in shard_result.get('stats', {}).items():
+            stats[key] = stats.get(key, 0) + count  # type: ignore
+
+    stats['deleted'] = stats.get('deleted', 0) + sharding.finalize(plan)
+
+    return {
+        'action': 'finalized indexing {}'.format(dataset_id),
+        'dataset_id': dataset_id,
+        'requested_refs': None,
+        'progress': {
+            'total': len(plan['refs']),
+            'current': sum(
+                shard_result.get('progress', {}).get('current', 0)
+                for shard_result in shard_results),
+        },
+        'stats': stats,
+    }
+
+
+def abort_index_task(
+    request,
+    exc,
+    traceback,
+    dataset_id: str,
+    plan: IndexingPlan,
+):
+    """Called if a sharded indexing run fails
+    (any of :func:`.index_shard` tasks or :func:`.finalize_index`).
+    Releases the indexing lock, so that the next run can start."""
+
+    logger.error(
+        "Sharded indexing of %s failed: %s",
+        dataset_id,
+        exc)
+    get_sharding(dataset_id).abort(plan)
+
+
+index_shard = app.task(bind=True)(index_shard_task)
+
+finalize_index = app.task(finalize_index_task)
+
+abort_index = app.task(abort_index_task)
+
+
+def refresh_sources_task(
+    task,
+    dataset_ids: Optional[List[str]] = None,
+    concurrency: Optional[int] = None,
+    force: bool = False,
+):
+    """Refreshes given (or all registered) indexable sources,
+    indexing at most ``concurrency`` of them at a time
+    (:data:`.REFRESH_CONCURRENCY` by default).
+
+    Sources are indexed in priority order
+    (see :func:`.order_by_priority()`). Unless ``force`` is given,
+    sources whose repositories didn’t change since last indexed
+    are skipped upfront (see :func:`.indexable.check_upstream_changes`);
+    if it is given, it is passed on to :func:`.fetch_and_index`,
+    so that unchanged sources are reindexed.
+
+    This task only dispatches up to ``concurrency`` of
+    :func:`.fetch_and_index` tasks; each of them, once it succeeds or fails,
+    dispatches the next pending source (see :func:`.refresh_next_task`).
+    Use :meth:`.task_status.RefreshRun.describe` with this task’s ID
+    to obtain combined status.
+
+    .. note:: Concurrency is also bounded by the number of
+              available worker processes. Sharded sources
+              (see :data:`.SHARD_SIZE`) free their slot
+              as soon as shards are dispatched.
+
+    :returns: refresh run ID, same as this task’s ID
+    """
+
+    requested = [
+        dataset_id
+        for dataset_id in (dataset_ids or list(registry.keys()))
+        if dataset_id in registry
+    ]
+
+    if force:
+        skipped: List[str] = []
+    else:
+        changed = check_upstream_changes(requested)
+        skipped = [
+            dataset_id
+            for dataset_id in requested
+            if not changed[dataset_id]
+        ]
+
+    run = RefreshRun(task.request.id)
+    run.start(
+        dataset_ids=order_by_priority([
+            dataset_id
+            for dataset_id in requested
+            if dataset_id not in skipped
+        ]),
+        skipped=skipped,
+        concurrency=max(1, concurrency or REFRESH_CONCURRENCY),
+        force=force,
+    )
+
+    logger.info(
+        "Refreshing %s sources (%s skipped as unchanged), %s at a time",
+        len(requested) - len(skipped),
+        len(skipped),
+        run.concurrency)
+
+    for _ in range(run.concurrency):
+        dispatch_next(run)
+
+    return run.run_id
+
+
+refresh_sources = app.task(bind=True)(refresh_sources_task)
+
+
+def refresh_next_task(run_id: str):
+    """Dispatches next pending source of a refresh run started
+    by :func:`.refresh_sources_task`, if any.
+    Linked to each dispatched indexing task for success and failure.
+    """
+
+    dispatch_next(RefreshRun(run_id))
+
+
+refresh_next = app.task(refresh_next_task)
+
+
+def dispatch_next(run: RefreshRun) -> Optional[str]:
+    """Takes next pending source off given refresh run
+    and queues indexing for it.
+
+    :returns: dispatched task ID, or ``None`` if no sources are pending
+    """
+
+    dataset_id = run.pop_pending()
+    if dataset_id is None:
+        return None
+
+    on_done = refresh_next.si(run.run_id)
+    sig = fetch_and_index.si(dataset_id, force=run.force)
+    sig.link(on_done)
+    sig.link_error(on_done)
+    task_id = sig.freeze().id
+
+    run.add_task(dataset_id, task_id)
+    push_task(dataset_id, task_id)
+    sig.apply_async()
+
+    return task_id
+
+
+def order_by_priority(dataset_ids: List[str]) -> List[str]:
+    """Orders sources so that :data:`.PRIORITY_SOURCES` come first,
+    keeping original order otherwise."""
+
+    return sorted(
+        dataset_ids,
+        key=lambda dataset_id: dataset_id not in PRIORITY_SOURCES)
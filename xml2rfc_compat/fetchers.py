@@ -7,7 +7,8 @@ via :func:`.urls.get_urls()`.
 
 import logging
 from typing import cast, Union
-import re
+
+from django.db.models import Q
 
 from bib_models.models.bibdata import BibliographicItem, DocID
 from doi.crossref import get_bibitem as get_doi_bibitem
@@ -15,7 +16,8 @@ from datatracker.internet_drafts import get_internet_draft, remove_version
 from datatracker.internet_drafts import version_re
 from common.util import as_list
 from main.models import RefData
-from main.query import search_refs_relaton_field
+from main.query import search_refs_docid_fields, search_refs_docid_regex
+from main.query_utils import ref_to_bibitem
 from main.exceptions import RefNotFoundError
 
 from .urls import register_fetcher
@@ -28,29 +30,24 @@ log = logging.getLogger(__name__)
 def rfcs(ref: str) -> BibliographicItem:
     rfc_anchor_docid = ref.replace('.', '')
 
-    results = search_refs_relaton_field({
-        'docid[*]':
-            '@.type == "IETF" && '
-            '@.scope == "anchor" && '
-            '@.id == "%s"'
-        % re.escape(rfc_anchor_docid),
-    }, limit=10, exact=True)
+    results = search_refs_docid_fields(Q(
+        doctype='IETF',
+        scope='anchor',
+        docid=rfc_anchor_docid,
+    ), limit=10)
 
     if len(results) > 0:
-        return BibliographicItem(**results[0].body)
+        return ref_to_bibitem(results[0])
     else:
         raise RefNotFoundError()
 
 
 @register_fetcher('bibxml2')
 def misc(ref: str) -> BibliographicItem:
-    results = search_refs_relaton_field({
-        'docid[*]': '@.id == "%s"'
-        % re.escape(ref),
-    }, limit=10, exact=True)
+    results = search_refs_docid_fields(Q(docid=ref), limit=10)
 
     if len(results) > 0:
-        return BibliographicItem(**results[0].body)
+        return ref_to_bibitem(results[0])
     else:
         raise RefNotFoundError()
 
@@ -77,8 +74,6 @@ def internet_drafts(ref: str) -> BibliographicItem:
 
     .. seealso:: :issue:`157`
     """
-    type_query = '@.type == "Internet-Draft" || @.type == "IETF"'
-
     bare_ref = ref.replace('I-D.', '', 1).replace('draft-', '', 1)
     unversioned_ref = remove_version(bare_ref)
 
@@ -104,15 +99,12 @@ def internet_drafts(ref: str) -> BibliographicItem:
         f'draft-{bare_ref}',
         f'I-D.{bare_ref}',
     ]
-    id_query = ' || '.join([
-        '@.id == "%s"' % variant
-        for variant in docid_variants
-    ])
 
     results = sorted(
-        search_refs_relaton_field({
-            'docid[*]': f'({type_query}) && ({id_query})',
-        }, limit=10, exact=True),
+        search_refs_docid_fields(Q(
+            doctype__in=['Internet-Draft', 'IETF'],
+            docid__in=docid_variants,
+        ), limit=10),
         key=_sort_by_id_draft_number,
         reverse=True,
     )
@@ -121,7 +113,7 @@ def internet_drafts(ref: str) -> BibliographicItem:
     # (both bibitem data and version number)
     bibitem: Union[BibliographicItem, None]
     if len(results) > 0:
-        bibitem = BibliographicItem(**results[0].body)
+        bibitem = ref_to_bibitem(results[0])
         try:
             version = [
                 version_re.match(d.id).group('version')
@@ -169,13 +161,12 @@ def internet_drafts(ref: str) -> BibliographicItem:
 def w3c(ref: str) -> BibliographicItem:
     docid = ref.replace('W3C.', 'W3C ')
 
-    results = search_refs_relaton_field({
-        'docid[*]': '@.type == "W3C" && @.id == "%s"'
-        % re.escape(docid),
-    }, limit=10, exact=True)
+    results = search_refs_docid_fields(
+        Q(doctype='W3C', docid=docid),
+        limit=10)
 
     if len(results) > 0:
-        return BibliographicItem(**results[0].body)
+        return ref_to_bibitem(results[0])
     else:
         raise RefNotFoundError()
 
@@ -184,13 +175,10 @@ def w3c(ref: str) -> BibliographicItem:
 def threegpp(ref: str) -> BibliographicItem:
     docid = ref.replace('SDO-3GPP.', '').replace('3GPP.', '')
 
-    results = search_refs_relaton_field({
-        'docid[*]': '@.type == "3GPP" && @.id like_regex "%s"'
-        % re.escape(docid),
-    }, limit=10, exact=True)
+    results = search_refs_docid_regex(docid, '3GPP', limit=10)
 
     if len(results) > 0:
-        return BibliographicItem(**results[0].body)
+        return ref_to_bibitem(results[0])
     else:
         raise RefNotFoundError()
 
@@ -201,13 +189,14 @@ def ieee(ref: str) -> BibliographicItem:
     parts = rough_docid.split(' ')
     regex = '.*'.join(parts)
 
-    results = search_refs_relaton_field({
-        'docid[*]': '@.type == "IEEE" && @.id like_regex "(?i)%s"'
-        % re.escape(regex),
-    }, limit=10, exact=True)
+    results = search_refs_docid_regex(
+        regex,
+        'IEEE',
+        case_insensitive=True,
+        limit=10)
 
     if len(results) > 0:
-        return BibliographicItem(**results[0].body)
+        return ref_to_bibitem(results[0])
     else:
         raise RefNotFoundError()
 
@@ -224,12 +213,13 @@ def doi(ref: str) -> BibliographicItem:
 
 @register_fetcher('bibxml8')
 def iana(ref: str) -> BibliographicItem:
-    results = search_refs_relaton_field({
-        'docid[*]': '@.type == "IANA" && @.id like_regex "(?i)%s"'
-        % re.escape(ref.replace('IANA.', '')),
-    }, limit=10, exact=True)
+    results = search_refs_docid_regex(
+        ref.replace('IANA.', ''),
+        'IANA',
+        case_insensitive=True,
+        limit=10)
     if len(results) > 0:
-        return BibliographicItem(**results[0].body)
+        return ref_to_bibitem(results[0])
     else:
         raise RefNotFoundError()
 
@@ -246,26 +236,25 @@ def rfcsubseries(ref: str) -> BibliographicItem:
         except ValueError:
             raise RefNotFoundError("Invalid rfcsubseries number component")
 
-        results = search_refs_relaton_field({
-            'docid[*]': '@.type == "IETF" && (@.id == "%s" || @.id == "%s")'
-            % (f'{series}{num}', f'{series} {num}'),
-        }, limit=10, exact=True)
+        results = search_refs_docid_fields(Q(
+            doctype='IETF',
+            docid__in=[f'{series}{num}', f'{series} {num}'],
+        ), limit=10)
 
         if len(results) > 0:
-            return BibliographicItem(**results[0].body)
+            return ref_to_bibitem(results[0])
 
     raise RefNotFoundError()
 
 
 @register_fetcher('bibxml-nist')
 def nist(ref: str) -> BibliographicItem:
-    results = search_refs_relaton_field({
-        'docid[*]': '@.id == "%s" && @.type == "NIST"'
-        % re.escape(ref.replace('.', ' ')),
-    }, limit=10, exact=True)
+    results = search_refs_docid_fields(
+        Q(doctype='NIST', docid=ref.replace('.', ' ')),
+        limit=10)
 
     if len(results) > 0:
-        return BibliographicItem(**results[0].body)
+        return ref_to_bibitem(results[0])
     else:
         raise RefNotFoundError()
 
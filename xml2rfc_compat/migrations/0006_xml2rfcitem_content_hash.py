@@ -0,0 +1,18 @@
+# Generated by Django 4.1.7 on 2023-03-14 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('xml2rfc_compat', '0005_alter_manualpathmap_xml2rfc_subpath'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='xml2rfcitem',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
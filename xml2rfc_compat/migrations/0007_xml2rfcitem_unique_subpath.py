@@ -0,0 +1,29 @@
+# Generated by Django 4.1.7 on 2023-03-14 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('xml2rfc_compat', '0006_xml2rfcitem_content_hash'),
+    ]
+
+    operations = [
+        # Earlier indexing runs could create multiple items per subpath
+        # when file contents changed; keep the most recently created one.
+        migrations.RunSQL(
+            sql='''
+                DELETE FROM xml2rfc_compat_xml2rfcitem AS item
+                USING xml2rfc_compat_xml2rfcitem AS newer
+                WHERE newer.subpath = item.subpath
+                AND newer.id > item.id
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AlterField(
+            model_name='xml2rfcitem',
+            name='subpath',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 4.1.7 on 2023-03-14 10:12
+
+import gzip
+import re
+from typing import Optional, Tuple
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 1000
+
+
+# Helpers are copied from xml2rfc_compat.models as of this migration,
+# so that later changes there don’t affect it
+
+anchor_attribute_regex = re.compile(r'anchor="(?P<anchor>[^"]*)"')
+
+
+def find_anchor_span(xml_repr: str) -> Optional[Tuple[int, int]]:
+    match = anchor_attribute_regex.search(xml_repr)
+    return match.span('anchor') if match else None
+
+
+def compress_xml(xml_repr: str) -> bytes:
+    return gzip.compress(xml_repr.encode('utf-8'), compresslevel=9, mtime=0)
+
+
+def compress_items(apps, schema_editor):
+    Xml2rfcItem = apps.get_model('xml2rfc_compat', 'Xml2rfcItem')
+
+    batch = []
+    for item in Xml2rfcItem.objects.only('xml_repr').iterator(BATCH_SIZE):
+        item.xml_gzip = compress_xml(item.xml_repr)
+        item.anchor_start, item.anchor_end = \
+            find_anchor_span(item.xml_repr) or (None, None)
+        batch.append(item)
+        if len(batch) >= BATCH_SIZE:
+            Xml2rfcItem.objects.bulk_update(
+                batch,
+                ['xml_gzip', 'anchor_start', 'anchor_end'])
+            batch = []
+    Xml2rfcItem.objects.bulk_update(
+        batch,
+        ['xml_gzip', 'anchor_start', 'anchor_end'])
+
+
+def decompress_items(apps, schema_editor):
+    Xml2rfcItem = apps.get_model('xml2rfc_compat', 'Xml2rfcItem')
+
+    batch = []
+    for item in Xml2rfcItem.objects.only('xml_gzip').iterator(BATCH_SIZE):
+        item.xml_repr = gzip.decompress(item.xml_gzip).decode('utf-8')
+        batch.append(item)
+        if len(batch) >= BATCH_SIZE:
+            Xml2rfcItem.objects.bulk_update(batch, ['xml_repr'])
+            batch = []
+    Xml2rfcItem.objects.bulk_update(batch, ['xml_repr'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('xml2rfc_compat', '0007_xml2rfcitem_unique_subpath'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='xml2rfcitem',
+            name='xml_gzip',
+            field=models.BinaryField(default=b''),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='xml2rfcitem',
+            name='anchor_start',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='xml2rfcitem',
+            name='anchor_end',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.RunPython(compress_items, decompress_items),
+        migrations.RemoveField(
+            model_name='xml2rfcitem',
+            name='xml_repr',
+        ),
+    ]
@@ -1,4 +1,8 @@
+import gzip
 import re
+from typing import Optional, Tuple
+from xml.sax.saxutils import escape
+
 from django.db import models
 
 
@@ -20,12 +24,63 @@ def get_dir_subpath_regex(dirname: str):
 class Xml2rfcItem(models.Model):
     """Represents an item at an :term:`xml2rfc-style path`."""
 
-    subpath = models.CharField(max_length=255, db_index=True)
+    subpath = models.CharField(max_length=255, unique=True)
     """File path, relative to :data:`bibxml.settings.XML2RFC_PATH_PREFIX`
-    with no leading slash."""
-
-    xml_repr = models.TextField()
-    """Contents of the file (XML as a string)."""
+    with no leading slash. Unique."""
+
+    xml_gzip = models.BinaryField()
+    """Contents of the file (XML as utf-8 bytes), gzip-compressed.
+    Can be served as is to clients that accept gzip encoding.
+
+    Set via :attr:`.xml_repr`."""
+
+    anchor_start = models.PositiveIntegerField(null=True)
+    """Offset of the first ``anchor`` attribute value in :attr:`.xml_repr`,
+    ``None`` if there is no ``anchor`` attribute.
+    Used to replace the anchor without searching for it."""
+
+    anchor_end = models.PositiveIntegerField(null=True)
+    """Offset of the end of the first ``anchor`` attribute value
+    in :attr:`.xml_repr`, ``None`` if there is no ``anchor`` attribute."""
+
+    content_hash = models.CharField(max_length=64, default='', blank=True)
+    """SHA-256 hex digest of file contents at indexing time.
+    Used to skip unchanged files when reindexing. Empty if not known."""
+
+    @property
+    def xml_repr(self) -> str:
+        """Contents of the file (XML as a string),
+        decompressed from :attr:`.xml_gzip`.
+
+        Setting it updates :attr:`.xml_gzip`, :attr:`.anchor_start`
+        and :attr:`.anchor_end`. Can be passed to constructor."""
+
+        return gzip.decompress(self.xml_gzip).decode('utf-8')
+
+    @xml_repr.setter
+    def xml_repr(self, value: str):
+        self.xml_gzip = compress_xml(value)
+        self.anchor_start, self.anchor_end = find_anchor_span(value) \
+            or (None, None)
+
+    def get_xml(self, anchor: Optional[str] = None) -> str:
+        """Returns contents of the file (XML as a string),
+        with the first ``anchor`` attribute value replaced
+        if ``anchor`` is given.
+
+        .. note:: Does not add anchor if it’s missing,
+                  and does not validate/deserialize stored XML.
+        """
+        xml_repr = self.xml_repr
+
+        if anchor and self.anchor_start is not None:
+            return ''.join([
+                xml_repr[:self.anchor_start],
+                escape(anchor, {'"': '&quot;'}),
+                xml_repr[self.anchor_end:],
+            ])
+        else:
+            return xml_repr
 
     def format_filename(self):
         """Extracts filename from this item’s ``subpath``."""
@@ -44,6 +99,28 @@ class Xml2rfcItem(models.Model):
             return self.subpath
 
 
+anchor_attribute_regex = re.compile(r'anchor="(?P<anchor>[^"]*)"')
+"""Matches an ``anchor`` attribute in XML string."""
+
+
+def find_anchor_span(xml_repr: str) -> Optional[Tuple[int, int]]:
+    """Returns start and end offsets of the first ``anchor`` attribute value
+    in given XML string, or ``None`` if there is no such attribute.
+
+    Intended to be used with fallback XML that can possibly have
+    malformed anchors, so XML is not deserialized.
+    """
+    match = anchor_attribute_regex.search(xml_repr)
+    return match.span('anchor') if match else None
+
+
+def compress_xml(xml_repr: str) -> bytes:
+    """Returns given XML string encoded as utf-8 and gzip-compressed."""
+
+    # mtime is fixed so that same XML is always compressed the same way
+    return gzip.compress(xml_repr.encode('utf-8'), compresslevel=9, mtime=0)
+
+
 class ManualPathMap(models.Model):
     """Manually maps an xml2rfc path to a bibliographic item,
     overriding any automatic resolution.
@@ -6,6 +6,7 @@ Primary API is :func:`.to_xml()` and :func:`.to_xml_string()`.
 """
 
 import datetime
+import re
 from typing import List, Optional, Union, Callable, Tuple, Set
 from xml.etree.ElementTree import Element
 
@@ -29,10 +30,58 @@ AUTHOR_ROLES = set(('author', 'editor', 'publisher'))
 __all__ = (
     'to_xml',
     'to_xml_string',
+    'replace_root_anchor',
 )
 
 
-@serializers.register('bibxml', 'application/xml')
+root_tag_re = re.compile(
+    r'^(?P<tag>\s*<(?:reference|referencegroup)\b)'
+    r'(?P<attrs>[^>]*?)'
+    r'(?P<anchor>\sanchor="[^"]*"|(?=\s*/?>))')
+"""Matches start of root element of :func:`.to_xml_string()` output,
+up to and including its ``anchor`` attribute
+(or up to the end of start tag, if the attribute is missing)."""
+
+
+def replace_root_anchor(xml_repr: str, anchor: str) -> str:
+    """Sets ``anchor`` attribute of the root element
+    in previously serialized XML string to given value.
+
+    Used to serve XML stored at indexing time
+    (see :func:`bib_models.serializers.preserialize()`)
+    with a custom anchor, without serializing the item again.
+
+    :raises ValueError: anchor is not a valid XML attribute value
+    """
+    quoted_anchor = quote_attribute(anchor)
+    return root_tag_re.sub(
+        lambda match: '%s%s anchor=%s' % (
+            match.group('tag'),
+            match.group('attrs'),
+            quoted_anchor),
+        xml_repr,
+        count=1)
+
+
+def quote_attribute(value: str) -> str:
+    """Returns given value quoted and escaped as an attribute value
+    exactly the way :func:`.to_xml_string()` output has it."""
+
+    # Let lxml do the escaping, so that the result is byte-identical
+    # (including character references for non-ASCII characters)
+    el = etree.Element('el')
+    el.set('attr', value)
+    start_tag = etree.tostring(el).decode('ascii')
+    return start_tag[len('<el attr='):-len('/>')]
+
+
+# Version must be bumped whenever output changes,
+# so that XML stored at indexing time is not served anymore
+@serializers.register(
+    'bibxml',
+    'application/xml',
+    replace_anchor=replace_root_anchor,
+    version='1')
 def to_xml_string(item: BibliographicItem, **kwargs) -> str:
     """
     Passes given item and any kwargs through to :func:`.to_xml()`,
@@ -4,27 +4,55 @@ available via xml2rfc web server for fallback
 during migration from xml2rfc-style API.
 """
 
-import glob
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import hashlib
 import os
-from typing import List, Union, Callable, Tuple
+from typing import List, Union, Callable, Tuple, Dict, Optional, Iterator
+from typing import Iterable, TypeVar
 
-from django.db import transaction
+from django.conf import settings
+from django.db import transaction, connection
 
 from sources import indexable
+from sources.indexable import IndexingStats, IndexingCheckpoint
 
 from .models import Xml2rfcItem
 
 
+CHUNK_SIZE: int = getattr(settings, 'INDEXING_BATCH_SIZE', 1000)
+"""How many files to process per transaction.
+See :data:`bibxml.settings.INDEXING_BATCH_SIZE`."""
+
+READER_THREADS: int = getattr(settings, 'INDEXING_READER_THREADS', 4)
+"""How many threads to read source files with.
+See :data:`bibxml.settings.INDEXING_READER_THREADS`."""
+
+
 def index_xml2rfc_source(
     work_dirs: List[str],
     refs: Union[List[str], None],
     on_progress: Callable[[int, int], None],
     on_error: Callable[[str, str], None],
-) -> Tuple[int, int]:
+    checkpoint: Optional[IndexingCheckpoint] = None,
+) -> Tuple[int, int, IndexingStats]:
     """
     Indexes data from an xml2rfc web server mirror repository.
 
     Uses :class:`.models.Xml2rfcItem` to store indexed data.
+    Files whose contents hash matches
+    :attr:`~.models.Xml2rfcItem.content_hash` of an already indexed item
+    are not written.
+
+    Files are discovered in sorted order (see :func:`.iter_xml_files()`)
+    and processed in chunks of :data:`.CHUNK_SIZE`:
+    each chunk is read by a pool of :data:`.READER_THREADS` threads
+    and written with a single upsert statement in its own transaction,
+    after which ``checkpoint`` (if given) is saved.
+
+    Paths not found in source anymore, as well as paths
+    whose files could not be decoded, are deleted at the end,
+    in a single transaction (see :func:`.delete_stale_items()`).
     """
 
     on_progress = on_progress or (lambda total, indexed: None)
@@ -37,24 +65,70 @@ def index_xml2rfc_source(
 
     work_dir = work_dirs[0]
 
-    source_xml_files = glob.glob("%s/**/*.xml" % work_dir, recursive=True)
-
-    total = len(source_xml_files)
+    total = sum(1 for _ in iter_xml_files(work_dir))
 
-    if total < 0:
+    if total < 1:
         raise RuntimeError("Repository does not contain data")
 
     on_progress(total, 0)
 
-    indexed_paths = set()
+    known_hashes: Dict[str, str] = dict(
+        Xml2rfcItem.objects.values_list('subpath', 'content_hash'))
+
+    stats: IndexingStats = dict(
+        inserted=0,
+        updated=0,
+        unchanged=0,
+        deleted=0,
+    )
+    indexed = 0
+
+    resume_after = checkpoint.resume_after if checkpoint else None
+
+    with source_paths_table() as record_source_paths, \
+            ThreadPoolExecutor(max_workers=READER_THREADS) as executor:
+
+        for chunk in iter_chunks(enumerate(iter_xml_files(work_dir))):
+            files_to_index = [
+                (idx, xml_fpath)
+                for idx, xml_fpath in chunk
+                if resume_after is None or xml_fpath > resume_after
+            ]
+
+            # Paths skipped when resuming are recorded if they were
+            # indexed by the interrupted run, so that they are not
+            # considered stale
+            found_paths: List[str] = [
+                get_relative_path(xml_fpath)
+                for _, xml_fpath in chunk
+                if resume_after is not None and xml_fpath <= resume_after
+                and get_relative_path(xml_fpath) in known_hashes
+            ]
+
+            if not files_to_index:
+                record_source_paths(found_paths)
+                continue
+
+            items: Dict[str, Xml2rfcItem] = {}
 
-    with transaction.atomic():
-        for idx, xml_fpath in enumerate(source_xml_files):
-            on_progress(total, idx)
+            for (idx, xml_fpath), (raw_data, content_hash) in zip(
+                files_to_index,
+                executor.map(
+                    read_xml_file,
+                    [xml_fpath for _, xml_fpath in files_to_index]),
+            ):
+                on_progress(total, idx)
+
+                relative_fpath = get_relative_path(xml_fpath)
+
+                if known_hashes.get(relative_fpath, None) == content_hash:
+                    stats['unchanged'] += 1
+                    indexed += 1
+                    found_paths.append(relative_fpath)
+                    continue
 
-            with open(xml_fpath, 'r', encoding='utf-8') as xml_fhandler:
                 try:
-                    xml_data = xml_fhandler.read()
+                    xml_data = raw_data.decode('utf-8')
                 except UnicodeDecodeError as err:
                     on_error(xml_fpath, str(err))
                     continue
@@ -63,19 +137,160 @@ def index_xml2rfc_source(
                         on_error(xml_fpath, "NUL character in XML string")
                         continue
 
-            _pparts = xml_fpath.split(os.sep)
-            dirname, fname = _pparts[-2], _pparts[-1]
-            relative_fpath = f'{dirname}{os.sep}{fname}'
-            Xml2rfcItem.objects.update_or_create(
-                subpath=relative_fpath,
-                xml_repr=xml_data)
+                # Files that failed above are not recorded,
+                # so previously indexed versions of them are deleted
+                found_paths.append(relative_fpath)
+
+                if relative_fpath in known_hashes:
+                    stats['updated'] += 1
+                else:
+                    stats['inserted'] += 1
+                indexed += 1
+
+                # Should nested directories yield the same subpath,
+                # the file found last wins
+                items[relative_fpath] = Xml2rfcItem(
+                    subpath=relative_fpath,
+                    xml_repr=xml_data,
+                    content_hash=content_hash,
+                )
+
+            record_source_paths(found_paths)
+
+            with transaction.atomic():
+                Xml2rfcItem.objects.bulk_create(
+                    items.values(),
+                    update_conflicts=True,
+                    unique_fields=['subpath'],
+                    update_fields=[
+                        'xml_gzip',
+                        'anchor_start',
+                        'anchor_end',
+                        'content_hash',
+                    ],
+                )
+
+            if checkpoint:
+                checkpoint.save(files_to_index[-1][1])
+
+        with transaction.atomic():
+            stats['deleted'] = delete_stale_items()
+
+    return total, indexed, stats
+
+
+def iter_xml_files(root: str) -> Iterator[str]:
+    """Yields paths to XML files under given directory, recursively,
+    skipping hidden files and directories (such as ``.git``).
+
+    Directories are read with :func:`os.scandir()` as they are traversed,
+    and paths are yielded in the same order
+    as ``sorted(glob.glob(f"{root}/**/*.xml", recursive=True))`` would
+    produce, so that an interrupted run can be resumed from the last
+    committed path.
+    """
+    with os.scandir(root) as it:
+        entries = sorted(
+            (entry for entry in it if not entry.name.startswith('.')),
+            # A directory sorts as its path with a trailing separator
+            # would, so that traversal order matches full path order
+            key=lambda entry: (
+                entry.name + os.sep
+                if entry.is_dir()
+                else entry.name))
+
+    for entry in entries:
+        if entry.is_dir():
+            yield from iter_xml_files(entry.path)
+        elif entry.name.endswith('.xml'):
+            yield entry.path
+
+
+def read_xml_file(xml_fpath: str) -> Tuple[bytes, str]:
+    """Returns contents of given file and their SHA-256 hex digest."""
+
+    with open(xml_fpath, 'rb') as xml_fhandler:
+        raw_data = xml_fhandler.read()
+    return raw_data, hashlib.sha256(raw_data).hexdigest()
+
+
+T = TypeVar('T')
+
+
+def iter_chunks(items: Iterable[T]) -> Iterator[List[T]]:
+    """Groups given items into lists of :data:`.CHUNK_SIZE`."""
+
+    chunk: List[T] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+SOURCE_PATHS_TABLE = 'xml2rfc_source_paths'
+"""Name of temporary table holding subpaths found in source
+during an indexing run."""
+
+
+@contextmanager
+def source_paths_table() -> Iterator[Callable[[List[str]], None]]:
+    """Creates a temporary table for subpaths found in source,
+    used by :func:`.delete_stale_items()`,
+    and drops it on exit.
+
+    Yields a function that records given subpaths in the table.
+    """
+    table = connection.ops.quote_name(SOURCE_PATHS_TABLE)
+
+    def record(subpaths: List[str]):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} (subpath) '
+                f'SELECT unnest(%s::varchar[]) '
+                f'ON CONFLICT DO NOTHING',
+                [subpaths])
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS {table}')
+        cursor.execute(
+            f'CREATE TEMPORARY TABLE {table} '
+            f'(subpath varchar(255) PRIMARY KEY)')
+    try:
+        yield record
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {table}')
+
+
+def delete_stale_items() -> int:
+    """Deletes items whose subpaths were not recorded
+    in :func:`.source_paths_table()` during this run,
+    using an anti-join rather than a list of paths to keep.
+
+    :returns: number of deleted items
+    """
+    items_table = connection.ops.quote_name(Xml2rfcItem._meta.db_table)
+    paths_table = connection.ops.quote_name(SOURCE_PATHS_TABLE)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {items_table} AS item '
+            f'WHERE NOT EXISTS ('
+            f'SELECT 1 FROM {paths_table} AS source '
+            f'WHERE source.subpath = item.subpath)')
+        return cursor.rowcount
 
-            indexed_paths.add(relative_fpath)
 
-        # Delete all preexisting files not found in source anymore
-        Xml2rfcItem.objects.exclude(subpath__in=indexed_paths).delete()
+def get_relative_path(xml_fpath: str) -> str:
+    """Returns path under which given source file is indexed
+    (containing directory name and file name)."""
 
-    return total, len(indexed_paths)
+    _pparts = xml_fpath.split(os.sep)
+    dirname, fname = _pparts[-2], _pparts[-1]
+    return f'{dirname}{os.sep}{fname}'
 
 
 indexable.register_git_source(
@@ -5,8 +5,9 @@ from io import StringIO
 from django.test import TestCase
 from lxml import etree
 
-from bib_models import BibliographicItem, Contributor
+from bib_models import BibliographicItem, Contributor, serializers
 from xml2rfc_compat.serializer import to_xml, create_reference, create_author
+from xml2rfc_compat.serializer import to_xml_string
 
 
 class XML2RFCSerializersTestCase(TestCase):
@@ -108,6 +109,25 @@ class XML2RFCSerializersTestCase(TestCase):
         with self.assertRaises(ValueError):
             to_xml(new_bibitem_with_missing_data)
 
+    def test_preserialized_xml_matches_xml_serialized_on_the_fly(self):
+        for item in (self.bibitem_reference, self.bibitem_referencegroup):
+            item._representations = serializers.preserialize(item)
+
+            for anchor in (None, "", "custom_anchor", "a\"b<c>&d\n\t'é"):
+                serialized = serializers.serialize("bibxml", item, anchor=anchor)
+                self.assertEqual(
+                    serialized.decode("utf-8")
+                    if isinstance(serialized, bytes)
+                    else serialized,
+                    to_xml_string(item, anchor=anchor).decode("utf-8"))
+
+    def test_preserialized_xml_of_other_version_is_not_used(self):
+        item = self.bibitem_reference
+        item._representations = {"bibxml": "<reference anchor=\"STALE\"/>"}
+        self.assertEqual(
+            serializers.serialize("bibxml", item),
+            to_xml_string(item))
+
     def test_create_reference(self):
         ref = create_reference(self.bibitem_reference)
         self.assertEqual(ref.tag, "reference")
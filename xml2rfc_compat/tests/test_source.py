@@ -0,0 +1,135 @@
+import glob
+import gzip
+import os
+import tempfile
+from os import path
+
+from django.conf import settings
+from django.test import TestCase
+
+from xml2rfc_compat.models import Xml2rfcItem
+from xml2rfc_compat.source import index_xml2rfc_source, iter_xml_files
+
+
+class IndexXml2rfcSourceTestCase(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write_file(self, subpath: str, anchor: str):
+        fpath = path.join(self.work_dir, subpath)
+        os.makedirs(path.dirname(fpath), exist_ok=True)
+        with open(fpath, "w") as f:
+            f.write(f'<reference anchor="{anchor}"/>')
+
+    def _index(self):
+        return index_xml2rfc_source(
+            [self.work_dir],
+            None,
+            lambda total, indexed: None,
+            lambda fpath, err: None)
+
+    def test_iter_xml_files_order_matches_sorted_glob(self):
+        for subpath in (
+            "bibxml/reference.RFC.1.xml",
+            "bibxml/reference.RFC.10.xml",
+            "bibxml-ids/reference.I-D.a.xml",
+            "bibxml.old/reference.RFC.2.xml",
+            "bibxml/notes.txt",
+            ".git/reference.RFC.3.xml",
+        ):
+            self._write_file(subpath, "x")
+
+        self.assertEqual(
+            list(iter_xml_files(self.work_dir)),
+            sorted(glob.glob(f"{self.work_dir}/**/*.xml", recursive=True)))
+
+    def test_reindex_updates_changed_files_in_place(self):
+        self._write_file("bibxml/reference.RFC.1.xml", "RFC1")
+        self._write_file("bibxml/reference.RFC.2.xml", "RFC2")
+        self._index()
+
+        self._write_file("bibxml/reference.RFC.1.xml", "RFC0001")
+        os.remove(path.join(self.work_dir, "bibxml/reference.RFC.2.xml"))
+        total, indexed, stats = self._index()
+
+        self.assertEqual((total, indexed), (1, 1))
+        self.assertEqual(stats, dict(
+            inserted=0,
+            updated=1,
+            unchanged=0,
+            deleted=1,
+        ))
+        self.assertEqual(
+            [(item.subpath, item.xml_repr)
+             for item in Xml2rfcItem.objects.all()],
+            [("bibxml/reference.RFC.1.xml",
+              '<reference anchor="RFC0001"/>')])
+
+    def test_files_that_fail_to_decode_are_deleted(self):
+        self._write_file("bibxml/reference.RFC.1.xml", "RFC1")
+        self._write_file("bibxml/reference.RFC.2.xml", "RFC2")
+        self._index()
+
+        with open(path.join(
+            self.work_dir,
+            "bibxml/reference.RFC.2.xml",
+        ), "wb") as f:
+            f.write(b'<reference anchor="\xff"/>')
+        errors = []
+        total, indexed, stats = index_xml2rfc_source(
+            [self.work_dir],
+            None,
+            lambda total, indexed: None,
+            lambda fpath, err: errors.append(fpath))
+
+        self.assertEqual((total, indexed), (2, 1))
+        self.assertEqual(stats["deleted"], 1)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(
+            [item.subpath for item in Xml2rfcItem.objects.all()],
+            ["bibxml/reference.RFC.1.xml"])
+
+    def test_empty_source_is_rejected(self):
+        with self.assertRaises(RuntimeError):
+            self._index()
+
+
+class Xml2rfcItemTestCase(TestCase):
+    def test_xml_is_stored_compressed(self):
+        item = Xml2rfcItem(
+            subpath="bibxml/reference.RFC.1.xml",
+            xml_repr='<reference anchor="RFC1" target="x"/>')
+
+        self.assertEqual(
+            gzip.decompress(item.xml_gzip),
+            b'<reference anchor="RFC1" target="x"/>')
+        self.assertEqual(
+            item.get_xml(),
+            '<reference anchor="RFC1" target="x"/>')
+        self.assertEqual(
+            item.get_xml(anchor='A&"B'),
+            '<reference anchor="A&amp;&quot;B" target="x"/>')
+
+    def test_fallback_xml_is_served_gzip_encoded(self):
+        Xml2rfcItem.objects.create(
+            subpath="bibxml/reference.RFC.1.xml",
+            xml_repr='<reference anchor="RFC1"/>')
+        url = "/{}bibxml/reference.RFC.1.xml".format(
+            settings.XML2RFC_PATH_PREFIX)
+
+        resp = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertEqual(
+            gzip.decompress(resp.content),
+            b'<reference anchor="RFC1"/>')
+
+        resp = self.client.get(
+            url,
+            {"anchor": "custom"},
+            HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(resp.has_header("Content-Encoding"))
+        self.assertEqual(resp.content, b'<reference anchor="custom"/>')
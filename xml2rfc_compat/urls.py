@@ -5,23 +5,24 @@ fit for inclusion in site’s root URL configuration."""
 import logging
 import functools
 import re
-from typing import Callable, List, Union, Dict, Tuple, TypedDict, cast, Optional
+from typing import Callable, List, Union, Dict, Tuple, TypedDict, cast
 
 from django.urls import re_path
 from django.views.decorators.cache import never_cache
 from django.views.decorators.http import require_safe
 from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_vary_headers
 
 from pydantic import ValidationError
 
 from prometheus import metrics
+from bib_models import serializers
 from bib_models.models.bibdata import BibliographicItem
 from main.exceptions import RefNotFoundError
 from main.query import build_citation_for_docid
 
 from .aliases import unalias, get_aliases
 from .models import Xml2rfcItem, dir_subpath_regex, ManualPathMap
-from .serializer import to_xml_string
 
 
 log = logging.getLogger(__name__)
@@ -183,7 +184,8 @@ def make_xml2rfc_path_handler(fetcher_func: Callable[
 
     The automatically created view function handles filename
     cleanup, constructing a :class:`bib_models.models.bibdata.BibliographicItem`
-    and serializing it into an XML string with proper anchor tag supplied.
+    and serializing it into an XML string with proper anchor tag supplied
+    (XML stored at indexing time is used, if available).
 
     The view function behaves as following
     (see also :ref:`xml2rfc-path-resolution-algorithm`):
@@ -222,6 +224,11 @@ def make_xml2rfc_path_handler(fetcher_func: Callable[
            - The optional ``anchor`` passed *as GET parameter*
              will override ``anchor`` attribute in XML.
 
+           - Fallback XML is served gzip-encoded as stored
+             (see :attr:`xml2rfc_compat.models.Xml2rfcItem.xml_gzip`)
+             if the client accepts gzip encoding
+             and ``anchor`` GET parameter is not given.
+
       - In case of failure (and no fallback available),
         ``application/json`` response with error description.
     """
@@ -233,7 +240,8 @@ def make_xml2rfc_path_handler(fetcher_func: Callable[
 
         resp: HttpResponse
         item: Union[BibliographicItem, None]
-        xml_repr: Union[str, None]
+        xml_repr: Union[str, bytes, None] = None
+        xml_gzip: Union[bytes, None] = None
 
         requested_anchor = request.GET.get('anchor', None)
 
@@ -258,19 +266,40 @@ def make_xml2rfc_path_handler(fetcher_func: Callable[
             )
 
         if item:
-            xml_repr = to_xml_string(item, anchor=requested_anchor)
-        else:
-            xml_repr = obtain_fallback_xml(
-                xml2rfc_subpath,
+            xml_repr = serializers.serialize(
+                'bibxml',
+                item,
                 anchor=requested_anchor)
+        else:
+            fallback_item = get_fallback_item(xml2rfc_subpath)
+            if fallback_item is None:
+                pass
+            elif not requested_anchor and accepts_gzip(request):
+                # Stored compressed XML can be served as is
+                xml_gzip = bytes(fallback_item.xml_gzip)
+            else:
+                xml_repr = fallback_item.get_xml(anchor=requested_anchor)
             method_results['fallback'] = dict(
                 config='',
-                error='' if xml_repr else "not indexed",
+                error='' if fallback_item else "not indexed",
             )
 
         metric_label: str
 
-        if xml_repr:
+        if xml_gzip:
+            metric_label = 'success_fallback'
+            metrics.xml2rfc_api_bibitem_hits.labels(
+                xml2rfc_subpath,
+                'success_fallback',
+            ).inc()
+            resp = HttpResponse(
+                xml_gzip,
+                content_type="application/xml",
+                charset="utf-8",
+                headers={'Content-Encoding': 'gzip'})
+            patch_vary_headers(resp, ['Accept-Encoding'])
+
+        elif xml_repr:
             if item:
                 metric_label = 'success'
             else:
@@ -283,6 +312,8 @@ def make_xml2rfc_path_handler(fetcher_func: Callable[
                 xml_repr,
                 content_type="application/xml",
                 charset="utf-8")
+            if not item:
+                patch_vary_headers(resp, ['Accept-Encoding'])
 
         else:
             metric_label = 'not_found'
@@ -327,11 +358,8 @@ def make_xml2rfc_path_handler(fetcher_func: Callable[
     return handle_xml2rfc_path
 
 
-def obtain_fallback_xml(
-    subpath: str,
-    anchor: Optional[str] = None,
-) -> Union[str, None]:
-    """Obtains XML fallback for given subpath, if possible."""
+def get_fallback_item(subpath: str) -> Union[Xml2rfcItem, None]:
+    """Obtains indexed fallback item for given subpath, if possible."""
 
     requested_dirname = subpath.split('/')[-2]
     try:
@@ -344,25 +372,18 @@ def obtain_fallback_xml(
             actual_dirname,
             1)
         try:
-            xml_repr = Xml2rfcItem.objects.get(subpath=subpath).xml_repr
+            return Xml2rfcItem.objects.get(subpath=subpath)
         except Xml2rfcItem.DoesNotExist:
             return None
-        else:
-            if anchor:
-                return _replace_anchor(xml_repr, anchor)
-            else:
-                return xml_repr
-
 
-def _replace_anchor(xml_repr: str, anchor: str) -> str:
-    """Replace the top-level anchor property with provided anchor.
 
-    Intended to be used with fallback XML that can possibly have
-    malformed anchors.
+accepts_gzip_regex = re.compile(r'\bgzip\b')
 
-    .. note:: Does not add anchor if it’s missing,
-              and does not validate/deserialize given XML."""
 
-    anchor_regex = re.compile(r'anchor=\"([^\"]*)\"')
+def accepts_gzip(request) -> bool:
+    """Returns whether given request’s ``Accept-Encoding`` header
+    allows gzip-encoded response
+    (in the same way as Django’s ``GZipMiddleware`` does)."""
 
-    return anchor_regex.sub(r'anchor="%s"' % anchor, xml_repr, count=1)
+    return bool(accepts_gzip_regex.search(
+        request.headers.get('accept-encoding', '')))